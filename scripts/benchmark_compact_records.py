@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark memory of ServiceNow models vs compact records.
+
+Generates synthetic endpoints (repeated site_id/device_type values, as in a
+real fleet) and reports the memory retained per record by ServiceNowEndpoint
+models, compact records without interning, and compact records sharing one
+intern table. Raw data is left out so only per-record overhead is compared.
+
+Usage:
+    python scripts/benchmark_compact_records.py [--count N]
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from beast_dream_snow_loader.models.compact import CompactEndpoint, compact_records
+from beast_dream_snow_loader.models.servicenow import ServiceNowEndpoint
+
+DEVICE_TYPES = ("computer", "phone", "tablet", "iot", "printer")
+
+
+def make_payloads(count: int) -> list[dict]:
+    """Generate endpoint payloads (repeated values are distinct str objects)."""
+    return [
+        {
+            "u_unifi_source_id": f"client-{i}",
+            "hostname": f"client-{i}",
+            "ip_address": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+            "mac_address": f"00:11:22:{i >> 16 & 255:02x}:{i >> 8 & 255:02x}:{i & 255:02x}",
+            # join copies the string, like values decoded from an API response
+            "device_type": "".join(DEVICE_TYPES[i % len(DEVICE_TYPES)]),
+            "site_id": f"site-{i % 50}",
+        }
+        for i in range(count)
+    ]
+
+
+def retained_bytes(func: Callable[[], object]) -> int:
+    """Return bytes still allocated by ``func``'s result after it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    """Run the compact record memory benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # Each case builds from fresh payloads so string memory is counted the same
+    # way for every representation
+    cases = [
+        (
+            "models",
+            lambda: [ServiceNowEndpoint(**p) for p in make_payloads(args.count)],
+        ),
+        (
+            "compact",
+            lambda: [
+                CompactEndpoint.from_payload(p) for p in make_payloads(args.count)
+            ],
+        ),
+        (
+            "compact+intern",
+            lambda: compact_records(
+                ServiceNowEndpoint.model_construct(**p)
+                for p in make_payloads(args.count)
+            ),
+        ),
+    ]
+
+    print(f"📊 Compact record memory benchmark ({args.count:,} endpoints)\n")
+    print(f"{'representation':<18}{'total MB':>12}{'bytes/record':>15}{'saved':>9}")
+    baseline = None
+    for name, build in cases:
+        retained = retained_bytes(build)
+        baseline = baseline or retained
+        print(
+            f"{name:<18}{retained / 1e6:>12.1f}{retained / args.count:>15.0f}"
+            f"{(1 - retained / baseline) * 100:>8.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Benchmark memory of full vs lean UniFi models for a whole fleet.
+
+Generates synthetic Site Manager API JSON for hosts and clients (including the
+large ``reportedState.features`` / ``userData.features`` trees and unmapped
+client keys) and reports the memory retained by the validated models for
+full models, lean models, and lean models with raw bytes kept (keep_raw).
+
+Usage:
+    python scripts/benchmark_lean_models.py [--count N]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from beast_dream_snow_loader.unifi.ingest import read_clients, read_hosts
+
+
+def make_hosts_json(count: int) -> bytes:
+    """Generate a synthetic hosts API response."""
+    features = {f"feature{n}": {"enabled": True, "version": n} for n in range(40)}
+    hosts = [
+        {
+            "id": f"host-{i}",
+            "hardwareId": f"hw-{i}",
+            "type": "console",
+            "ipAddress": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+            "owner": True,
+            "isBlocked": False,
+            "registrationTime": "2025-01-01T00:00:00Z",
+            "lastConnectionStateChange": "2025-01-01T00:00:00Z",
+            "latestBackupTime": "2025-01-01T00:00:00Z",
+            "reportedState": {
+                "controller_uuid": f"uuid-{i}",
+                "host_type": 1,
+                "hostname": f"udm-{i}",
+                "mgmt_port": 443,
+                "name": f"UDM {i}",
+                "state": "connected",
+                "version": "4.0.6",
+                "hardware": {
+                    "mac": f"aa:bb:cc:{i:06x}",
+                    "serialno": f"SN{i}",
+                    "shortname": "UDMPRO",
+                    "sysid": 59905,
+                },
+                "features": features,
+                "apps": [{"name": "network", "version": "9.0.114"}] * 4,
+            },
+            "userData": {
+                "status": "ACTIVE",
+                "features": {"deviceGroups": True, "floorplan": {"canEdit": True}},
+                "permissions": {"network.management": ["admin"] * 4},
+            },
+        }
+        for i in range(count)
+    ]
+    return json.dumps({"data": hosts, "httpStatusCode": 200}).encode()
+
+
+def make_clients_json(count: int) -> bytes:
+    """Generate a synthetic clients API response."""
+    clients = [
+        {
+            "hostname": f"client-{i}",
+            "ip": f"192.168.{i // 256 % 256}.{i % 256}",
+            "mac": f"00:11:22:{i:06x}",
+            "deviceType": "computer",
+            "siteId": f"site-{i % 10}",
+            "oui": "Apple",
+            "uptime": 12345,
+            "rxBytes": 987654321,
+            "txBytes": 123456789,
+            "signal": -55,
+            "radio": "na",
+            "essid": "corp",
+            "fingerprint": {"devCat": 1, "devFamily": 2, "osName": 24},
+        }
+        for i in range(count)
+    ]
+    return json.dumps({"data": clients, "httpStatusCode": 200}).encode()
+
+
+def retained_bytes(func: Callable[[], object]) -> int:
+    """Return bytes still allocated by ``func``'s result after it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    """Run the lean model memory benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("hosts", make_hosts_json(args.count), read_hosts),
+        ("clients", make_clients_json(args.count), read_clients),
+    ]
+
+    print(f"📊 Lean model memory benchmark ({args.count:,} records)\n")
+    print(
+        f"{'entity':<10}{'full MB':>12}{'lean MB':>12}{'saved':>9}"
+        f"{'lean+raw MB':>14}"
+    )
+    for name, source, read in cases:
+        full = retained_bytes(lambda read=read, source=source: read(source))
+        lean = retained_bytes(lambda read=read, source=source: read(source, lean=True))
+        lean_raw = retained_bytes(
+            lambda read=read, source=source: read(source, keep_raw=True, lean=True)
+        )
+        print(
+            f"{name:<10}{full / 1e6:>12.1f}{lean / 1e6:>12.1f}"
+            f"{(1 - lean / full) * 100:>8.0f}%{lean_raw / 1e6:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Benchmark UniFi → ServiceNow transformers (per-record vs batch).
+
+Generates synthetic UniFi hosts, sites, devices and clients and reports
+records/sec for the per-record functions (transform_host etc.) and the batch
+functions (transform_hosts etc.), including trusted mode (compact records,
+sampled validation), plus the columnar client engine
+(transform_client_columns). With ``--workers`` it also reports the
+process-parallel client transform (transform_clients_parallel).
+
+Usage:
+    python scripts/benchmark_transformers.py [--count N] [--repeat R] [--workers W]
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from beast_dream_snow_loader.models.unifi import (
+    UniFiClient,
+    UniFiDevice,
+    UniFiHost,
+    UniFiSite,
+)
+from beast_dream_snow_loader.transformers.columnar import (
+    ClientColumns,
+    transform_client_columns,
+)
+from beast_dream_snow_loader.transformers.parallel import transform_clients_parallel
+from beast_dream_snow_loader.transformers.unifi_to_snow import (
+    transform_client,
+    transform_clients,
+    transform_device,
+    transform_devices,
+    transform_host,
+    transform_hosts,
+    transform_site,
+    transform_sites,
+)
+
+
+def make_hosts(count: int) -> list[UniFiHost]:
+    """Generate synthetic UniFi hosts."""
+    return [
+        UniFiHost(
+            id=f"host-{i}",
+            hardwareId=f"hw-{i}",
+            type="console",
+            ipAddress=f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+            owner=True,
+            isBlocked=False,
+            registrationTime="2025-01-01T00:00:00Z",
+            lastConnectionStateChange="2025-01-01T00:00:00Z",
+            latestBackupTime="2025-01-01T00:00:00Z",
+            reportedState={
+                "controller_uuid": f"uuid-{i}",
+                "host_type": 1,
+                "hostname": f"udm-{i}",
+                "mgmt_port": 443,
+                "name": f"UDM {i}",
+                "state": "connected",
+                "version": "4.0.6",
+                "hardware": {"mac": f"aa:bb:cc:{i:06x}", "serialno": f"SN{i}"},
+            },
+            userData={"status": "ACTIVE"},
+        )
+        for i in range(count)
+    ]
+
+
+def make_sites(count: int) -> list[UniFiSite]:
+    """Generate synthetic UniFi sites."""
+    counts = dict.fromkeys(
+        (
+            "criticalNotification",
+            "gatewayDevice",
+            "guestClient",
+            "lanConfiguration",
+            "offlineDevice",
+            "offlineGatewayDevice",
+            "offlineWifiDevice",
+            "offlineWiredDevice",
+            "pendingUpdateDevice",
+            "totalDevice",
+            "wanConfiguration",
+            "wifiClient",
+            "wifiConfiguration",
+            "wifiDevice",
+            "wiredClient",
+            "wiredDevice",
+        ),
+        0,
+    )
+    return [
+        UniFiSite(
+            siteId=f"site-{i}",
+            hostId=f"host-{i}",
+            permission="admin",
+            isOwner=True,
+            meta={"desc": f"Site {i}", "name": f"site-{i}", "timezone": "UTC"},
+            statistics={"counts": counts},
+        )
+        for i in range(count)
+    ]
+
+
+def make_devices(count: int) -> list[UniFiDevice]:
+    """Generate synthetic UniFi devices."""
+    return [
+        UniFiDevice(
+            hostId=f"host-{i}",
+            updatedAt="2025-01-01T00:00:00Z",
+            mac=f"de:ad:be:{i:06x}",
+            serial=f"DEV{i}",
+            model="USW-24",
+        )
+        for i in range(count)
+    ]
+
+
+def make_clients(count: int) -> list[UniFiClient]:
+    """Generate synthetic UniFi clients."""
+    return [
+        UniFiClient(
+            hostname=f"client-{i}",
+            ip=f"192.168.{i // 256 % 256}.{i % 256}",
+            mac=f"00:11:22:{i >> 16 & 255:02x}:{i >> 8 & 255:02x}:{i & 255:02x}",
+            deviceType="computer",
+            siteId=f"site-{i % 10}",
+        )
+        for i in range(count)
+    ]
+
+
+def measure(func: Callable[[], object], records: int, repeat: int) -> float:
+    """Return best records/sec over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return records / best if best > 0 else float("inf")
+
+
+def main():
+    """Run the transformer benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="*",
+        default=[],
+        help="Worker counts for the process-parallel client transform",
+    )
+    args = parser.parse_args()
+
+    cases = [
+        ("hosts", make_hosts(args.count), transform_host, transform_hosts),
+        ("sites", make_sites(args.count), transform_site, transform_sites),
+        ("devices", make_devices(args.count), transform_device, transform_devices),
+        ("clients", make_clients(args.count), transform_client, transform_clients),
+    ]
+
+    print(f"📊 Transformer benchmark ({args.count:,} records, best of {args.repeat})\n")
+    print(
+        f"{'entity':<10}{'per-record/s':>16}{'batch/s':>16}{'speedup':>10}"
+        f"{'trusted/s':>16}{'speedup':>10}"
+    )
+    for name, records, single, batch in cases:
+        per_record_rate = measure(
+            lambda single=single, records=records: [single(r) for r in records],
+            len(records),
+            args.repeat,
+        )
+        batch_rate = measure(
+            lambda batch=batch, records=records: batch(records),
+            len(records),
+            args.repeat,
+        )
+        trusted_rate = measure(
+            lambda batch=batch, records=records: batch(records, trusted=True),
+            len(records),
+            args.repeat,
+        )
+        print(
+            f"{name:<10}{per_record_rate:>16,.0f}{batch_rate:>16,.0f}"
+            f"{batch_rate / per_record_rate:>9.2f}x"
+            f"{trusted_rate:>16,.0f}{trusted_rate / per_record_rate:>9.2f}x"
+        )
+
+    clients = cases[-1][1]
+    per_client_rate = measure(
+        lambda: [transform_client(c) for c in clients], len(clients), args.repeat
+    )
+    columns = ClientColumns.from_clients(clients)
+    columnar_rate = measure(
+        lambda: transform_client_columns(columns), len(clients), args.repeat
+    )
+    print(
+        f"\n{'columnar':<10}{columnar_rate:>16,.0f} clients/s"
+        f"{columnar_rate / per_client_rate:>9.2f}x vs transform_client"
+    )
+
+    if args.workers:
+        serial_rate = measure(
+            lambda: transform_clients(clients), len(clients), args.repeat
+        )
+        print(f"\n{'workers':<10}{'clients/s':>16}{'scaling':>10}")
+        for workers in args.workers:
+            rate = measure(
+                lambda workers=workers: transform_clients_parallel(
+                    clients, workers=workers
+                ),
+                len(clients),
+                args.repeat,
+            )
+            print(f"{workers:<10}{rate:>16,.0f}{rate / serial_rate:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
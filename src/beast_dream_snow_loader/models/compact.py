@@ -0,0 +1,186 @@
+"""Compact outbound records for the loader hot path.
+
+A million ``ServiceNowEndpoint`` instances each carry a ``__dict__``, a
+fields-set ``set`` and an extras dict, and every repeated value (site_id,
+device_type, timezone, sys_class_name...) is a separate string object.
+Compact records store the same fields in ``__slots__``, and an
+``InternTable`` shares one string object per distinct repeated value.
+
+Convert at the edges: ``from_model`` after transformation (or ``from_payload``
+for columnar rows), ``to_model`` where a Pydantic model is needed. The loader
+functions accept compact records directly and send ``to_payload()``.
+"""
+
+from collections.abc import Iterable
+from typing import Any, ClassVar, Generic, TypeVar
+
+from pydantic import BaseModel
+
+from beast_dream_snow_loader.models.servicenow import (
+    ServiceNowEndpoint,
+    ServiceNowGatewayCI,
+    ServiceNowLocation,
+    ServiceNowNetworkDeviceCI,
+)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+RecordT = TypeVar("RecordT", bound="CompactRecord")
+
+
+class InternTable:
+    """Shares one string object per distinct value (scoped, unlike sys.intern)."""
+
+    __slots__ = ("_strings",)
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self._strings: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: Any) -> Any:
+        """Get the shared instance of a string (other values are returned as-is)."""
+        if isinstance(value, str):
+            return self._strings.setdefault(value, value)
+        return value
+
+
+class CompactRecord(Generic[ModelT]):
+    """Slotted outbound record with the fields of a ServiceNow model.
+
+    Subclasses set ``model_type`` and ``interned`` (fields whose values repeat
+    across records); slots are derived from the model's fields. Fields not
+    declared on the model (``extra="allow"``) are kept in ``extra``.
+    """
+
+    __slots__ = ("extra",)
+
+    model_type: ClassVar[type[BaseModel]]
+    interned: ClassVar[frozenset[str]] = frozenset()
+    _fields: ClassVar[tuple[str, ...]] = ()
+
+    def __init_subclass__(cls, **kwargs: Any):
+        """Derive the field list from the model (slots are declared per subclass)."""
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(cls.model_type.model_fields)
+
+    def __init__(self, values: dict[str, Any], interns: InternTable | None = None):
+        """Initialize from field values (missing fields are None).
+
+        Args:
+            values: Field values, as in ``model_dump(exclude_none=True)``
+            interns: Intern table for repeated string values (default: none)
+        """
+        extra: dict[str, Any] = {}
+        for name, value in values.items():
+            if interns is not None and name in self.interned:
+                value = interns.intern(value)
+            if name in self._fields:
+                setattr(self, name, value)
+            else:
+                extra[name] = value
+        for name in self._fields:
+            if name not in values:
+                setattr(self, name, None)
+        self.extra = extra or None
+
+    def __getattr__(self, name: str) -> Any:
+        extra = object.__getattribute__(self, "extra")
+        if extra and name in extra:
+            return extra[name]
+        raise AttributeError(f"{type(self).__name__!r} has no attribute {name!r}")
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and self.to_payload() == other.to_payload()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(u_unifi_source_id={self.u_unifi_source_id!r})"
+
+    @classmethod
+    def from_model(
+        cls: type[RecordT], model: BaseModel, interns: InternTable | None = None
+    ) -> RecordT:
+        """Build a compact record from a ServiceNow model."""
+        return cls(model.model_dump(exclude_none=True), interns)
+
+    @classmethod
+    def from_payload(
+        cls: type[RecordT], payload: dict[str, Any], interns: InternTable | None = None
+    ) -> RecordT:
+        """Build a compact record from a payload dict (e.g. a columnar row)."""
+        return cls(payload, interns)
+
+    def to_payload(self) -> dict[str, Any]:
+        """Get the record as ``model_dump(exclude_none=True)`` would produce it."""
+        payload = {
+            name: value
+            for name in self._fields
+            if (value := getattr(self, name)) is not None
+        }
+        if self.extra:
+            payload.update(self.extra)
+        return payload
+
+    def to_model(self) -> ModelT:
+        """Convert back to the ServiceNow model (without re-validation)."""
+        return self.model_type.model_construct(**self.to_payload())  # type: ignore[return-value]
+
+
+class CompactGatewayCI(CompactRecord[ServiceNowGatewayCI]):
+    """Compact ServiceNowGatewayCI."""
+
+    model_type = ServiceNowGatewayCI
+    interned = frozenset({"firmware_version", "state", "sys_class_name"})
+    __slots__ = tuple(ServiceNowGatewayCI.model_fields)
+
+
+class CompactLocation(CompactRecord[ServiceNowLocation]):
+    """Compact ServiceNowLocation."""
+
+    model_type = ServiceNowLocation
+    interned = frozenset({"timezone", "host_id", "sys_class_name"})
+    __slots__ = tuple(ServiceNowLocation.model_fields)
+
+
+class CompactNetworkDeviceCI(CompactRecord[ServiceNowNetworkDeviceCI]):
+    """Compact ServiceNowNetworkDeviceCI."""
+
+    model_type = ServiceNowNetworkDeviceCI
+    interned = frozenset({"model", "site_id", "host_id", "sys_class_name"})
+    __slots__ = tuple(ServiceNowNetworkDeviceCI.model_fields)
+
+
+class CompactEndpoint(CompactRecord[ServiceNowEndpoint]):
+    """Compact ServiceNowEndpoint."""
+
+    model_type = ServiceNowEndpoint
+    interned = frozenset({"device_type", "site_id", "device_id", "sys_class_name"})
+    __slots__ = tuple(ServiceNowEndpoint.model_fields)
+
+
+_COMPACT_TYPES: dict[type[BaseModel], type[CompactRecord]] = {
+    ServiceNowGatewayCI: CompactGatewayCI,
+    ServiceNowLocation: CompactLocation,
+    ServiceNowNetworkDeviceCI: CompactNetworkDeviceCI,
+    ServiceNowEndpoint: CompactEndpoint,
+}
+
+
+def compact_records(
+    models: Iterable[BaseModel], interns: InternTable | None = None
+) -> list[CompactRecord]:
+    """Convert ServiceNow models to compact records sharing one intern table.
+
+    Args:
+        models: ServiceNow models (any mix of the four outbound types)
+        interns: Intern table to share (default: a new table for this call)
+
+    Returns:
+        Compact records, in input order
+
+    Raises:
+        KeyError: If a model is not a ServiceNow outbound model
+    """
+    interns = interns if interns is not None else InternTable()
+    return [_COMPACT_TYPES[type(m)].from_model(m, interns) for m in models]
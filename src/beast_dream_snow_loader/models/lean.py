@@ -0,0 +1,113 @@
+"""Lean variants of UniFi models that drop unmapped extra fields.
+
+UniFi models use ``extra="allow"``, so every unknown API key (e.g. the large
+``reportedState.features.*`` and ``userData.features.*`` trees) is retained per
+instance. A lean variant is a subclass that prunes its input to the declared
+fields plus the given source paths (the active field mappings) before
+validation, so only data the transformers actually read is kept in memory.
+Callers add any other extra fields they read (e.g. the topology and dedup
+fields added by unifi.streaming.mapped_model) to the source paths.
+
+Lean instances are still instances of the original model, so they work with
+all transformers unchanged. Without ``keep_raw`` at ingestion, the
+u_unifi_raw_data snapshot only holds the retained fields.
+"""
+
+import types
+from collections.abc import Iterable
+from functools import cache
+from typing import Any, TypeVar, Union, get_args, get_origin
+
+from pydantic import BaseModel, create_model, model_validator
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Keep tree: key → nested keep tree, or None to keep the whole value
+KeepTree = dict[str, "KeepTree | None"]
+
+
+def _nested_model(annotation: Any) -> type[BaseModel] | None:
+    """Get the model class of a field annotation (unwrapping ``X | None``)."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    if get_origin(annotation) in (Union, types.UnionType):
+        for arg in get_args(annotation):
+            model = _nested_model(arg)
+            if model is not None:
+                return model
+    return None
+
+
+def _model_keep_tree(model: type[BaseModel]) -> KeepTree:
+    """Build the keep tree of a model's declared fields (recursively)."""
+    tree: KeepTree = {}
+    for name, field in model.model_fields.items():
+        key = field.alias or name
+        nested = _nested_model(field.annotation)
+        tree[key] = _model_keep_tree(nested) if nested is not None else None
+    return tree
+
+
+def build_keep_tree(model: type[BaseModel], paths: Iterable[str]) -> KeepTree:
+    """Build the keep tree for a model's declared fields plus dotted source paths.
+
+    Args:
+        model: UniFi model class
+        paths: Dotted source paths to retain (e.g. ``reportedState.hardware.mac``)
+
+    Returns:
+        Nested dict of keys to keep (None = keep the whole value)
+    """
+    tree = _model_keep_tree(model)
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                break  # Whole value already kept
+            node = node.setdefault(part, {})  # type: ignore[assignment]
+        else:
+            node.setdefault(parts[-1], None)
+    return tree
+
+
+def prune(data: Any, keep: KeepTree) -> Any:
+    """Copy ``data`` keeping only the keys in the keep tree."""
+    if not isinstance(data, dict):
+        return data
+    pruned = {}
+    for key, subtree in keep.items():
+        if key in data:
+            value = data[key]
+            pruned[key] = value if subtree is None else prune(value, subtree)
+    return pruned
+
+
+@cache
+def _lean_model(model: type[BaseModel], paths: frozenset[str]) -> type[BaseModel]:
+    keep = build_keep_tree(model, paths)
+
+    def prune_unmapped(cls: type[BaseModel], data: Any) -> Any:
+        return prune(data, keep)
+
+    return create_model(
+        f"Lean{model.__name__}",
+        __base__=model,
+        __module__=__name__,
+        __validators__={
+            "prune_unmapped": model_validator(mode="before")(prune_unmapped)
+        },
+    )
+
+
+def lean_model(model: type[ModelT], paths: Iterable[str]) -> type[ModelT]:
+    """Get the (cached) lean variant of a UniFi model.
+
+    Args:
+        model: UniFi model class (e.g. UniFiHost)
+        paths: Source paths referenced by the active field mappings
+
+    Returns:
+        Subclass of ``model`` that drops all other extra fields on validation
+    """
+    return _lean_model(model, frozenset(paths))  # type: ignore[return-value]
@@ -0,0 +1,99 @@
+"""Raw source JSON passthrough for u_unifi_raw_data.
+
+``RawJSON`` wraps the original JSON bytes of a UniFi source record, as sliced
+out at ingestion. Transformers attach it to outbound models as-is, and the API
+client splices the bytes straight into the request body - no per-record deep
+copy (``model_dump``) or re-encoding for raw-data capture.
+"""
+
+import json
+import uuid
+from typing import Any
+
+from pydantic import BaseModel, GetCoreSchemaHandler, SerializationInfo
+from pydantic_core import core_schema
+
+
+class RawJSON:
+    """Original JSON bytes of one source object (must be a valid JSON value)."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes | bytearray | memoryview):
+        self.data = data
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.data)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RawJSON) and bytes(self.data) == bytes(other.data)
+
+    def __hash__(self) -> int:
+        return hash(bytes(self.data))
+
+    def __repr__(self) -> str:
+        return f"RawJSON({len(self.data)} bytes)"
+
+    def loads(self) -> Any:
+        """Decode the JSON (copies - only for fallbacks and inspection)."""
+        return json.loads(bytes(self.data))
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        # Python-mode dumps keep the wrapper (spliced by encode_json_body);
+        # JSON-mode dumps decode it so model_dump_json etc. still work.
+        return core_schema.is_instance_schema(
+            cls,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls._serialize, info_arg=True
+            ),
+        )
+
+    @staticmethod
+    def _serialize(value: "RawJSON", info: SerializationInfo) -> Any:
+        return value.loads() if info.mode == "json" else value
+
+
+def attach_raw_json(
+    model: BaseModel, data: bytes | bytearray | memoryview
+) -> BaseModel:
+    """Attach original JSON bytes to a UniFi model (returns the model)."""
+    model._raw_json = RawJSON(data)
+    return model
+
+
+def get_raw_json(model: BaseModel) -> RawJSON | None:
+    """Get original JSON bytes attached at ingestion (None if not kept)."""
+    return getattr(model, "_raw_json", None)
+
+
+def contains_raw_json(data: dict[str, Any]) -> bool:
+    """Check whether a payload has top-level RawJSON values."""
+    return any(isinstance(value, RawJSON) for value in data.values())
+
+
+def encode_json_body(data: dict[str, Any]) -> bytes:
+    """Encode a request payload, splicing RawJSON values in as raw bytes.
+
+    Each RawJSON is encoded as a unique placeholder string which is then
+    replaced by the original bytes, so raw data is never decoded or re-encoded.
+    """
+    nonce = uuid.uuid4().hex
+    raw_values: list[RawJSON] = []
+
+    def placeholder(value: Any) -> str:
+        if isinstance(value, RawJSON):
+            raw_values.append(value)
+            return f"__raw_json_{nonce}_{len(raw_values) - 1}__"
+        raise TypeError(
+            f"Object of type {type(value).__name__} is not JSON serializable"
+        )
+
+    body = json.dumps(data, default=placeholder).encode()
+    for index, raw in enumerate(raw_values):
+        body = body.replace(
+            f'"__raw_json_{nonce}_{index}__"'.encode(), bytes(raw.data), 1
+        )
+    return body
@@ -4,6 +4,8 @@ from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from beast_dream_snow_loader.models.raw import RawJSON
+
 
 class ServiceNowGatewayCI(BaseModel):
     """ServiceNow network gateway configuration item model.
@@ -22,7 +24,7 @@ class ServiceNowGatewayCI(BaseModel):
     u_unifi_source_id: str = Field(
         ..., description="UniFi source identifier (required, for tracking)"
     )
-    u_unifi_raw_data: dict[str, Any] | None = Field(
+    u_unifi_raw_data: dict[str, Any] | RawJSON | None = Field(
         None, description="Raw UniFi source data (JSON) for audit/reconciliation"
     )
     name: str = Field(..., description="Gateway name")
@@ -52,7 +54,7 @@ class ServiceNowLocation(BaseModel):
     u_unifi_source_id: str = Field(
         ..., description="UniFi source identifier (required, for tracking)"
     )
-    u_unifi_raw_data: dict[str, Any] | None = Field(
+    u_unifi_raw_data: dict[str, Any] | RawJSON | None = Field(
         None, description="Raw UniFi source data (JSON) for audit/reconciliation"
     )
     name: str = Field(..., description="Location name")
@@ -81,7 +83,7 @@ class ServiceNowNetworkDeviceCI(BaseModel):
     u_unifi_source_id: str = Field(
         ..., description="UniFi source identifier (required, for tracking)"
     )
-    u_unifi_raw_data: dict[str, Any] | None = Field(
+    u_unifi_raw_data: dict[str, Any] | RawJSON | None = Field(
         None, description="Raw UniFi source data (JSON) for audit/reconciliation"
     )
     name: str = Field(..., description="Device name")
@@ -115,7 +117,7 @@ class ServiceNowEndpoint(BaseModel):
     u_unifi_source_id: str = Field(
         ..., description="UniFi source identifier (required, for tracking)"
     )
-    u_unifi_raw_data: dict[str, Any] | None = Field(
+    u_unifi_raw_data: dict[str, Any] | RawJSON | None = Field(
         None, description="Raw UniFi source data (JSON) for audit/reconciliation"
     )
     hostname: str = Field(..., description="Hostname")
@@ -1,6 +1,8 @@
 """UniFi API data models using Pydantic for validation."""
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from beast_dream_snow_loader.models.raw import RawJSON
 
 
 class ReportedState(BaseModel):
@@ -55,6 +57,9 @@ class UniFiHost(BaseModel):
     reportedState: ReportedState = Field(..., description="Reported state data")
     userData: UserData = Field(..., description="User data")
 
+    # Original source JSON bytes, kept at ingestion for u_unifi_raw_data
+    _raw_json: RawJSON | None = PrivateAttr(default=None)
+
 
 class SiteCounts(BaseModel):
     """Nested model for statistics.counts fields from UniFi API."""
@@ -134,6 +139,9 @@ class UniFiSite(BaseModel):
     meta: SiteMeta = Field(..., description="Site metadata")
     statistics: SiteStatistics = Field(..., description="Site statistics")
 
+    # Original source JSON bytes, kept at ingestion for u_unifi_raw_data
+    _raw_json: RawJSON | None = PrivateAttr(default=None)
+
 
 class UniFiDevice(BaseModel):
     """UniFi network device data model."""
@@ -143,6 +151,9 @@ class UniFiDevice(BaseModel):
     hostId: str = Field(..., description="Host identifier")
     updatedAt: str = Field(..., description="Last update timestamp")
 
+    # Original source JSON bytes, kept at ingestion for u_unifi_raw_data
+    _raw_json: RawJSON | None = PrivateAttr(default=None)
+
 
 class UniFiClient(BaseModel):
     """UniFi client/endpoint data model."""
@@ -157,3 +168,6 @@ class UniFiClient(BaseModel):
     )
     siteId: str | None = Field(None, description="Site identifier")
     deviceId: str | None = Field(None, description="Device identifier")
+
+    # Original source JSON bytes, kept at ingestion for u_unifi_raw_data
+    _raw_json: RawJSON | None = PrivateAttr(default=None)
@@ -17,6 +17,7 @@ from .error_handler import (
     OperationalError,
 )
 from .health import HealthCheck, HealthMonitor, HealthStatus
+from .hedging import HedgePolicy, RequestHedger
 from .logger import StructuredLogger
 from .metrics import MetricsCollector, OperationMetrics, SystemMetrics
 from .retry import RetryManager, RetryPolicy
@@ -35,6 +36,8 @@ __all__ = [
     "HealthMonitor",
     "HealthCheck",
     "HealthStatus",
+    "HedgePolicy",
+    "RequestHedger",
     "MetricsCollector",
     "OperationMetrics",
     "SystemMetrics",
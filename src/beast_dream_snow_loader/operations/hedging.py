@@ -0,0 +1,140 @@
+"""Request hedging for idempotent reads to cut tail latency."""
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from .logger import StructuredLogger
+from .metrics import MetricsCollector
+
+
+@dataclass
+class HedgePolicy:
+    """Configuration for hedged requests.
+
+    A hedge is a duplicate of a slow idempotent request. It is sent once the
+    primary has been outstanding for the hedge delay; whichever finishes first
+    wins. Only use hedging for reads (GET) - never for creates or updates.
+    """
+
+    delay_seconds: float = 0.1  # Fallback delay when no latency history exists
+    delay_percentile: float | None = 95.0  # Observed percentile used as delay
+    min_samples: int = 20  # Samples required before trusting observed percentile
+    min_delay_seconds: float = 0.005  # Floor so hedges never fire immediately
+    max_hedge_ratio: float = 0.1  # Max fraction of requests that may be hedged
+
+
+class RequestHedger:
+    """Executes idempotent operations with a delayed duplicate (hedge).
+
+    The hedge delay comes from the observed response time percentile in a
+    MetricsCollector when enough samples exist, otherwise from the policy.
+    The number of hedges is capped at ``max_hedge_ratio`` of all requests so
+    hedging cannot amplify load on a struggling instance.
+
+    Note: Python threads cannot be interrupted, so the losing request is
+    cancelled only if it has not started yet; otherwise its result is discarded.
+    """
+
+    def __init__(
+        self,
+        policy: HedgePolicy | None = None,
+        metrics: MetricsCollector | None = None,
+        max_workers: int = 8,
+    ):
+        self.policy = policy or HedgePolicy()
+        self.metrics = metrics
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="request_hedger"
+        )
+        self._lock = threading.Lock()
+        self._total_requests = 0
+        self._hedged_requests = 0
+        self._hedge_wins = 0
+
+        self.logger = StructuredLogger("request_hedger")
+
+    def get_hedge_delay(self, operation_name: str) -> float:
+        """Get hedge delay in seconds for an operation."""
+        delay = self.policy.delay_seconds
+
+        if self.metrics is not None and self.policy.delay_percentile is not None:
+            operation_metrics = self.metrics.get_operation_metrics(operation_name)
+            if (
+                operation_metrics is not None
+                and len(operation_metrics.response_times) >= self.policy.min_samples
+            ):
+                delay = (
+                    operation_metrics.get_percentile(self.policy.delay_percentile)
+                    / 1000
+                )
+
+        return max(delay, self.policy.min_delay_seconds)
+
+    def _reserve_hedge(self) -> bool:
+        """Reserve a hedge slot if the hedge ratio cap allows it."""
+        with self._lock:
+            ratio = (self._hedged_requests + 1) / max(1, self._total_requests)
+            if ratio > self.policy.max_hedge_ratio:
+                return False
+            self._hedged_requests += 1
+            return True
+
+    def execute(
+        self, operation: Callable[[], Any], operation_name: str = "unknown"
+    ) -> Any:
+        """Execute an idempotent operation, hedging it if it is slow.
+
+        Returns the first successful result. If both attempts fail, the last
+        exception is raised.
+        """
+        with self._lock:
+            self._total_requests += 1
+
+        primary = self._executor.submit(operation)
+        done, _ = wait([primary], timeout=self.get_hedge_delay(operation_name))
+        if done or not self._reserve_hedge():
+            return primary.result()
+
+        hedge = self._executor.submit(operation)
+        self.logger.debug(
+            f"Hedging slow request for {operation_name}",
+            operation=operation_name,
+            resilience_event=True,
+        )
+
+        pending = {primary, hedge}
+        last_exception: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                exception = future.exception()
+                if exception is not None:
+                    last_exception = exception
+                    continue
+
+                for other in pending:
+                    other.cancel()
+                if future is hedge:
+                    with self._lock:
+                        self._hedge_wins += 1
+                return future.result()
+
+        raise last_exception or RuntimeError("Hedged request completed without result")
+
+    def get_stats(self) -> dict:
+        """Get hedging statistics."""
+        with self._lock:
+            return {
+                "total_requests": self._total_requests,
+                "hedged_requests": self._hedged_requests,
+                "hedge_wins": self._hedge_wins,
+                "hedge_ratio": self._hedged_requests / max(1, self._total_requests),
+                "max_hedge_ratio": self.policy.max_hedge_ratio,
+            }
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool without waiting for abandoned requests."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,14 +1,22 @@
 """ServiceNow REST API client for CMDB operations."""
 
+import base64
+import json
 import os
 import shutil
 import subprocess
+import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from typing import Any
 
 import requests  # type: ignore
 
+from beast_dream_snow_loader.models.raw import contains_raw_json, encode_json_body
+from beast_dream_snow_loader.operations.hedging import HedgePolicy, RequestHedger
+from beast_dream_snow_loader.operations.metrics import MetricsCollector
+from beast_dream_snow_loader.servicenow.raw_data_policy import RawDataPolicy
+
 # Cluster-wide rule: Never create .env files in project directories.
 # Execution context detection & graceful degradation:
 # - Beast node: Has access to beast services (1Password, etc.) or they are provisionable
@@ -18,6 +26,17 @@ import requests  # type: ignore
 # Code reads from os.getenv() which automatically uses the executing user's system environment.
 
 
+def _json_body(data: dict[str, Any]) -> dict[str, Any]:
+    """Get request kwargs for a JSON payload.
+
+    Payloads carrying RawJSON (original source bytes) are pre-encoded so the
+    raw bytes are spliced in as-is; everything else uses requests' json=.
+    """
+    if contains_raw_json(data):
+        return {"data": encode_json_body(data)}
+    return {"json": data}
+
+
 def _is_instance_hibernating(response: requests.Response) -> bool:
     """Check if ServiceNow instance is hibernating based on response.
 
@@ -302,6 +321,9 @@ class ServiceNowAPIClient:
         password: str | None = None,
         api_key: str | None = None,
         oauth_token: str | None = None,
+        metrics: MetricsCollector | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        raw_data_policy: RawDataPolicy | None = None,
     ):
         """Initialize ServiceNow API client.
 
@@ -311,6 +333,11 @@ class ServiceNowAPIClient:
             password: ServiceNow password (for Basic Auth, fallback only)
             api_key: ServiceNow API key (preferred, used as password in Basic Auth)
             oauth_token: OAuth 2.0 access token (most secure, Bearer token)
+            metrics: Optional metrics collector; records response time per operation
+            hedge_policy: Optional hedging policy for idempotent reads (get_record,
+                query_records). Opt-in; hedge delay uses observed p95 from metrics.
+            raw_data_policy: Optional u_unifi_raw_data storage policy applied to
+                create_record/update_record (digest, compress, or offload)
 
         Authentication Priority:
         1. API key (SERVICENOW_API_KEY + SERVICENOW_USERNAME) - Recommended for production
@@ -362,6 +389,18 @@ class ServiceNowAPIClient:
             }
         )
 
+        # Operational instrumentation (opt-in)
+        self.metrics = metrics
+        self.hedger = (
+            RequestHedger(hedge_policy, metrics=metrics) if hedge_policy else None
+        )
+        self.raw_data_policy = raw_data_policy
+        # Per-thread sessions for hedged reads (requests.Session is not
+        # thread-safe, and a hedge runs concurrently with its primary)
+        self._thread_local = threading.local()
+        self._thread_sessions: list[requests.Session] = []
+        self._thread_sessions_lock = threading.Lock()
+
         # Authentication: Priority 1 - API Key (Recommended for production)
         # Use service account user (named user, no UI login) with API key
         # Try: function arg → env var → 1Password
@@ -476,6 +515,103 @@ class ServiceNowAPIClient:
             "    (Development/testing only - NOT recommended for production)"
         )
 
+    def _execute(
+        self,
+        operation: Callable[[], requests.Response],
+        operation_name: str,
+        table: str,
+        hedge: bool = False,
+    ) -> requests.Response:
+        """Execute a request with hibernation retry, metrics and optional hedging.
+
+        Args:
+            operation: Function that returns a requests.Response
+            operation_name: Operation name used for metrics (e.g., 'get_record')
+            table: ServiceNow table name (for logging and metrics context)
+            hedge: If True and a hedge policy is configured, hedge the request.
+                Only pass True for idempotent reads.
+
+        Returns:
+            Response from the API call
+        """
+
+        def _attempt() -> requests.Response:
+            start_time = time.perf_counter()
+            success = False
+            try:
+                response = _execute_with_hibernation_retry(
+                    operation, operation_name=f"{operation_name}({table})"
+                )
+                success = response.status_code < 400
+                return response
+            finally:
+                self._record_request(operation_name, start_time, success, table)
+
+        if not hedge or self.hedger is None:
+            return _attempt()
+
+        # Each attempt records its own latency under operation_name (the hedge
+        # delay is that operation's p95); the end-to-end latency of the hedged
+        # request is kept separately so successful hedges don't shrink the delay.
+        start_time = time.perf_counter()
+        success = False
+        try:
+            response = self.hedger.execute(_attempt, operation_name=operation_name)
+            success = response.status_code < 400
+            return response
+        finally:
+            self._record_request(f"{operation_name}_hedged", start_time, success, table)
+
+    def _record_request(
+        self, operation_name: str, start_time: float, success: bool, table: str
+    ) -> None:
+        """Record a request's response time in metrics (if enabled)."""
+        if self.metrics is not None:
+            self.metrics.record_request(
+                operation_name,
+                (time.perf_counter() - start_time) * 1000,
+                success,
+                {"table": table},
+            )
+
+    def _read_session(self) -> requests.Session:
+        """Get the session for reads on the current thread.
+
+        Without hedging all requests use ``self.session``. With hedging, each
+        hedger worker thread gets its own session with the same headers, auth
+        and adapters. Non-Session replacements (e.g. test doubles) are shared.
+        """
+        if self.hedger is None or not isinstance(self.session, requests.Session):
+            return self.session
+        session = getattr(self._thread_local, "session", None)
+        if session is None or self._thread_local.base is not self.session:
+            session = requests.Session()
+            session.headers.update(self.session.headers)
+            session.auth = self.session.auth
+            for prefix, adapter in self.session.adapters.items():
+                session.mount(prefix, adapter)
+            self._thread_local.session = session
+            self._thread_local.base = self.session
+            with self._thread_sessions_lock:
+                self._thread_sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        """Close sessions and shut down the hedger's worker pool."""
+        if self.hedger is not None:
+            self.hedger.shutdown()
+        with self._thread_sessions_lock:
+            sessions, self._thread_sessions = self._thread_sessions, []
+        for session in sessions:
+            session.close()
+        self.session.close()
+
+    def __enter__(self) -> "ServiceNowAPIClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def create_record(self, table: str, data: dict[str, Any]) -> dict[str, Any]:
         """Create a record in a ServiceNow table.
 
@@ -490,13 +626,15 @@ class ServiceNowAPIClient:
             requests.HTTPError: If API request fails
         """
         url = f"{self.base_url}/table/{table}"
+        policy = self.raw_data_policy
+        prepared = policy.prepare(table, data) if policy is not None else None
+        if prepared is not None:
+            data = prepared.data
 
         def _create() -> requests.Response:
-            return self.session.post(url, json=data)
+            return self.session.post(url, **_json_body(data))
 
-        response = _execute_with_hibernation_retry(
-            _create, operation_name=f"create_record({table})"
-        )
+        response = self._execute(_create, "create_record", table)
         if response.status_code == 401:
             # Provide more detail on auth failure
             error_detail = response.text
@@ -524,7 +662,13 @@ class ServiceNowAPIClient:
                 f"This may indicate missing required fields, invalid table name, or validation errors."
             )
         response.raise_for_status()
-        return response.json().get("result", {})  # type: ignore
+        result = response.json().get("result", {})
+        if policy is not None and prepared is not None:
+            # A new record has no earlier attachments to replace
+            policy.complete(
+                self, table, result.get("sys_id"), prepared, replace_previous=False
+            )
+        return result  # type: ignore
 
     def get_record(self, table: str, sys_id: str) -> dict[str, Any] | None:
         """Get a record from a ServiceNow table by sys_id.
@@ -542,11 +686,9 @@ class ServiceNowAPIClient:
         url = f"{self.base_url}/table/{table}/{sys_id}"
 
         def _get() -> requests.Response:
-            return self.session.get(url)
+            return self._read_session().get(url)
 
-        response = _execute_with_hibernation_retry(
-            _get, operation_name=f"get_record({table})"
-        )
+        response = self._execute(_get, "get_record", table, hedge=True)
         if response.status_code == 404:
             return None
         response.raise_for_status()
@@ -555,7 +697,7 @@ class ServiceNowAPIClient:
     def update_record(
         self, table: str, sys_id: str, data: dict[str, Any]
     ) -> dict[str, Any]:
-        """Update a record in a ServiceNow table.
+        """Update a record in a ServiceNow table (PUT with the full record).
 
         Args:
             table: ServiceNow table name
@@ -568,17 +710,104 @@ class ServiceNowAPIClient:
         Raises:
             requests.HTTPError: If API request fails
         """
+        return self._write_record("put", "update_record", table, sys_id, data)
+
+    def patch_record(
+        self, table: str, sys_id: str, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Update only the given fields of a record (PATCH).
+
+        Args:
+            table: ServiceNow table name
+            sys_id: Record sys_id
+            data: Changed fields only
+
+        Returns:
+            Updated record data from ServiceNow
+
+        Raises:
+            requests.HTTPError: If API request fails
+        """
+        return self._write_record("patch", "patch_record", table, sys_id, data)
+
+    def _write_record(
+        self,
+        method: str,
+        operation: str,
+        table: str,
+        sys_id: str,
+        data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Write to an existing record with the given HTTP method."""
         url = f"{self.base_url}/table/{table}/{sys_id}"
+        policy = self.raw_data_policy
+        prepared = policy.prepare(table, data) if policy is not None else None
+        if prepared is not None:
+            data = prepared.data
+        send = getattr(self.session, method)
 
         def _update() -> requests.Response:
-            return self.session.put(url, json=data)
+            return send(url, **_json_body(data))  # type: ignore[no-any-return]
 
-        response = _execute_with_hibernation_retry(
-            _update, operation_name=f"update_record({table})"
-        )
+        response = self._execute(_update, operation, table)
+        response.raise_for_status()
+        result = response.json().get("result", {})
+        if policy is not None and prepared is not None:
+            policy.complete(self, table, sys_id, prepared)
+        return result  # type: ignore
+
+    def upload_attachment(
+        self,
+        table: str,
+        sys_id: str,
+        file_name: str,
+        content: bytes,
+        content_type: str = "application/json",
+    ) -> dict[str, Any]:
+        """Upload a file as an attachment to a record (Attachment API).
+
+        Args:
+            table: Table of the record to attach to
+            sys_id: Record sys_id
+            file_name: Attachment file name
+            content: File content
+            content_type: Content MIME type
+
+        Returns:
+            Attachment metadata from ServiceNow (sys_id, file_name, size_bytes, ...)
+
+        Raises:
+            requests.HTTPError: If API request fails
+        """
+        url = f"{self.base_url}/attachment/file"
+        params = {"table_name": table, "table_sys_id": sys_id, "file_name": file_name}
+
+        def _upload() -> requests.Response:
+            return self.session.post(
+                url, params=params, data=content, headers={"Content-Type": content_type}
+            )
+
+        response = self._execute(_upload, "upload_attachment", table)
         response.raise_for_status()
         return response.json().get("result", {})  # type: ignore
 
+    def delete_attachment(self, attachment_sys_id: str) -> None:
+        """Delete an attachment (Attachment API).
+
+        Args:
+            attachment_sys_id: sys_attachment sys_id
+
+        Raises:
+            requests.HTTPError: If API request fails
+        """
+        url = f"{self.base_url}/attachment/{attachment_sys_id}"
+
+        def _delete() -> requests.Response:
+            return self.session.delete(url)
+
+        response = self._execute(_delete, "delete_attachment", "sys_attachment")
+        response.raise_for_status()
+
     def query_records(
         self, table: str, query: str | None = None, limit: int = 100
     ) -> list[dict[str, Any]]:
@@ -601,14 +830,131 @@ class ServiceNowAPIClient:
             params["sysparm_query"] = query
 
         def _query() -> requests.Response:
-            return self.session.get(url, params=params)
+            return self._read_session().get(url, params=params)
 
-        response = _execute_with_hibernation_retry(
-            _query, operation_name=f"query_records({table})"
-        )
+        response = self._execute(_query, "query_records", table, hedge=True)
         response.raise_for_status()
         return response.json().get("result", [])  # type: ignore
 
+    def iter_records(
+        self,
+        table: str,
+        query: str | None = None,
+        fields: list[str] | None = None,
+        page_size: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream records from a ServiceNow table page by page.
+
+        Only one page is held in memory at a time. Use ``fields`` to project
+        just the columns needed (e.g., sys_id and u_unifi_source_id). Records
+        are ordered by sys_id, so offset paging neither skips nor repeats
+        records.
+
+        Args:
+            table: ServiceNow table name
+            query: ServiceNow encoded query string (e.g., 'name=test')
+            fields: Fields to return (sysparm_fields); all fields if None
+            page_size: Records per request
+
+        Yields:
+            Record data dictionaries
+
+        Raises:
+            requests.HTTPError: If API request fails
+        """
+        url = f"{self.base_url}/table/{table}"
+        params: dict[str, Any] = {
+            "sysparm_limit": page_size,
+            "sysparm_exclude_reference_link": "true",
+        }
+        # Offset paging needs a stable order
+        params["sysparm_query"] = f"{query}^ORDERBYsys_id" if query else "ORDERBYsys_id"
+        if fields:
+            params["sysparm_fields"] = ",".join(fields)
+
+        offset = 0
+        while True:
+            page_params = {**params, "sysparm_offset": offset}
+
+            def _query(page_params: dict[str, Any] = page_params) -> requests.Response:
+                return self._read_session().get(url, params=page_params)
+
+            response = self._execute(_query, "query_records", table, hedge=True)
+            response.raise_for_status()
+            records = response.json().get("result", [])
+            yield from records
+
+            if len(records) < page_size:
+                return
+            offset += page_size
+
+    def batch_requests(
+        self, rest_requests: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Send several REST requests in one call via the Batch API.
+
+        Args:
+            rest_requests: Requests, each with 'method' (e.g., 'PATCH'), 'path'
+                relative to /api/now (e.g., '/table/cmdb_ci/<sys_id>') and an
+                optional 'body' dictionary
+
+        Returns:
+            One entry per request, in input order, with 'status_code'
+            (None if the instance did not service the request) and 'result'
+            (decoded response result, or None)
+
+        Raises:
+            requests.HTTPError: If the batch request itself fails
+        """
+        if not rest_requests:
+            return []
+
+        url = f"{self.base_url}/v1/batch"
+        batch_body: dict[str, Any] = {
+            "batch_request_id": str(int(time.time() * 1000)),
+            "rest_requests": [],
+        }
+        for index, rest_request in enumerate(rest_requests):
+            entry: dict[str, Any] = {
+                "id": str(index),
+                "method": rest_request["method"].upper(),
+                "url": f"/api/now{rest_request['path']}",
+                "headers": [
+                    {"name": "Content-Type", "value": "application/json"},
+                    {"name": "Accept", "value": "application/json"},
+                ],
+            }
+            if rest_request.get("body") is not None:
+                entry["body"] = base64.b64encode(
+                    encode_json_body(rest_request["body"])
+                ).decode()
+            batch_body["rest_requests"].append(entry)
+
+        def _batch() -> requests.Response:
+            return self.session.post(url, json=batch_body)
+
+        response = self._execute(_batch, "batch_requests", "batch")
+        response.raise_for_status()
+        payload = response.json()
+
+        results: list[dict[str, Any]] = [
+            {"status_code": None, "result": None} for _ in rest_requests
+        ]
+        for serviced in payload.get("serviced_requests", []):
+            index = int(serviced["id"])
+            result = None
+            if serviced.get("body"):
+                try:
+                    decoded = json.loads(base64.b64decode(serviced["body"]))
+                    result = decoded.get("result", decoded)
+                except ValueError:
+                    result = None
+            results[index] = {
+                "status_code": serviced.get("status_code"),
+                "result": result,
+            }
+        return results
+
     def table_exists(self, table_name: str) -> bool:
         """Check if a ServiceNow table exists and is accessible.
 
@@ -0,0 +1,235 @@
+"""Batched last-seen heartbeat updates, separate from content updates.
+
+Showing when UniFi last saw each CI would otherwise need an update of every
+record on every cycle. ``HeartbeatTracker`` records last-seen timestamps
+locally (a dict write per record per cycle) and flushes them at a lower
+frequency, by default hourly, as single-field PATCHes packed into Batch API
+calls. Each record is written at most once per flush, however many cycles
+saw it.
+
+The heartbeat field is not part of the outbound models, so content diffs
+(snapshot_diff, partial_update) never see it and heartbeats never trigger
+content writes. It is a custom date/time column (see
+docs/servicenow_constraints.md). The Table API answers a PATCH of a missing
+column with 200 and stores nothing, so the first successful write of a
+tracker is checked against the returned record and a missing column raises
+``HeartbeatFieldMissingError``.
+"""
+
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from beast_dream_snow_loader.servicenow.api_client import ServiceNowAPIClient
+from beast_dream_snow_loader.servicenow.loader import LOAD_TARGETS, LoadTarget
+
+HEARTBEAT_FIELD = "u_unifi_last_seen"
+DEFAULT_FLUSH_INTERVAL_SECONDS = 3600.0
+
+# ServiceNow GlideDateTime format (UTC)
+GLIDE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def format_glide_datetime(epoch_seconds: float) -> str:
+    """Format epoch seconds as a ServiceNow date/time value (UTC)."""
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc).strftime(
+        GLIDE_DATETIME_FORMAT
+    )
+
+
+class HeartbeatFieldMissingError(Exception):
+    """Raised when the heartbeat column does not exist on the target table."""
+
+    def __init__(self, table: str, heartbeat_field: str):
+        self.table = table
+        self.heartbeat_field = heartbeat_field
+        super().__init__(
+            f"Heartbeat column '{heartbeat_field}' is missing on '{table}' "
+            f"(ServiceNow accepted the PATCH but stored nothing)"
+        )
+
+
+@dataclass
+class HeartbeatFlushResult:
+    """Outcome of one heartbeat flush."""
+
+    updated: dict[str, int] = field(default_factory=dict)
+    batch_calls: int = 0
+    failed: dict[str, list[str]] = field(default_factory=dict)  # Kept pending
+    unmapped: dict[str, list[str]] = field(default_factory=dict)  # Dropped
+
+
+@dataclass
+class HeartbeatStats:
+    """Heartbeats recorded and written by a tracker."""
+
+    recorded: int = 0
+    flushes: int = 0
+    updated: int = 0
+    batch_calls: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Sightings that needed no write of their own."""
+        return max(0, self.recorded - self.updated)
+
+
+class HeartbeatTracker:
+    """Records last-seen timestamps and flushes them in batches."""
+
+    def __init__(
+        self,
+        client: ServiceNowAPIClient,
+        id_mapping: Mapping[str, Mapping[str, str]],
+        heartbeat_field: str = HEARTBEAT_FIELD,
+        flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        batch_size: int = 100,
+        clock: Callable[[], float] = time.time,
+        targets: Mapping[str, LoadTarget] | None = None,
+    ):
+        """Initialize tracker.
+
+        Args:
+            client: ServiceNow API client
+            id_mapping: Loader class → {source_id: sys_id} (e.g. from
+                load_entities_with_relationships); read at flush time
+            heartbeat_field: Date/time field holding the last-seen time
+            flush_interval_seconds: Minimum time between flushes
+            batch_size: PATCH requests per Batch API call
+            clock: Time source (epoch seconds)
+            targets: Override table/class per loader class
+        """
+        self.client = client
+        self.id_mapping = id_mapping
+        self.heartbeat_field = heartbeat_field
+        self.flush_interval_seconds = flush_interval_seconds
+        self.batch_size = batch_size
+        self.clock = clock
+        self.targets = targets or LOAD_TARGETS
+        self.stats = HeartbeatStats()
+        # Loader class → source_id → last seen (epoch seconds), since last flush
+        self.pending: dict[str, dict[str, float]] = {}
+        self.last_flush = clock()
+        # Tables whose returned records showed the heartbeat column
+        self._verified_tables: set[str] = set()
+
+    @property
+    def pending_count(self) -> int:
+        """Records waiting for the next flush."""
+        return sum(len(seen) for seen in self.pending.values())
+
+    def record(
+        self, target: str, source_ids: Iterable[str], seen_at: float | None = None
+    ) -> None:
+        """Record that UniFi saw these records (no request is sent).
+
+        Args:
+            target: Loader class key (e.g. TABLE_ENDPOINT)
+            source_ids: Source IDs seen this cycle
+            seen_at: Time they were seen (default: now)
+        """
+        seen_at = self.clock() if seen_at is None else seen_at
+        pending = self.pending.setdefault(target, {})
+        for source_id in source_ids:
+            if pending.get(source_id, 0.0) < seen_at:
+                pending[source_id] = seen_at
+            self.stats.recorded += 1
+
+    def due(self) -> bool:
+        """Whether the flush interval has elapsed."""
+        return self.clock() - self.last_flush >= self.flush_interval_seconds
+
+    def maybe_flush(self) -> HeartbeatFlushResult | None:
+        """Flush if the flush interval has elapsed (call once per cycle)."""
+        return self.flush() if self.due() else None
+
+    def flush(self) -> HeartbeatFlushResult:
+        """Write pending last-seen times as batched single-field PATCHes.
+
+        Records without a known sys_id are dropped (a later content load
+        creates them); failed writes stay pending for the next flush.
+
+        Returns:
+            Updated counts, batch calls, failed and unmapped source IDs
+
+        Raises:
+            HeartbeatFieldMissingError: If a written record comes back without
+                the heartbeat column (everything unwritten stays pending)
+        """
+        result = HeartbeatFlushResult()
+        pending, self.pending = self.pending, {}
+        self.last_flush = self.clock()
+
+        for target, seen in pending.items():
+            table = self.targets[target].table
+            known = self.id_mapping.get(target, {})
+            writes: list[tuple[str, str, float]] = []
+            for source_id, seen_at in seen.items():
+                sys_id = known.get(source_id)
+                if sys_id:
+                    writes.append((source_id, sys_id, seen_at))
+                else:
+                    result.unmapped.setdefault(target, []).append(source_id)
+
+            updated = 0
+            for start in range(0, len(writes), self.batch_size):
+                chunk = writes[start : start + self.batch_size]
+                rest_requests = [
+                    {
+                        "method": "PATCH",
+                        "path": f"/table/{table}/{sys_id}",
+                        "body": {self.heartbeat_field: format_glide_datetime(seen_at)},
+                    }
+                    for _, sys_id, seen_at in chunk
+                ]
+                result.batch_calls += 1
+                try:
+                    responses = self.client.batch_requests(rest_requests)
+                except Exception as e:
+                    print(f"⚠️  Heartbeat: Batch request failed: {e}")
+                    responses = [{"status_code": None}] * len(chunk)
+                self._check_field(table, responses, pending)
+                for (source_id, _, seen_at), response in zip(
+                    chunk, responses, strict=True
+                ):
+                    status_code = response["status_code"]
+                    if status_code is not None and 200 <= status_code < 300:
+                        updated += 1
+                    else:
+                        result.failed.setdefault(target, []).append(source_id)
+                        # Keep for the next flush unless seen again since
+                        retry = self.pending.setdefault(target, {})
+                        retry[source_id] = max(retry.get(source_id, 0.0), seen_at)
+            result.updated[target] = updated
+            self.stats.updated += updated
+
+        self.stats.flushes += 1
+        self.stats.batch_calls += result.batch_calls
+        return result
+
+    def _check_field(
+        self,
+        table: str,
+        responses: list[dict],
+        pending: dict[str, dict[str, float]],
+    ) -> None:
+        """Check the first returned record of a table for the heartbeat column."""
+        if table in self._verified_tables:
+            return
+        for response in responses:
+            status_code = response["status_code"]
+            record = response.get("result")
+            if status_code is None or not 200 <= status_code < 300:
+                continue
+            if not isinstance(record, dict):
+                continue
+            if self.heartbeat_field in record:
+                self._verified_tables.add(table)
+                return
+            # Nothing is stored anywhere: keep everything pending and stop
+            for target, seen in pending.items():
+                retry = self.pending.setdefault(target, {})
+                for source_id, seen_at in seen.items():
+                    retry[source_id] = max(retry.get(source_id, 0.0), seen_at)
+            raise HeartbeatFieldMissingError(table, self.heartbeat_field)
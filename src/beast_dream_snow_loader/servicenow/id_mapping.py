@@ -0,0 +1,261 @@
+"""Compact source_id → sys_id mapping for large multi-phase loads.
+
+A plain ``dict[str, str]`` costs roughly 150 bytes per entry (32-char hex
+sys_id string plus key and dict slot). For million-endpoint loads this module
+stores sys_ids as packed 16-byte values with interned source keys, and can
+spill the whole mapping to a SQLite file to keep memory bounded.
+"""
+
+import sqlite3
+import sys
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+from pathlib import Path
+
+_SYS_ID_BYTES = 16
+
+
+def _pack_sys_id(sys_id: str) -> bytes | None:
+    """Pack a 32-char lowercase hex sys_id into 16 bytes (None if not packable)."""
+    if len(sys_id) != _SYS_ID_BYTES * 2:
+        return None
+    try:
+        packed = bytes.fromhex(sys_id)
+    except ValueError:
+        return None
+    # Only pack if unpacking round-trips exactly (lowercase hex)
+    return packed if packed.hex() == sys_id else None
+
+
+class CompactIdMap(MutableMapping[str, str]):
+    """In-memory source_id → sys_id map with packed 16-byte sys_ids.
+
+    Keys map to a slot in one contiguous bytearray. sys_ids that are not
+    32-char lowercase hex (e.g., in tests) are kept as-is in an overflow dict.
+    """
+
+    __slots__ = ("_index", "_sys_ids", "_overflow")
+
+    def __init__(self, items: Mapping[str, str] | None = None):
+        self._index: dict[str, int] = {}
+        self._sys_ids = bytearray()
+        self._overflow: dict[str, str] = {}
+        if items:
+            self.update(items)
+
+    def __getitem__(self, source_id: str) -> str:
+        slot = self._index.get(source_id)
+        if slot is not None:
+            offset = slot * _SYS_ID_BYTES
+            return self._sys_ids[offset : offset + _SYS_ID_BYTES].hex()
+        return self._overflow[source_id]
+
+    def __setitem__(self, source_id: str, sys_id: str) -> None:
+        source_id = sys.intern(source_id)
+        packed = _pack_sys_id(sys_id)
+        if packed is None:
+            # Slot (if any) is abandoned; overflow is the rare case
+            self._index.pop(source_id, None)
+            self._overflow[source_id] = sys_id
+            return
+
+        self._overflow.pop(source_id, None)
+        slot = self._index.get(source_id)
+        if slot is None:
+            self._index[source_id] = len(self._sys_ids) // _SYS_ID_BYTES
+            self._sys_ids += packed
+        else:
+            offset = slot * _SYS_ID_BYTES
+            self._sys_ids[offset : offset + _SYS_ID_BYTES] = packed
+
+    def __delitem__(self, source_id: str) -> None:
+        if source_id in self._index:
+            del self._index[source_id]
+        else:
+            del self._overflow[source_id]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._index
+        yield from self._overflow
+
+    def __len__(self) -> int:
+        return len(self._index) + len(self._overflow)
+
+    def __contains__(self, source_id: object) -> bool:
+        return source_id in self._index or source_id in self._overflow
+
+
+class SQLiteIdMap(MutableMapping[str, str]):
+    """SQLite-backed source_id → sys_id map for one loader class.
+
+    Lookups use the (target, source_id) primary key, so they stay effectively
+    constant time while memory is bounded by SQLite's page cache.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, target: str):
+        self._connection = connection
+        self._target = target
+
+    def __getitem__(self, source_id: str) -> str:
+        row = self._connection.execute(
+            "SELECT sys_id FROM id_mapping WHERE target = ? AND source_id = ?",
+            (self._target, source_id),
+        ).fetchone()
+        if row is None:
+            raise KeyError(source_id)
+        value = row[0]
+        return value.hex() if isinstance(value, bytes) else value
+
+    def __setitem__(self, source_id: str, sys_id: str) -> None:
+        packed = _pack_sys_id(sys_id)
+        self._connection.execute(
+            "INSERT OR REPLACE INTO id_mapping (target, source_id, sys_id) "
+            "VALUES (?, ?, ?)",
+            (self._target, source_id, packed if packed is not None else sys_id),
+        )
+
+    def __delitem__(self, source_id: str) -> None:
+        cursor = self._connection.execute(
+            "DELETE FROM id_mapping WHERE target = ? AND source_id = ?",
+            (self._target, source_id),
+        )
+        if cursor.rowcount == 0:
+            raise KeyError(source_id)
+
+    def __iter__(self) -> Iterator[str]:
+        cursor = self._connection.execute(
+            "SELECT source_id FROM id_mapping WHERE target = ?", (self._target,)
+        )
+        for (source_id,) in cursor:
+            yield source_id
+
+    def __len__(self) -> int:
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM id_mapping WHERE target = ?", (self._target,)
+        ).fetchone()[0]
+
+    def __contains__(self, source_id: object) -> bool:
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM id_mapping WHERE target = ? AND source_id = ?",
+                (self._target, source_id),
+            ).fetchone()
+            is not None
+        )
+
+
+class _TableIdMap(MutableMapping[str, str]):
+    """Per-class view that survives the store spilling from memory to SQLite."""
+
+    def __init__(self, store: "IdMappingStore", target: str):
+        self._store = store
+        self._target = target
+        self.backend: MutableMapping[str, str] = CompactIdMap()
+
+    def __getitem__(self, source_id: str) -> str:
+        return self.backend[source_id]
+
+    def __setitem__(self, source_id: str, sys_id: str) -> None:
+        self.backend[source_id] = sys_id
+        self._store._after_insert()
+
+    def __delitem__(self, source_id: str) -> None:
+        del self.backend[source_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.backend)
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def __contains__(self, source_id: object) -> bool:
+        return source_id in self.backend
+
+
+class IdMappingStore(Mapping[str, MutableMapping[str, str]]):
+    """Mapping of loader class → {source_id: sys_id} with bounded memory.
+
+    Drop-in replacement for the ``id_mapping`` dict of dicts used by
+    load_entities_with_relationships. Entries live in CompactIdMap until
+    ``max_memory_entries`` is exceeded, then the whole store spills to a SQLite
+    file at ``spill_path`` (spilling is disabled without a path).
+    """
+
+    def __init__(
+        self,
+        tables: Iterable[str] = (),
+        spill_path: str | Path | None = None,
+        max_memory_entries: int = 500_000,
+    ):
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.max_memory_entries = max_memory_entries
+        self._connection: sqlite3.Connection | None = None
+        self._size = 0
+        self._tables: dict[str, _TableIdMap] = {}
+        for table in tables:
+            self.table(table)
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the store has spilled to SQLite."""
+        return self._connection is not None
+
+    def table(self, target: str) -> MutableMapping[str, str]:
+        """Get (creating if needed) the map for a loader class."""
+        if target not in self._tables:
+            table_map = _TableIdMap(self, target)
+            if self._connection is not None:
+                table_map.backend = SQLiteIdMap(self._connection, target)
+            self._tables[target] = table_map
+        return self._tables[target]
+
+    def _after_insert(self) -> None:
+        """Spill to SQLite once the in-memory entry limit is exceeded."""
+        if self._connection is not None or self.spill_path is None:
+            return
+        self._size += 1
+        if self._size > self.max_memory_entries:
+            self._size = sum(len(table_map) for table_map in self._tables.values())
+            if self._size > self.max_memory_entries:
+                self.spill()
+
+    def spill(self) -> None:
+        """Move all entries to the SQLite spill file."""
+        if self._connection is not None:
+            return
+        if self.spill_path is None:
+            raise ValueError("spill_path is required to spill the id mapping")
+
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.spill_path))
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("PRAGMA cache_size = -16384")  # ~16 MB page cache
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS id_mapping ("
+            "target TEXT NOT NULL, source_id TEXT NOT NULL, sys_id BLOB NOT NULL, "
+            "PRIMARY KEY (target, source_id)) WITHOUT ROWID"
+        )
+        for target, table_map in self._tables.items():
+            sqlite_map = SQLiteIdMap(connection, target)
+            for source_id, sys_id in table_map.backend.items():
+                sqlite_map[source_id] = sys_id
+            table_map.backend = sqlite_map
+        self._connection = connection
+
+    def close(self) -> None:
+        """Close the spill file connection (if spilled)."""
+        if self._connection is not None:
+            self._connection.close()
+
+    def __getitem__(self, target: str) -> MutableMapping[str, str]:
+        return self._tables[target]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tables)
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def to_dict(self) -> dict[str, dict[str, str]]:
+        """Materialize as a plain dict of dicts (small loads / reporting)."""
+        return {target: dict(table_map) for target, table_map in self._tables.items()}
@@ -1,5 +1,17 @@
 """Data loading functions for ServiceNow CMDB."""
 
+from collections.abc import Mapping, MutableMapping
+from dataclasses import dataclass
+
+from pydantic import BaseModel
+
+from beast_dream_snow_loader.models.compact import (
+    CompactEndpoint,
+    CompactGatewayCI,
+    CompactLocation,
+    CompactNetworkDeviceCI,
+    CompactRecord,
+)
 from beast_dream_snow_loader.models.servicenow import (
     ServiceNowEndpoint,
     ServiceNowGatewayCI,
@@ -7,6 +19,14 @@ from beast_dream_snow_loader.models.servicenow import (
     ServiceNowNetworkDeviceCI,
 )
 from beast_dream_snow_loader.servicenow.api_client import ServiceNowAPIClient
+from beast_dream_snow_loader.servicenow.id_mapping import IdMappingStore
+from beast_dream_snow_loader.servicenow.relationship_types import (
+    LOADER_RELATIONSHIP_TYPES,
+    REL_TYPE_CONNECTS_TO,
+    REL_TYPE_LOCATED_IN,
+    REL_TYPE_MANAGED_BY,
+    RelationshipTypeResolver,
+)
 
 # Table name mappings (ServiceNow standard tables)
 # Per ADR-0001: docs/adr/0001-servicenow-ci-class-selection.md
@@ -20,7 +40,42 @@ TABLE_ENDPOINT = (
 )
 
 
-def load_gateway_ci(client: ServiceNowAPIClient, gateway: ServiceNowGatewayCI) -> dict:
+@dataclass(frozen=True)
+class LoadTarget:
+    """Where records of one loader class live in ServiceNow."""
+
+    table: str
+    sys_class_name: str
+
+
+# Routing table, keyed like id_mapping (see load_entities_with_relationships).
+# Per ADR-0001, locations/devices/endpoints live in cmdb_ci with sys_class_name.
+LOAD_TARGETS: dict[str, LoadTarget] = {
+    TABLE_GATEWAY_CI: LoadTarget(TABLE_GATEWAY_CI, TABLE_GATEWAY_CI),
+    TABLE_LOCATION: LoadTarget(TABLE_ENDPOINT, TABLE_LOCATION),
+    TABLE_NETWORK_DEVICE_CI: LoadTarget(TABLE_ENDPOINT, TABLE_NETWORK_DEVICE_CI),
+    TABLE_ENDPOINT: LoadTarget(TABLE_ENDPOINT, TABLE_ENDPOINT),
+}
+
+# Load order (dependency order, as in load_entities_with_relationships)
+TARGET_ORDER = (
+    TABLE_GATEWAY_CI,
+    TABLE_LOCATION,
+    TABLE_NETWORK_DEVICE_CI,
+    TABLE_ENDPOINT,
+)
+
+
+def outbound_payload(record: BaseModel | CompactRecord) -> dict:
+    """Get the outbound payload of a model or compact record (None fields excluded)."""
+    if isinstance(record, CompactRecord):
+        return record.to_payload()
+    return record.model_dump(exclude_none=True)
+
+
+def load_gateway_ci(
+    client: ServiceNowAPIClient, gateway: ServiceNowGatewayCI | CompactGatewayCI
+) -> dict:
     """Load a gateway CI record into ServiceNow.
 
     Note: sys_id is excluded from create (ServiceNow auto-generates).
@@ -29,12 +84,12 @@ def load_gateway_ci(client: ServiceNowAPIClient, gateway: ServiceNowGatewayCI) -
 
     Args:
         client: ServiceNow API client
-        gateway: Gateway CI model instance
+        gateway: Gateway CI model instance or compact record
 
     Returns:
         Created record data from ServiceNow (includes auto-generated sys_id)
     """
-    data = gateway.model_dump(exclude_none=True)
+    data = outbound_payload(gateway)
     # Remove sys_id if present (ServiceNow auto-generates)
     data.pop("sys_id", None)
 
@@ -48,7 +103,9 @@ def load_gateway_ci(client: ServiceNowAPIClient, gateway: ServiceNowGatewayCI) -
         raise
 
 
-def load_location(client: ServiceNowAPIClient, location: ServiceNowLocation) -> dict:
+def load_location(
+    client: ServiceNowAPIClient, location: ServiceNowLocation | CompactLocation
+) -> dict:
     """Load a location record into ServiceNow.
 
     Per ADR-0001: Uses cmdb_ci_site class via cmdb_ci table with sys_class_name.
@@ -56,12 +113,12 @@ def load_location(client: ServiceNowAPIClient, location: ServiceNowLocation) ->
 
     Args:
         client: ServiceNow API client
-        location: Location model instance
+        location: Location model instance or compact record
 
     Returns:
         Created record data from ServiceNow (includes auto-generated sys_id)
     """
-    data = location.model_dump(exclude_none=True)
+    data = outbound_payload(location)
     # Remove sys_id if present (ServiceNow auto-generates)
     data.pop("sys_id", None)
     # cmdb_ci_site is a class, not a table - use base cmdb_ci with sys_class_name
@@ -71,7 +128,8 @@ def load_location(client: ServiceNowAPIClient, location: ServiceNowLocation) ->
 
 
 def load_network_device_ci(
-    client: ServiceNowAPIClient, device: ServiceNowNetworkDeviceCI
+    client: ServiceNowAPIClient,
+    device: ServiceNowNetworkDeviceCI | CompactNetworkDeviceCI,
 ) -> dict:
     """Load a network device CI record into ServiceNow.
 
@@ -80,12 +138,12 @@ def load_network_device_ci(
 
     Args:
         client: ServiceNow API client
-        device: Network device CI model instance
+        device: Network device CI model instance or compact record
 
     Returns:
         Created record data from ServiceNow (includes auto-generated sys_id)
     """
-    data = device.model_dump(exclude_none=True)
+    data = outbound_payload(device)
     # Remove sys_id if present (ServiceNow auto-generates)
     data.pop("sys_id", None)
     # cmdb_ci_network_node is a class, not a table - use base cmdb_ci with sys_class_name
@@ -94,7 +152,9 @@ def load_network_device_ci(
     return client.create_record(TABLE_ENDPOINT, data)
 
 
-def load_endpoint(client: ServiceNowAPIClient, endpoint: ServiceNowEndpoint) -> dict:
+def load_endpoint(
+    client: ServiceNowAPIClient, endpoint: ServiceNowEndpoint | CompactEndpoint
+) -> dict:
     """Load an endpoint record into ServiceNow.
 
     Note: sys_id is excluded from create (ServiceNow auto-generates).
@@ -102,12 +162,12 @@ def load_endpoint(client: ServiceNowAPIClient, endpoint: ServiceNowEndpoint) ->
 
     Args:
         client: ServiceNow API client
-        endpoint: Endpoint model instance
+        endpoint: Endpoint model instance or compact record
 
     Returns:
         Created record data from ServiceNow (includes auto-generated sys_id)
     """
-    data = endpoint.model_dump(exclude_none=True)
+    data = outbound_payload(endpoint)
     # Remove sys_id if present (ServiceNow auto-generates)
     data.pop("sys_id", None)
     return client.create_record(TABLE_ENDPOINT, data)
@@ -115,13 +175,15 @@ def load_endpoint(client: ServiceNowAPIClient, endpoint: ServiceNowEndpoint) ->
 
 def load_entities_with_relationships(
     client: ServiceNowAPIClient,
-    gateways: list[ServiceNowGatewayCI] | None = None,
-    locations: list[ServiceNowLocation] | None = None,
-    devices: list[ServiceNowNetworkDeviceCI] | None = None,
-    endpoints: list[ServiceNowEndpoint] | None = None,
+    gateways: list[ServiceNowGatewayCI | CompactGatewayCI] | None = None,
+    locations: list[ServiceNowLocation | CompactLocation] | None = None,
+    devices: list[ServiceNowNetworkDeviceCI | CompactNetworkDeviceCI] | None = None,
+    endpoints: list[ServiceNowEndpoint | CompactEndpoint] | None = None,
     changeset_id: str | None = None,
     create_changeset: bool = False,
-) -> dict[str, dict[str, str]]:
+    relationship_types: RelationshipTypeResolver | None = None,
+    id_mapping_store: IdMappingStore | None = None,
+) -> Mapping[str, MutableMapping[str, str]]:
     """Load entities with relationships using multi-phase batch processing.
 
     Phase 1: Batch create all CI records, capture returned sys_ids.
@@ -141,8 +203,13 @@ def load_entities_with_relationships(
         locations: List of location models to load (may reference gateways)
         devices: List of network device CI models to load (may reference gateways/locations)
         endpoints: List of endpoint models to load (may reference locations/devices)
+            (all four lists also accept compact records from models.compact)
         changeset_id: Optional changeset ID if already in a changeset context
         create_changeset: If True and not in changeset, create one before loading
+        relationship_types: Optional resolver for cmdb_rel_type sys_ids (default:
+            resolver with an in-memory cache for this run only)
+        id_mapping_store: Optional compact/spilling store for the id mapping
+            (recommended for million-record loads; default is a dict of dicts)
 
     Returns:
         Mapping of table names to dict of {source_id: sys_id} for all created records.
@@ -196,12 +263,17 @@ def load_entities_with_relationships(
 
     # Initialize id_mapping: {table_name: {source_id: sys_id}}
     # Note: Both gateways and devices use cmdb_ci_netgear table, but we track them separately
-    id_mapping: dict[str, dict[str, str]] = {
+    id_mapping: Mapping[str, MutableMapping[str, str]] = {
         TABLE_GATEWAY_CI: {},  # Gateways in cmdb_ci_netgear
         TABLE_LOCATION: {},  # Locations in cmn_location
         TABLE_NETWORK_DEVICE_CI: {},  # Devices also in cmdb_ci_netgear (same table as gateways)
         TABLE_ENDPOINT: {},  # Endpoints in cmdb_ci
     }
+    if id_mapping_store is not None:
+        # Compact store (packed sys_ids, optional SQLite spill) for large loads
+        for table in id_mapping:
+            id_mapping_store.table(table)
+        id_mapping = id_mapping_store
 
     # Phase 1: Create all records in dependency order
     # 1. Gateways (no dependencies)
@@ -240,6 +312,26 @@ def load_entities_with_relationships(
             if sys_id:
                 id_mapping[TABLE_ENDPOINT][source_id] = sys_id
 
+    # Phase 2: Resolve relationship types to cmdb_rel_type sys_ids once per run
+    # (one bulk query). The default resolver caches in memory only; pass one
+    # with cache_path/use_disk_cache to reuse ids across runs from disk.
+    # Falls back to display names if unresolved.
+    rel_type_ids: dict[str, str] = {}
+    if locations or devices or endpoints:
+        resolver = relationship_types or RelationshipTypeResolver(client)
+        try:
+            rel_type_ids = resolver.resolve(LOADER_RELATIONSHIP_TYPES)
+        except Exception as e:
+            print(f"⚠️  Phase 2: Failed to resolve relationship types: {e}")
+        for rel_type in LOADER_RELATIONSHIP_TYPES:
+            if rel_type not in rel_type_ids:
+                print(
+                    f"⚠️  Phase 2: Relationship type '{rel_type}' not resolved, using display name"
+                )
+    rel_type_managed_by = rel_type_ids.get(REL_TYPE_MANAGED_BY, REL_TYPE_MANAGED_BY)
+    rel_type_located_in = rel_type_ids.get(REL_TYPE_LOCATED_IN, REL_TYPE_LOCATED_IN)
+    rel_type_connects_to = rel_type_ids.get(REL_TYPE_CONNECTS_TO, REL_TYPE_CONNECTS_TO)
+
     # Phase 2: Create relationships using cmdb_rel_ci table
     # Location → Gateway relationship (Location is Managed by Gateway)
     if locations:
@@ -253,17 +345,14 @@ def load_entities_with_relationships(
 
             # Create relationship: Location is Managed by Gateway
             if location.host_id:
-                gateway_sys_id = None
-                for source_id, sys_id in id_mapping[TABLE_GATEWAY_CI].items():
-                    if source_id == location.host_id:
-                        gateway_sys_id = sys_id  # sys_id IS the ID in ServiceNow
-                        break
+                # sys_id IS the ID in ServiceNow
+                gateway_sys_id = id_mapping[TABLE_GATEWAY_CI].get(location.host_id)
                 if gateway_sys_id:
                     # Create relationship: parent (Gateway) → child (Location)
                     rel_data = {
                         "parent": gateway_sys_id,
                         "child": location_sys_id,
-                        "type": "Managed by::Manages",
+                        "type": rel_type_managed_by,
                     }
                     try:
                         client.create_record("cmdb_rel_ci", rel_data)
@@ -297,16 +386,13 @@ def load_entities_with_relationships(
 
             # Create relationship: Device is Managed by Gateway
             if device.host_id:
-                gateway_sys_id = None
-                for source_id, sys_id in id_mapping[TABLE_GATEWAY_CI].items():
-                    if source_id == device.host_id:
-                        gateway_sys_id = sys_id  # sys_id IS the ID in ServiceNow
-                        break
+                # sys_id IS the ID in ServiceNow
+                gateway_sys_id = id_mapping[TABLE_GATEWAY_CI].get(device.host_id)
                 if gateway_sys_id:
                     rel_data = {
                         "parent": gateway_sys_id,
                         "child": device_sys_id,
-                        "type": "Managed by::Manages",
+                        "type": rel_type_managed_by,
                     }
                     try:
                         client.create_record("cmdb_rel_ci", rel_data)
@@ -320,16 +406,13 @@ def load_entities_with_relationships(
 
             # Create relationship: Device is Located at Site
             if device.site_id:
-                location_sys_id = None
-                for source_id, sys_id in id_mapping[TABLE_LOCATION].items():
-                    if source_id == device.site_id:
-                        location_sys_id = sys_id  # sys_id IS the ID in ServiceNow
-                        break
+                # sys_id IS the ID in ServiceNow
+                location_sys_id = id_mapping[TABLE_LOCATION].get(device.site_id)
                 if location_sys_id:
                     rel_data = {
                         "parent": location_sys_id,
                         "child": device_sys_id,
-                        "type": "Located in::Contains",
+                        "type": rel_type_located_in,
                     }
                     try:
                         client.create_record("cmdb_rel_ci", rel_data)
@@ -353,16 +436,13 @@ def load_entities_with_relationships(
 
             # Create relationship: Endpoint is Located at Site
             if endpoint.site_id:
-                location_sys_id = None
-                for source_id, sys_id in id_mapping[TABLE_LOCATION].items():
-                    if source_id == endpoint.site_id:
-                        location_sys_id = sys_id  # sys_id IS the ID in ServiceNow
-                        break
+                # sys_id IS the ID in ServiceNow
+                location_sys_id = id_mapping[TABLE_LOCATION].get(endpoint.site_id)
                 if location_sys_id:
                     rel_data = {
                         "parent": location_sys_id,
                         "child": endpoint_sys_id,
-                        "type": "Located in::Contains",
+                        "type": rel_type_located_in,
                     }
                     try:
                         client.create_record("cmdb_rel_ci", rel_data)
@@ -376,16 +456,15 @@ def load_entities_with_relationships(
 
             # Create relationship: Endpoint Connects through Device
             if endpoint.device_id:
-                device_sys_id = None
-                for source_id, sys_id in id_mapping[TABLE_NETWORK_DEVICE_CI].items():
-                    if source_id == endpoint.device_id:
-                        device_sys_id = sys_id  # sys_id IS the ID in ServiceNow
-                        break
+                # sys_id IS the ID in ServiceNow
+                device_sys_id = id_mapping[TABLE_NETWORK_DEVICE_CI].get(
+                    endpoint.device_id
+                )
                 if device_sys_id:
                     rel_data = {
                         "parent": device_sys_id,
                         "child": endpoint_sys_id,
-                        "type": "Connects to::Connected by",
+                        "type": rel_type_connects_to,
                     }
                     try:
                         client.create_record("cmdb_rel_ci", rel_data)
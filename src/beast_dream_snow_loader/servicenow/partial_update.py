@@ -0,0 +1,245 @@
+"""PATCH-based partial updates against the last known record state.
+
+``update_record`` PUTs the full payload, so changing one IP address re-sends
+the whole CI, raw data included. ``PartialUpdater`` diffs each outbound
+record against a ``RecordMirror`` of the last known state and PATCHes only the
+changed fields, skipping the request entirely when nothing changed.
+
+The mirror stores one normalized string per field: values as ServiceNow
+returns them, with raw data reduced to its SHA-256 digest (the value of
+``u_unifi_raw_digest``, see raw_data_policy). Fill it from this process's own
+writes, from a file saved by a previous run, or by prefetching a projection
+of the live records.
+"""
+
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from beast_dream_snow_loader.models.compact import CompactRecord
+from beast_dream_snow_loader.models.raw import RawJSON
+from beast_dream_snow_loader.servicenow.api_client import ServiceNowAPIClient
+from beast_dream_snow_loader.servicenow.loader import LOAD_TARGETS, outbound_payload
+from beast_dream_snow_loader.servicenow.raw_data_policy import (
+    RAW_DATA_FIELD,
+    RAW_DIGEST_FIELD,
+    raw_data_bytes,
+    raw_data_digest,
+)
+from beast_dream_snow_loader.servicenow.snapshot_diff import diff_payloads
+
+SOURCE_ID_FIELD = "u_unifi_source_id"
+
+
+def normalize_value(value: Any) -> str:
+    """Normalize an outbound value to how it compares in ServiceNow.
+
+    ServiceNow returns every field as a string; raw data (RawJSON, dicts,
+    lists) is reduced to its content digest.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, RawJSON | dict | list):
+        return raw_data_digest(raw_data_bytes(value))  # type: ignore[arg-type]
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def normalize_payload(payload: dict[str, Any]) -> dict[str, str]:
+    """Normalize every non-empty field of an outbound payload."""
+    return {
+        name: normalize_value(value)
+        for name, value in payload.items()
+        if value is not None and name != "sys_id"
+    }
+
+
+@dataclass
+class MirroredRecord:
+    """Last known state of one record."""
+
+    sys_id: str
+    fields: dict[str, str]  # Field → normalized value
+
+
+class RecordMirror:
+    """Local mirror of the last known state of loaded records."""
+
+    def __init__(self):
+        """Initialize an empty mirror."""
+        # Loader class → source_id → state
+        self.records: dict[str, dict[str, MirroredRecord]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self.records.values())
+
+    def get(self, target: str, source_id: str) -> MirroredRecord | None:
+        """Get the last known state of a record."""
+        return self.records.get(target, {}).get(source_id)
+
+    def put(
+        self, target: str, source_id: str, sys_id: str, fields: dict[str, str]
+    ) -> None:
+        """Record the state of a record (normalized fields)."""
+        self.records.setdefault(target, {})[source_id] = MirroredRecord(sys_id, fields)
+
+    def discard(self, target: str, source_id: str) -> None:
+        """Forget a record (e.g. after it was retired)."""
+        self.records.get(target, {}).pop(source_id, None)
+
+    def prefetch(
+        self,
+        client: ServiceNowAPIClient,
+        target: str,
+        fields: Iterable[str],
+        page_size: int = 1000,
+    ) -> int:
+        """Fill the mirror from a projection of the live records.
+
+        Raw data is not read back; ``u_unifi_raw_digest`` (when the raw data
+        policy stores it) stands in for it.
+
+        Args:
+            client: ServiceNow API client
+            target: Loader class key (e.g. TABLE_ENDPOINT)
+            fields: Outbound fields to project (e.g. the model's field names)
+            page_size: Records per page
+
+        Returns:
+            Number of records mirrored
+        """
+        route = LOAD_TARGETS[target]
+        fields = [f for f in fields if f not in ("sys_id", SOURCE_ID_FIELD)]
+        projected = [f for f in fields if f != RAW_DATA_FIELD]
+        if RAW_DATA_FIELD in fields:
+            projected.append(RAW_DIGEST_FIELD)
+
+        count = 0
+        for record in client.iter_records(
+            route.table,
+            query=f"u_unifi_source_idISNOTEMPTY^sys_class_name={route.sys_class_name}",
+            fields=["sys_id", SOURCE_ID_FIELD, *projected],
+            page_size=page_size,
+        ):
+            state = {
+                name: record[name]
+                for name in projected
+                if name != RAW_DIGEST_FIELD and record.get(name) not in (None, "")
+            }
+            if record.get(RAW_DIGEST_FIELD):
+                state[RAW_DATA_FIELD] = record[RAW_DIGEST_FIELD]
+            state[SOURCE_ID_FIELD] = record[SOURCE_ID_FIELD]
+            self.put(target, record[SOURCE_ID_FIELD], record["sys_id"], state)
+            count += 1
+        return count
+
+    def save(self, path: str | Path) -> None:
+        """Save the mirror as JSON."""
+        data = {
+            target: {
+                source_id: [state.sys_id, state.fields]
+                for source_id, state in records.items()
+            }
+            for target, records in self.records.items()
+        }
+        Path(path).write_text(json.dumps(data, separators=(",", ":")))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "RecordMirror":
+        """Load a mirror saved with save() (empty if the file is missing)."""
+        mirror = cls()
+        path = Path(path)
+        if not path.exists():
+            return mirror
+        for target, records in json.loads(path.read_text()).items():
+            for source_id, (sys_id, fields) in records.items():
+                mirror.put(target, source_id, sys_id, fields)
+        return mirror
+
+
+@dataclass
+class PartialUpdateStats:
+    """Writes made and avoided by a partial updater."""
+
+    patched: int = 0  # PATCHes with changed fields only
+    full: int = 0  # PATCHes with the full payload (no known state)
+    skipped: int = 0  # Unchanged records, no request sent
+    fields_sent: int = 0
+    fields_total: int = 0  # Fields a full update would have sent
+
+    @property
+    def fields_saved_percent(self) -> float:
+        """Calculate share of fields not sent, as a percentage."""
+        return (1 - self.fields_sent / max(1, self.fields_total)) * 100
+
+
+class PartialUpdater:
+    """Updates existing records with only their changed fields."""
+
+    def __init__(self, client: ServiceNowAPIClient, mirror: RecordMirror | None = None):
+        """Initialize updater.
+
+        Args:
+            client: ServiceNow API client
+            mirror: Last known record state (default: empty, filled as
+                records are written)
+        """
+        self.client = client
+        self.mirror = mirror if mirror is not None else RecordMirror()
+        self.stats = PartialUpdateStats()
+
+    def update(
+        self,
+        target: str,
+        record: BaseModel | CompactRecord | dict[str, Any],
+        sys_id: str | None = None,
+    ) -> dict[str, Any] | None:
+        """Update a record, sending only the fields that changed.
+
+        Args:
+            target: Loader class key (e.g. TABLE_ENDPOINT)
+            record: New outbound model, compact record or payload
+            sys_id: Record sys_id (default: from the mirror)
+
+        Returns:
+            Updated record data from ServiceNow, or None if nothing changed
+
+        Raises:
+            ValueError: If the sys_id is neither given nor mirrored
+            requests.HTTPError: If the API request fails
+        """
+        payload = dict(record) if isinstance(record, dict) else outbound_payload(record)
+        payload.pop("sys_id", None)
+        source_id = payload[SOURCE_ID_FIELD]
+        known = self.mirror.get(target, source_id)
+        sys_id = sys_id or (known.sys_id if known is not None else None)
+        if not sys_id:
+            raise ValueError(f"No sys_id known for {target} record '{source_id}'")
+
+        state = normalize_payload(payload)
+        self.stats.fields_total += len(payload)
+        if known is None:
+            body = payload
+            self.stats.full += 1
+        else:
+            changes = diff_payloads(known.fields, state)
+            if not changes:
+                self.stats.skipped += 1
+                return None
+            # An empty string clears a field in ServiceNow
+            body = {c.field: payload.get(c.field, "") for c in changes}
+            if RAW_DATA_FIELD in body:
+                # Lets the raw data policy track the new digest per record
+                body[SOURCE_ID_FIELD] = source_id
+            self.stats.patched += 1
+
+        table = LOAD_TARGETS[target].table
+        result = self.client.patch_record(table, sys_id, body)
+        self.stats.fields_sent += len(body)
+        self.mirror.put(target, source_id, sys_id, state)
+        return result
@@ -0,0 +1,500 @@
+"""Dry-run load planning: operations, request counts and duration estimates."""
+
+import json
+import math
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any
+
+from beast_dream_snow_loader.models.servicenow import (
+    ServiceNowEndpoint,
+    ServiceNowGatewayCI,
+    ServiceNowLocation,
+    ServiceNowNetworkDeviceCI,
+)
+from beast_dream_snow_loader.models.unifi import (
+    UniFiClient,
+    UniFiDevice,
+    UniFiHost,
+    UniFiSite,
+)
+from beast_dream_snow_loader.operations.metrics import MetricsCollector
+from beast_dream_snow_loader.servicenow.api_client import ServiceNowAPIClient
+from beast_dream_snow_loader.servicenow.loader import (
+    LOAD_TARGETS,
+    TABLE_ENDPOINT,
+    TABLE_GATEWAY_CI,
+    TABLE_LOCATION,
+    TABLE_NETWORK_DEVICE_CI,
+    TARGET_ORDER,
+    load_endpoint,
+    load_gateway_ci,
+    load_location,
+    load_network_device_ci,
+)
+from beast_dream_snow_loader.servicenow.relationship_types import (
+    LOADER_RELATIONSHIP_TYPES,
+    REL_TYPE_CONNECTS_TO,
+    REL_TYPE_LOCATED_IN,
+    REL_TYPE_MANAGED_BY,
+    RelationshipTypeResolver,
+)
+from beast_dream_snow_loader.transformers.unifi_to_snow import (
+    transform_client,
+    transform_device,
+    transform_host,
+    transform_site,
+)
+
+PLAN_FORMAT_VERSION = 1
+
+ACTION_CREATE = "create"
+ACTION_UPDATE = "update"
+
+# Relationships the loader creates: (child class, attribute, parent class, type)
+RELATIONSHIP_LINKS = (
+    (TABLE_LOCATION, "host_id", TABLE_GATEWAY_CI, REL_TYPE_MANAGED_BY),
+    (TABLE_NETWORK_DEVICE_CI, "host_id", TABLE_GATEWAY_CI, REL_TYPE_MANAGED_BY),
+    (TABLE_NETWORK_DEVICE_CI, "site_id", TABLE_LOCATION, REL_TYPE_LOCATED_IN),
+    (TABLE_ENDPOINT, "site_id", TABLE_LOCATION, REL_TYPE_LOCATED_IN),
+    (TABLE_ENDPOINT, "device_id", TABLE_NETWORK_DEVICE_CI, REL_TYPE_CONNECTS_TO),
+)
+
+_MODELS: dict[str, type] = {
+    TABLE_GATEWAY_CI: ServiceNowGatewayCI,
+    TABLE_LOCATION: ServiceNowLocation,
+    TABLE_NETWORK_DEVICE_CI: ServiceNowNetworkDeviceCI,
+    TABLE_ENDPOINT: ServiceNowEndpoint,
+}
+
+_LOADERS = {
+    TABLE_GATEWAY_CI: load_gateway_ci,
+    TABLE_LOCATION: load_location,
+    TABLE_NETWORK_DEVICE_CI: load_network_device_ci,
+    TABLE_ENDPOINT: load_endpoint,
+}
+
+# Fallback latencies when no metrics history exists (rough PDI observations)
+DEFAULT_LATENCY_MS: dict[str, float] = {
+    "create_record": 250.0,
+    "update_record": 250.0,
+    "batch_item": 60.0,  # Per sub-request inside a Batch API call
+    "batch_overhead": 200.0,  # Per Batch API call
+    "import_set_item": 20.0,  # Per row in an import set insertMultiple call
+    "import_set_overhead": 500.0,  # Per import set call (incl. transform)
+}
+
+BACKEND_TABLE_API = "table_api"
+BACKEND_BATCH_API = "batch_api"
+BACKEND_IMPORT_SET = "import_set"
+
+
+@dataclass
+class PlannedOperation:
+    """One record write the loader would perform."""
+
+    target: str  # Loader class key (id_mapping key)
+    action: str  # "create" or "update"
+    table: str  # Table the request goes to
+    source_id: str
+    payload: dict[str, Any]
+    sys_class_name: str | None = None
+    sys_id: str | None = None  # Existing record (updates only)
+
+
+@dataclass
+class PlannedRelationship:
+    """One cmdb_rel_ci row the loader would create."""
+
+    parent_target: str
+    parent_source_id: str
+    child_target: str
+    child_source_id: str
+    type_name: str
+    type_sys_id: str | None = None
+    parent_sys_id: str | None = None  # Parent that already exists in ServiceNow
+
+
+@dataclass
+class BackendEstimate:
+    """Request count and duration estimate for one backend."""
+
+    backend: str
+    requests: int
+    estimated_seconds: float
+
+
+@dataclass
+class LoadPlan:
+    """Serializable dry-run plan for a load."""
+
+    operations: list[PlannedOperation] = field(default_factory=list)
+    relationships: list[PlannedRelationship] = field(default_factory=list)
+    estimates: dict[str, BackendEstimate] = field(default_factory=dict)
+    read_requests: int = 0  # Reads performed while planning (delta detection)
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+    version: int = PLAN_FORMAT_VERSION
+
+    def summary(self) -> dict[str, Any]:
+        """Summarize operations per table and type, and relationships per type."""
+        operations: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for operation in self.operations:
+            route = operation.sys_class_name or operation.table
+            operations[route][operation.action] += 1
+
+        relationships: dict[str, int] = defaultdict(int)
+        for relationship in self.relationships:
+            relationships[relationship.type_name] += 1
+
+        return {
+            "operations": {table: dict(ops) for table, ops in operations.items()},
+            "relationships": dict(relationships),
+            "estimates": {
+                name: {
+                    "requests": estimate.requests,
+                    "estimated_seconds": round(estimate.estimated_seconds, 1),
+                }
+                for name, estimate in self.estimates.items()
+            },
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert plan to a JSON-compatible dictionary."""
+        return asdict(self)
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Serialize plan to JSON."""
+        return json.dumps(self.to_dict(), indent=indent, default=str)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LoadPlan":
+        """Rebuild a plan from to_dict() output."""
+        if data.get("version") != PLAN_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported plan version: {data.get('version')} "
+                f"(expected {PLAN_FORMAT_VERSION})"
+            )
+        return cls(
+            operations=[PlannedOperation(**op) for op in data["operations"]],
+            relationships=[PlannedRelationship(**rel) for rel in data["relationships"]],
+            estimates={
+                name: BackendEstimate(**estimate)
+                for name, estimate in data["estimates"].items()
+            },
+            read_requests=data.get("read_requests", 0),
+            created_at=data["created_at"],
+            version=data["version"],
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "LoadPlan":
+        """Deserialize plan from JSON."""
+        return cls.from_dict(json.loads(text))
+
+
+def _latency_ms(metrics: MetricsCollector | None, operation: str) -> float:
+    """Get average observed latency for an operation, or the default."""
+    if metrics is not None:
+        operation_metrics = metrics.get_operation_metrics(operation)
+        if operation_metrics is not None and operation_metrics.total_requests:
+            return operation_metrics.average_response_time_ms
+    return DEFAULT_LATENCY_MS[operation]
+
+
+def estimate_requests(
+    plan: LoadPlan,
+    metrics: MetricsCollector | None = None,
+    batch_size: int = 100,
+    import_set_batch_size: int = 1000,
+) -> dict[str, BackendEstimate]:
+    """Estimate request counts and duration per backend.
+
+    Phases must run in dependency order (records before relationships), so
+    batched backends are estimated per phase.
+
+    Args:
+        plan: Load plan
+        metrics: Recent latency metrics (defaults used for unseen operations)
+        batch_size: Sub-requests per Batch API call
+        import_set_batch_size: Rows per import set insertMultiple call
+
+    Returns:
+        Estimates keyed by backend name
+    """
+    phase_sizes: list[int] = [
+        sum(1 for op in plan.operations if op.target == target)
+        for target in TARGET_ORDER
+    ]
+    phase_sizes.append(len(plan.relationships))
+
+    creates = sum(1 for op in plan.operations if op.action == ACTION_CREATE)
+    updates = sum(1 for op in plan.operations if op.action == ACTION_UPDATE)
+    relationships = len(plan.relationships)
+    table_api_seconds = (
+        (creates + relationships) * _latency_ms(metrics, "create_record")
+        + updates * _latency_ms(metrics, "update_record")
+    ) / 1000
+
+    batch_calls = sum(math.ceil(size / batch_size) for size in phase_sizes)
+    if metrics is not None and metrics.get_operation_metrics("batch_requests"):
+        batch_seconds = batch_calls * _latency_ms(metrics, "batch_requests") / 1000
+    else:
+        batch_seconds = (
+            batch_calls * DEFAULT_LATENCY_MS["batch_overhead"]
+            + sum(phase_sizes) * DEFAULT_LATENCY_MS["batch_item"]
+        ) / 1000
+
+    import_calls = sum(math.ceil(size / import_set_batch_size) for size in phase_sizes)
+    import_seconds = (
+        import_calls * DEFAULT_LATENCY_MS["import_set_overhead"]
+        + sum(phase_sizes) * DEFAULT_LATENCY_MS["import_set_item"]
+    ) / 1000
+
+    return {
+        BACKEND_TABLE_API: BackendEstimate(
+            BACKEND_TABLE_API, creates + updates + relationships, table_api_seconds
+        ),
+        BACKEND_BATCH_API: BackendEstimate(
+            BACKEND_BATCH_API, batch_calls, batch_seconds
+        ),
+        BACKEND_IMPORT_SET: BackendEstimate(
+            BACKEND_IMPORT_SET, import_calls, import_seconds
+        ),
+    }
+
+
+def _existing_records(
+    client: ServiceNowAPIClient, target: str
+) -> tuple[dict[str, str], int]:
+    """Get existing {source_id: sys_id} for a loader class and pages read."""
+    route = LOAD_TARGETS[target]
+    existing: dict[str, str] = {}
+    page_size = 1000
+    for record in client.iter_records(
+        route.table,
+        query=f"u_unifi_source_idISNOTEMPTY^sys_class_name={route.sys_class_name}",
+        fields=["sys_id", "u_unifi_source_id"],
+        page_size=page_size,
+    ):
+        existing.setdefault(record["u_unifi_source_id"], record["sys_id"])
+    return existing, len(existing) // page_size + 1
+
+
+def plan_load(
+    client: ServiceNowAPIClient | None = None,
+    gateways: list[ServiceNowGatewayCI] | None = None,
+    locations: list[ServiceNowLocation] | None = None,
+    devices: list[ServiceNowNetworkDeviceCI] | None = None,
+    endpoints: list[ServiceNowEndpoint] | None = None,
+    metrics: MetricsCollector | None = None,
+    relationship_types: RelationshipTypeResolver | None = None,
+    detect_existing: bool = True,
+    batch_size: int = 100,
+    import_set_batch_size: int = 1000,
+) -> LoadPlan:
+    """Plan a load without writing anything to ServiceNow.
+
+    Runs routing, delta detection (existing records are updated, not created)
+    and relationship resolution, then estimates requests and duration per
+    backend. With a client, only reads are performed (existing source ids and
+    relationship type sys_ids); without one, every record is planned as a create.
+
+    Args:
+        client: Optional ServiceNow API client for read-only delta detection
+        gateways: Gateway CI models
+        locations: Location models
+        devices: Network device CI models
+        endpoints: Endpoint models
+        metrics: Recent latency metrics for duration estimates
+        relationship_types: Optional relationship type resolver
+        detect_existing: If False, skip delta detection even with a client
+        batch_size: Sub-requests per Batch API call (for estimates)
+        import_set_batch_size: Rows per import set call (for estimates)
+
+    Returns:
+        Serializable load plan
+
+    Note:
+        Relationships are planned for created records only; updated records
+        are assumed to keep their existing relationships.
+    """
+    records_by_target: dict[str, list[Any]] = {
+        TABLE_GATEWAY_CI: gateways or [],
+        TABLE_LOCATION: locations or [],
+        TABLE_NETWORK_DEVICE_CI: devices or [],
+        TABLE_ENDPOINT: endpoints or [],
+    }
+    plan = LoadPlan()
+
+    # Classes read for delta detection: those loaded, and parents of loaded
+    # children (relationships may point at records that already exist)
+    detect = {target for target in TARGET_ORDER if records_by_target[target]}
+    detect.update(
+        parent_target
+        for child_target, _, parent_target, _ in RELATIONSHIP_LINKS
+        if records_by_target[child_target]
+    )
+
+    # Delta detection and routing
+    existing_ids: dict[str, dict[str, str]] = {}
+    known: dict[str, set[str]] = {}
+    created: dict[str, set[str]] = {}
+    for target in TARGET_ORDER:
+        existing: dict[str, str] = {}
+        if client is not None and detect_existing and target in detect:
+            existing, pages = _existing_records(client, target)
+            plan.read_requests += pages
+        existing_ids[target] = existing
+
+        route = LOAD_TARGETS[target]
+        # Class records are written to a base table with sys_class_name set
+        table = route.table
+        sys_class_name = (
+            route.sys_class_name if route.sys_class_name != route.table else None
+        )
+        known[target] = set(existing)
+        created[target] = set()
+        for record in records_by_target[target]:
+            source_id = record.u_unifi_source_id
+            # JSON mode: plans are serialized (decodes RawJSON passthrough)
+            payload = record.model_dump(mode="json", exclude_none=True)
+            payload.pop("sys_id", None)
+            sys_id = existing.get(source_id)
+            plan.operations.append(
+                PlannedOperation(
+                    target=target,
+                    action=ACTION_UPDATE if sys_id else ACTION_CREATE,
+                    table=table,
+                    source_id=source_id,
+                    payload=payload,
+                    sys_class_name=sys_class_name,
+                    sys_id=sys_id,
+                )
+            )
+            known[target].add(source_id)
+            if not sys_id:
+                created[target].add(source_id)
+
+    # Relationship resolution (parents may be in this load or already exist)
+    type_ids: dict[str, str] = {}
+    if client is not None and any(records_by_target[t] for t in TARGET_ORDER[1:]):
+        resolver = relationship_types or RelationshipTypeResolver(client)
+        try:
+            type_ids = resolver.resolve(LOADER_RELATIONSHIP_TYPES)
+            plan.read_requests += 1
+        except Exception as e:
+            print(f"⚠️  Plan: Failed to resolve relationship types: {e}")
+
+    for child_target, attribute, parent_target, type_name in RELATIONSHIP_LINKS:
+        for record in records_by_target[child_target]:
+            parent_source_id = getattr(record, attribute, None)
+            if (
+                record.u_unifi_source_id in created[child_target]
+                and parent_source_id
+                and parent_source_id in known[parent_target]
+            ):
+                plan.relationships.append(
+                    PlannedRelationship(
+                        parent_target=parent_target,
+                        parent_source_id=parent_source_id,
+                        child_target=child_target,
+                        child_source_id=record.u_unifi_source_id,
+                        type_name=type_name,
+                        type_sys_id=type_ids.get(type_name),
+                        parent_sys_id=existing_ids[parent_target].get(parent_source_id),
+                    )
+                )
+
+    plan.estimates = estimate_requests(
+        plan,
+        metrics=metrics,
+        batch_size=batch_size,
+        import_set_batch_size=import_set_batch_size,
+    )
+    return plan
+
+
+def plan_unifi_load(
+    client: ServiceNowAPIClient | None = None,
+    hosts: list[UniFiHost] | None = None,
+    sites: list[UniFiSite] | None = None,
+    devices: list[UniFiDevice] | None = None,
+    clients: list[UniFiClient] | None = None,
+    **kwargs: Any,
+) -> LoadPlan:
+    """Transform UniFi models and plan the load (see plan_load)."""
+    return plan_load(
+        client,
+        gateways=[transform_host(host) for host in hosts or []],
+        locations=[transform_site(site) for site in sites or []],
+        devices=[transform_device(device) for device in devices or []],
+        endpoints=[transform_client(unifi_client) for unifi_client in clients or []],
+        **kwargs,
+    )
+
+
+def execute_plan(
+    client: ServiceNowAPIClient, plan: LoadPlan
+) -> dict[str, dict[str, str]]:
+    """Execute a previously computed plan.
+
+    Creates and updates run in dependency order, then relationships are created
+    with the sys_ids captured (or known) for each source id. Parents that are
+    not part of the plan use the sys_id found while planning.
+
+    Args:
+        client: ServiceNow API client
+        plan: Plan from plan_load (possibly loaded with LoadPlan.from_json)
+
+    Returns:
+        Mapping of loader class to {source_id: sys_id}, like
+        load_entities_with_relationships
+    """
+    id_mapping: dict[str, dict[str, str]] = {target: {} for target in TARGET_ORDER}
+
+    for target in TARGET_ORDER:
+        for operation in plan.operations:
+            if operation.target != target:
+                continue
+            if operation.action == ACTION_UPDATE and operation.sys_id:
+                client.update_record(
+                    operation.table, operation.sys_id, operation.payload
+                )
+                sys_id = operation.sys_id
+            else:
+                model = _MODELS[target].model_validate(operation.payload)
+                sys_id = _LOADERS[target](client, model).get("sys_id", "")
+            if sys_id:
+                id_mapping[target][operation.source_id] = sys_id
+
+    for relationship in plan.relationships:
+        parent_sys_id = (
+            id_mapping[relationship.parent_target].get(relationship.parent_source_id)
+            or relationship.parent_sys_id
+        )
+        child_sys_id = id_mapping[relationship.child_target].get(
+            relationship.child_source_id
+        )
+        if not parent_sys_id or not child_sys_id:
+            print(
+                f"⚠️  Plan: Skipping {relationship.type_name} relationship for "
+                f"{relationship.child_source_id} (sys_id not available)"
+            )
+            continue
+        try:
+            client.create_record(
+                "cmdb_rel_ci",
+                {
+                    "parent": parent_sys_id,
+                    "child": child_sys_id,
+                    "type": relationship.type_sys_id or relationship.type_name,
+                },
+            )
+        except Exception as e:
+            print(
+                f"⚠️  Plan: Failed to create {relationship.type_name} relationship "
+                f"for {relationship.child_source_id}: {e}"
+            )
+
+    return id_mapping
@@ -0,0 +1,233 @@
+"""Storage policies for u_unifi_raw_data (the largest part of each payload).
+
+Modes:
+    full: send u_unifi_raw_data as-is (default behavior)
+    digest_compressed: send a SHA-256 digest plus a zlib-compressed base64 blob
+    on_change: send the digest always, raw data only when the digest changed
+    attachment: send the digest; upload raw data once per change as a record
+        attachment via the Attachment API, replacing the previous upload
+
+Pass a RawDataPolicy to ServiceNowAPIClient(raw_data_policy=...) to apply it
+to every create_record/update_record.
+"""
+
+import base64
+import hashlib
+import json
+import zlib
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from beast_dream_snow_loader.models.raw import RawJSON
+
+RAW_DATA_FIELD = "u_unifi_raw_data"
+RAW_DIGEST_FIELD = "u_unifi_raw_digest"
+RAW_ENCODING_FIELD = "u_unifi_raw_encoding"
+RAW_ENCODING_ZLIB_BASE64 = "zlib+base64"
+RAW_ATTACHMENT_FILE_NAME = "unifi_raw_data.json"
+
+
+class RawDataMode(Enum):
+    """How u_unifi_raw_data is sent to ServiceNow."""
+
+    FULL = "full"
+    DIGEST_COMPRESSED = "digest_compressed"
+    ON_CHANGE = "on_change"
+    ATTACHMENT = "attachment"
+
+
+@dataclass
+class PreparedPayload:
+    """Payload after applying a raw data policy."""
+
+    data: dict[str, Any]
+    # Raw bytes to upload as an attachment once the record's sys_id is known
+    attachment: bytes | None = None
+    digest: str | None = None
+    record_key: tuple[str, str] | None = None
+
+
+def raw_data_bytes(raw: RawJSON | dict[str, Any]) -> bytes:
+    """Get the bytes of raw data (original bytes, or canonical JSON for dicts)."""
+    if isinstance(raw, RawJSON):
+        return bytes(raw.data)
+    return json.dumps(raw, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+def raw_data_digest(raw_bytes: bytes) -> str:
+    """Get the content digest (SHA-256 hex) of raw data bytes."""
+    return hashlib.sha256(raw_bytes).hexdigest()
+
+
+class RawDataPolicy:
+    """Applies a raw data storage mode to outbound payloads and tracks savings.
+
+    Digests are remembered per (table, u_unifi_source_id) once a write
+    succeeds. Seed ``known_digests`` (e.g., persisted from a previous run or
+    read from u_unifi_raw_digest on the instance) so on_change and attachment
+    modes skip unchanged raw data from the first write.
+    """
+
+    def __init__(
+        self,
+        mode: RawDataMode = RawDataMode.FULL,
+        known_digests: dict[tuple[str, str], str] | None = None,
+        compression_level: int = 6,
+    ):
+        """Initialize policy.
+
+        Args:
+            mode: Raw data storage mode
+            known_digests: Digests already stored, keyed by (table, source_id)
+            compression_level: zlib level for digest_compressed mode
+        """
+        self.mode = mode
+        self.known_digests: dict[tuple[str, str], str] = dict(known_digests or {})
+        self.compression_level = compression_level
+        self._stats = {
+            "records": 0,
+            "raw_bytes": 0,
+            "payload_bytes": 0,
+            "attachment_bytes": 0,
+            "raw_sent": 0,
+            "raw_skipped_unchanged": 0,
+            "attachments_uploaded": 0,
+            "attachments_replaced": 0,
+            "attachments_failed": 0,
+        }
+
+    def prepare(self, table: str, data: dict[str, Any]) -> PreparedPayload:
+        """Apply the policy to a payload (the input dict is not modified).
+
+        Args:
+            table: Target table
+            data: Record payload (may contain u_unifi_raw_data)
+
+        Returns:
+            Prepared payload and any deferred attachment
+        """
+        raw = data.get(RAW_DATA_FIELD)
+        if raw is None or not isinstance(raw, RawJSON | dict):
+            return PreparedPayload(data=data)
+
+        raw_bytes = raw_data_bytes(raw)
+        self._stats["records"] += 1
+        self._stats["raw_bytes"] += len(raw_bytes)
+
+        if self.mode is RawDataMode.FULL:
+            self._stats["payload_bytes"] += len(raw_bytes)
+            self._stats["raw_sent"] += 1
+            return PreparedPayload(data=data)
+
+        digest = raw_data_digest(raw_bytes)
+        source_id = data.get("u_unifi_source_id")
+        record_key = (table, str(source_id)) if source_id is not None else None
+        unchanged = (
+            record_key is not None and self.known_digests.get(record_key) == digest
+        )
+
+        prepared = {key: value for key, value in data.items() if key != RAW_DATA_FIELD}
+        prepared[RAW_DIGEST_FIELD] = digest
+        self._stats["payload_bytes"] += len(digest)
+        attachment = None
+
+        if self.mode is RawDataMode.DIGEST_COMPRESSED:
+            blob = base64.b64encode(
+                zlib.compress(raw_bytes, self.compression_level)
+            ).decode()
+            prepared[RAW_DATA_FIELD] = blob
+            prepared[RAW_ENCODING_FIELD] = RAW_ENCODING_ZLIB_BASE64
+            self._stats["payload_bytes"] += len(blob) + len(RAW_ENCODING_ZLIB_BASE64)
+            self._stats["raw_sent"] += 1
+        elif unchanged:
+            self._stats["raw_skipped_unchanged"] += 1
+        elif self.mode is RawDataMode.ON_CHANGE:
+            prepared[RAW_DATA_FIELD] = raw
+            self._stats["payload_bytes"] += len(raw_bytes)
+            self._stats["raw_sent"] += 1
+        else:  # ATTACHMENT
+            attachment = raw_bytes
+
+        return PreparedPayload(
+            data=prepared, attachment=attachment, digest=digest, record_key=record_key
+        )
+
+    def complete(
+        self,
+        client: Any,
+        table: str,
+        sys_id: str | None,
+        prepared: PreparedPayload,
+        replace_previous: bool = True,
+    ) -> None:
+        """Finish a successful write: upload deferred attachment, record digest.
+
+        The record is already written, so attachment errors never propagate
+        (a caller would otherwise retry or fall back and write it twice).
+        They are counted in ``attachments_failed`` and the digest is not
+        recorded, so the upload is retried on the next change check.
+
+        Args:
+            client: ServiceNow API client (for upload_attachment)
+            table: Table the record was written to
+            sys_id: Written record's sys_id
+            prepared: Result of prepare() for this write
+            replace_previous: Delete earlier raw data attachments of the record
+                after a successful upload (False for newly created records)
+        """
+        if prepared.attachment is not None and sys_id:
+            try:
+                uploaded = client.upload_attachment(
+                    table, sys_id, RAW_ATTACHMENT_FILE_NAME, prepared.attachment
+                )
+            except Exception as e:
+                print(
+                    f"⚠️  Raw data: Attachment upload failed for {table} {sys_id}: {e}"
+                )
+                self._stats["attachments_failed"] += 1
+                return
+            self._stats["attachment_bytes"] += len(prepared.attachment)
+            self._stats["attachments_uploaded"] += 1
+            self._stats["raw_sent"] += 1
+            if replace_previous:
+                self._delete_previous_attachments(
+                    client, table, sys_id, uploaded.get("sys_id")
+                )
+        if prepared.record_key is not None and prepared.digest is not None:
+            self.known_digests[prepared.record_key] = prepared.digest
+
+    def _delete_previous_attachments(
+        self, client: Any, table: str, sys_id: str, keep_sys_id: str | None
+    ) -> None:
+        """Delete raw data attachments of a record other than the new one."""
+        query = (
+            f"table_name={table}^table_sys_id={sys_id}"
+            f"^file_name={RAW_ATTACHMENT_FILE_NAME}"
+        )
+        if keep_sys_id:
+            query += f"^sys_id!={keep_sys_id}"
+        try:
+            for attachment in client.query_records("sys_attachment", query=query):
+                client.delete_attachment(attachment["sys_id"])
+                self._stats["attachments_replaced"] += 1
+        except Exception as e:
+            # Best effort - an old attachment left behind is only extra storage
+            print(f"⚠️  Raw data: Could not remove old attachments of {sys_id}: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get byte accounting for this policy.
+
+        Returns:
+            Counts plus raw_bytes (full raw data size), sent_bytes (payload +
+            attachment bytes actually sent) and bytes_saved
+        """
+        stats: dict[str, Any] = {"mode": self.mode.value, **self._stats}
+        stats["sent_bytes"] = stats["payload_bytes"] + stats["attachment_bytes"]
+        stats["bytes_saved"] = stats["raw_bytes"] - stats["sent_bytes"]
+        stats["savings_percent"] = (
+            stats["bytes_saved"] / stats["raw_bytes"] * 100
+            if stats["raw_bytes"]
+            else 0.0
+        )
+        return stats
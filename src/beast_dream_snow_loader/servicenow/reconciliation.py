@@ -0,0 +1,328 @@
+"""Stale CI reconciliation: find and retire CIs no longer present in UniFi."""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from enum import Enum
+
+from beast_dream_snow_loader.models.servicenow import (
+    ServiceNowEndpoint,
+    ServiceNowGatewayCI,
+    ServiceNowLocation,
+    ServiceNowNetworkDeviceCI,
+)
+from beast_dream_snow_loader.servicenow.api_client import ServiceNowAPIClient
+from beast_dream_snow_loader.servicenow.loader import (
+    LOAD_TARGETS,
+    TABLE_ENDPOINT,
+    TABLE_GATEWAY_CI,
+    TABLE_LOCATION,
+    TABLE_NETWORK_DEVICE_CI,
+    LoadTarget,
+)
+
+# CMDB install_status choice value for "Retired"
+INSTALL_STATUS_RETIRED = "7"
+
+
+class ReconcileAction(Enum):
+    """What to do with orphaned CIs."""
+
+    RETIRE = "retire"  # Set install_status to Retired (keeps history)
+    DELETE = "delete"  # Delete the record
+
+
+# Reconcile targets are the loader's routing table (see loader.LOAD_TARGETS)
+ReconcileTarget = LoadTarget
+DEFAULT_RECONCILE_TARGETS: dict[str, ReconcileTarget] = LOAD_TARGETS
+
+
+class StaleRecordThresholdError(Exception):
+    """Raised when a reconciliation would remove too many records."""
+
+    def __init__(self, target: str, orphaned: int, total: int, max_fraction: float):
+        self.target = target
+        self.orphaned = orphaned
+        self.total = total
+        self.max_fraction = max_fraction
+        super().__init__(
+            f"Refusing to remove {orphaned}/{total} records from '{target}' "
+            f"(limit is {max_fraction:.0%} per run)"
+        )
+
+
+@dataclass
+class StaleRecords:
+    """Orphaned CIs found for one reconcile target."""
+
+    target: str
+    total: int = 0
+    orphans: list[tuple[str, str]] = field(default_factory=list)  # (sys_id, source_id)
+
+    @property
+    def orphan_fraction(self) -> float:
+        """Fraction of existing records that are orphaned."""
+        return len(self.orphans) / max(1, self.total)
+
+
+@dataclass
+class ReconciliationResult:
+    """Outcome of a reconciliation pass."""
+
+    action: ReconcileAction
+    dry_run: bool
+    stale: dict[str, StaleRecords] = field(default_factory=dict)
+    removed: dict[str, int] = field(default_factory=dict)
+    failed: dict[str, list[str]] = field(default_factory=dict)  # target → sys_ids
+
+
+def build_source_snapshot(
+    gateways: Iterable[ServiceNowGatewayCI] | None = None,
+    locations: Iterable[ServiceNowLocation] | None = None,
+    devices: Iterable[ServiceNowNetworkDeviceCI] | None = None,
+    endpoints: Iterable[ServiceNowEndpoint] | None = None,
+) -> dict[str, set[str]]:
+    """Build the current source snapshot (source ids per loader class).
+
+    Only classes that are passed are included, so classes this sync did not
+    fetch are never reconciled against an empty snapshot. Pass an empty list
+    to reconcile a class that really has no records left.
+    """
+    classes = {
+        TABLE_GATEWAY_CI: gateways,
+        TABLE_LOCATION: locations,
+        TABLE_NETWORK_DEVICE_CI: devices,
+        TABLE_ENDPOINT: endpoints,
+    }
+    return {
+        target_name: {record.u_unifi_source_id for record in records}
+        for target_name, records in classes.items()
+        if records is not None
+    }
+
+
+def find_stale_records(
+    client: ServiceNowAPIClient,
+    target_name: str,
+    current_source_ids: set[str],
+    target: ReconcileTarget | None = None,
+    action: ReconcileAction = ReconcileAction.RETIRE,
+    page_size: int = 1000,
+) -> StaleRecords:
+    """Find CIs whose u_unifi_source_id is not in the current source snapshot.
+
+    Streams only the projected (sys_id, u_unifi_source_id) pairs, so memory use
+    is bounded by the snapshot and the orphans, never the whole table.
+
+    Args:
+        client: ServiceNow API client
+        target_name: Loader class key (e.g., TABLE_ENDPOINT)
+        current_source_ids: Source ids present in the current UniFi snapshot
+        target: Table/class to scan (default: DEFAULT_RECONCILE_TARGETS entry)
+        action: Retire skips records that are already retired
+        page_size: Records per page
+
+    Returns:
+        Stale records with the number of records scanned
+    """
+    target = target or DEFAULT_RECONCILE_TARGETS[target_name]
+    query = f"u_unifi_source_idISNOTEMPTY^sys_class_name={target.sys_class_name}"
+    if action == ReconcileAction.RETIRE:
+        query += f"^install_status!={INSTALL_STATUS_RETIRED}"
+
+    stale = StaleRecords(target=target_name)
+    for record in client.iter_records(
+        target.table,
+        query=query,
+        fields=["sys_id", "u_unifi_source_id"],
+        page_size=page_size,
+    ):
+        stale.total += 1
+        source_id = record.get("u_unifi_source_id", "")
+        if source_id not in current_source_ids:
+            stale.orphans.append((record["sys_id"], source_id))
+    return stale
+
+
+def remove_records(
+    client: ServiceNowAPIClient,
+    table: str,
+    sys_ids: list[str],
+    action: ReconcileAction = ReconcileAction.RETIRE,
+    batch_size: int = 100,
+) -> tuple[int, list[str]]:
+    """Retire or delete records by sys_id via the Batch API.
+
+    Args:
+        client: ServiceNow API client
+        table: Table the records live in
+        sys_ids: Records to remove
+        action: Retire (set install_status) or delete
+        batch_size: Requests per Batch API call
+
+    Returns:
+        (number removed, sys_ids that failed)
+    """
+    removed = 0
+    failed: list[str] = []
+    for start in range(0, len(sys_ids), batch_size):
+        chunk = sys_ids[start : start + batch_size]
+        if action == ReconcileAction.RETIRE:
+            rest_requests = [
+                {
+                    "method": "PATCH",
+                    "path": f"/table/{table}/{sys_id}",
+                    "body": {"install_status": INSTALL_STATUS_RETIRED},
+                }
+                for sys_id in chunk
+            ]
+        else:
+            rest_requests = [
+                {"method": "DELETE", "path": f"/table/{table}/{sys_id}"}
+                for sys_id in chunk
+            ]
+
+        responses = client.batch_requests(rest_requests)
+        for sys_id, response in zip(chunk, responses, strict=True):
+            status_code = response["status_code"]
+            if status_code is not None and 200 <= status_code < 300:
+                removed += 1
+            else:
+                failed.append(sys_id)
+    return removed, failed
+
+
+def rekey_source_ids(
+    client: ServiceNowAPIClient,
+    rekeys: Mapping[str, str],
+    target_name: str = TABLE_ENDPOINT,
+    target: ReconcileTarget | None = None,
+    batch_size: int = 100,
+    page_size: int = 1000,
+) -> tuple[int, list[str]]:
+    """Rename u_unifi_source_id on existing CIs (e.g. raw → canonical MAC).
+
+    Run before the first load with new source ids, so existing CIs are
+    updated in place instead of being retired as orphans and created again.
+    Records whose new source id is already taken are left alone (and
+    reported as failed).
+
+    Args:
+        client: ServiceNow API client
+        rekeys: Old source id → new source id
+        target_name: Loader class key (e.g., TABLE_ENDPOINT)
+        target: Table/class to update (default: DEFAULT_RECONCILE_TARGETS entry)
+        batch_size: Requests per Batch API call
+        page_size: Records per page when scanning
+
+    Returns:
+        (number re-keyed, sys_ids that failed)
+    """
+    target = target or DEFAULT_RECONCILE_TARGETS[target_name]
+    existing: dict[str, str] = {}
+    for record in client.iter_records(
+        target.table,
+        query=f"u_unifi_source_idISNOTEMPTY^sys_class_name={target.sys_class_name}",
+        fields=["sys_id", "u_unifi_source_id"],
+        page_size=page_size,
+    ):
+        existing.setdefault(record["u_unifi_source_id"], record["sys_id"])
+
+    pending: list[tuple[str, str]] = []  # (sys_id, new source id)
+    failed: list[str] = []
+    for old, new in rekeys.items():
+        sys_id = existing.get(old)
+        if sys_id is None or old == new:
+            continue
+        if new in existing:
+            failed.append(sys_id)
+        else:
+            pending.append((sys_id, new))
+
+    rekeyed = 0
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start : start + batch_size]
+        responses = client.batch_requests(
+            [
+                {
+                    "method": "PATCH",
+                    "path": f"/table/{target.table}/{sys_id}",
+                    "body": {"u_unifi_source_id": new},
+                }
+                for sys_id, new in chunk
+            ]
+        )
+        for (sys_id, _), response in zip(chunk, responses, strict=True):
+            status_code = response["status_code"]
+            if status_code is not None and 200 <= status_code < 300:
+                rekeyed += 1
+            else:
+                failed.append(sys_id)
+    return rekeyed, failed
+
+
+def reconcile_stale_records(
+    client: ServiceNowAPIClient,
+    snapshot: Mapping[str, set[str]],
+    action: ReconcileAction = ReconcileAction.RETIRE,
+    max_removal_fraction: float = 0.1,
+    batch_size: int = 100,
+    dry_run: bool = False,
+    targets: Mapping[str, ReconcileTarget] | None = None,
+) -> ReconciliationResult:
+    """Retire or delete CIs that disappeared from UniFi, in bulk.
+
+    All targets are scanned before anything is written. If any target would
+    lose more than ``max_removal_fraction`` of its records (e.g., because the
+    UniFi snapshot is incomplete), nothing is removed and an error is raised.
+
+    Args:
+        client: ServiceNow API client
+        snapshot: Current source ids per loader class (see build_source_snapshot)
+        action: Retire (default) or delete orphaned CIs
+        max_removal_fraction: Safety threshold per target per run
+        batch_size: Requests per Batch API call
+        dry_run: If True, only report orphans
+        targets: Override table/class per loader class
+
+    Returns:
+        Reconciliation result with orphans, removed counts and failures
+
+    Raises:
+        StaleRecordThresholdError: If the safety threshold would be exceeded
+    """
+    targets = targets or DEFAULT_RECONCILE_TARGETS
+    result = ReconciliationResult(action=action, dry_run=dry_run)
+
+    for target_name, current_source_ids in snapshot.items():
+        stale = find_stale_records(
+            client,
+            target_name,
+            set(current_source_ids),
+            target=targets[target_name],
+            action=action,
+        )
+        result.stale[target_name] = stale
+        if stale.orphans and stale.orphan_fraction > max_removal_fraction:
+            raise StaleRecordThresholdError(
+                target_name, len(stale.orphans), stale.total, max_removal_fraction
+            )
+
+    if dry_run:
+        return result
+
+    for target_name, stale in result.stale.items():
+        removed, failed = remove_records(
+            client,
+            targets[target_name].table,
+            [sys_id for sys_id, _ in stale.orphans],
+            action=action,
+            batch_size=batch_size,
+        )
+        result.removed[target_name] = removed
+        if failed:
+            result.failed[target_name] = failed
+            print(
+                f"⚠️  Reconciliation: {len(failed)} {target_name} records could not be {action.value}d"
+            )
+
+    return result
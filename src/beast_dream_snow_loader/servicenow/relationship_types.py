@@ -0,0 +1,143 @@
+"""Relationship type (cmdb_rel_type) sys_id resolution with an on-disk cache."""
+
+import json
+import os
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+
+from beast_dream_snow_loader.servicenow.api_client import ServiceNowAPIClient
+
+TABLE_RELATIONSHIP_TYPE = "cmdb_rel_type"
+
+# Relationship types used by the loader (cmdb_rel_type display names)
+REL_TYPE_MANAGED_BY = "Managed by::Manages"
+REL_TYPE_LOCATED_IN = "Located in::Contains"
+REL_TYPE_CONNECTS_TO = "Connects to::Connected by"
+LOADER_RELATIONSHIP_TYPES = (
+    REL_TYPE_MANAGED_BY,
+    REL_TYPE_LOCATED_IN,
+    REL_TYPE_CONNECTS_TO,
+)
+
+
+def _default_cache_path() -> Path:
+    """Get default cache file location (user's home directory, never the project)."""
+    return (
+        Path.home() / ".cache" / "beast-dream-snow-loader" / "relationship_types.json"
+    )
+
+
+class RelationshipTypeResolver:
+    """Resolves relationship type names to cmdb_rel_type sys_ids.
+
+    All missing names are resolved with one bulk query per run. Results are
+    cached in memory and, when enabled, on disk keyed by instance, so later
+    runs need no query at all. Writing the sys_id instead of the display string makes
+    cmdb_rel_ci inserts cheaper and deterministic (a name mismatch would
+    otherwise fail silently on the instance).
+    """
+
+    def __init__(
+        self,
+        client: ServiceNowAPIClient,
+        cache_path: str | Path | None = None,
+        use_disk_cache: bool | None = None,
+    ):
+        """Initialize resolver.
+
+        Args:
+            client: ServiceNow API client
+            cache_path: Cache file path (default: ~/.cache/beast-dream-snow-loader/)
+            use_disk_cache: Persist resolved ids to the cache file (default:
+                only when cache_path is given; otherwise memory only)
+        """
+        self.client = client
+        self.cache_path = Path(cache_path) if cache_path else _default_cache_path()
+        self.use_disk_cache = (
+            cache_path is not None if use_disk_cache is None else use_disk_cache
+        )
+        self._type_ids: dict[str, str] = (
+            self._load_cache() if self.use_disk_cache else {}
+        )
+
+    def _load_cache(self) -> dict[str, str]:
+        """Load cached type ids for this instance from disk."""
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        instance_cache = cache.get(self.client.instance, {})
+        return dict(instance_cache) if isinstance(instance_cache, dict) else {}
+
+    def _save_cache(self) -> None:
+        """Persist type ids for this instance to disk (best effort, atomic)."""
+        try:
+            try:
+                with open(self.cache_path) as f:
+                    cache = json.load(f)
+            except (OSError, ValueError):
+                cache = {}
+            if not isinstance(cache, dict):
+                cache = {}
+            cache[self.client.instance] = self._type_ids
+            text = json.dumps(cache, indent=2, sort_keys=True)
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write a temp file and swap it in, so the cache is never truncated
+            fd, temp_path = tempfile.mkstemp(
+                dir=self.cache_path.parent, prefix=f".{self.cache_path.name}."
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(text)
+                os.replace(temp_path, self.cache_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except (OSError, TypeError, ValueError):
+            # Cache is an optimization - never fail a load because of it
+            pass
+
+    def resolve(self, names: Iterable[str], refresh: bool = False) -> dict[str, str]:
+        """Resolve relationship type names to sys_ids.
+
+        Args:
+            names: Relationship type names (e.g., 'Managed by::Manages')
+            refresh: If True, ignore cached values and query again
+
+        Returns:
+            Mapping of name to sys_id. Names not found on the instance are omitted.
+
+        Raises:
+            requests.HTTPError: If the bulk query fails
+        """
+        wanted = list(dict.fromkeys(names))
+        missing = (
+            wanted
+            if refresh
+            else [name for name in wanted if name not in self._type_ids]
+        )
+
+        if missing:
+            results = self.client.query_records(
+                TABLE_RELATIONSHIP_TYPE,
+                query=f"nameIN{','.join(missing)}",
+                limit=max(len(missing), 1) * 2,
+            )
+            resolved: dict[str, str] = {}
+            for record in results:
+                name = record.get("name")
+                sys_id = record.get("sys_id")
+                # First match wins if an instance has duplicate type names
+                if name in missing and sys_id and name not in resolved:
+                    resolved[name] = sys_id
+            self._type_ids.update(resolved)
+            if self.use_disk_cache:
+                self._save_cache()
+
+        return {name: self._type_ids[name] for name in wanted if name in self._type_ids}
+
+    def get(self, name: str) -> str | None:
+        """Get cached sys_id for a relationship type name (no query)."""
+        return self._type_ids.get(name)
@@ -0,0 +1,412 @@
+"""Snapshot diff: act on what changed between two UniFi inventories.
+
+Compares two snapshots of outbound records keyed by ``u_unifi_source_id``
+and classifies each record as added, removed, modified or unchanged, with
+field-level changes. Runs in linear time: by hashing the old snapshot, or as
+a streaming merge join when both inputs are sorted by source ID.
+
+The resulting ``ChangeSet`` is the minimal work for the loader - new records
+to create, changed fields only for modified records, source IDs to retire -
+and is applied with ``apply_change_set``.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel
+
+from beast_dream_snow_loader.models.compact import CompactRecord
+from beast_dream_snow_loader.models.unifi import (
+    UniFiClient,
+    UniFiDevice,
+    UniFiHost,
+    UniFiSite,
+)
+from beast_dream_snow_loader.servicenow.api_client import ServiceNowAPIClient
+from beast_dream_snow_loader.servicenow.id_mapping import IdMappingStore
+from beast_dream_snow_loader.servicenow.loader import (
+    LOAD_TARGETS,
+    TABLE_ENDPOINT,
+    TABLE_GATEWAY_CI,
+    TABLE_LOCATION,
+    TABLE_NETWORK_DEVICE_CI,
+    TARGET_ORDER,
+    load_entities_with_relationships,
+    outbound_payload,
+)
+from beast_dream_snow_loader.servicenow.reconciliation import (
+    ReconcileAction,
+    remove_records,
+)
+from beast_dream_snow_loader.servicenow.relationship_types import (
+    RelationshipTypeResolver,
+)
+from beast_dream_snow_loader.transformers.unifi_to_snow import (
+    transform_clients,
+    transform_devices,
+    transform_hosts,
+    transform_sites,
+)
+
+# Outbound model, compact record or payload dict
+SnapshotRecord = BaseModel | CompactRecord | dict[str, Any]
+
+# Loader class key (id_mapping key) → records
+Snapshot = Mapping[str, Iterable[SnapshotRecord]]
+
+
+class DiffKind(Enum):
+    """How a record changed between two snapshots."""
+
+    ADDED = "added"
+    REMOVED = "removed"
+    MODIFIED = "modified"
+    UNCHANGED = "unchanged"
+
+
+@dataclass(frozen=True)
+class FieldChange:
+    """One changed outbound field (None = field absent on that side)."""
+
+    field: str
+    old: Any
+    new: Any
+
+
+@dataclass
+class RecordDiff:
+    """Diff of one record between two snapshots."""
+
+    target: str
+    source_id: str
+    kind: DiffKind
+    changes: list[FieldChange] = field(default_factory=list)
+    record: SnapshotRecord | None = None  # New record (added/modified)
+
+
+@dataclass
+class ChangeSet:
+    """Minimal changes to apply to bring ServiceNow from one snapshot to the next."""
+
+    # target → new records to create
+    added: dict[str, list[SnapshotRecord]] = field(default_factory=dict)
+    # target → {source_id: {field: new value}} (changed fields only)
+    modified: dict[str, dict[str, dict[str, Any]]] = field(default_factory=dict)
+    # target → source IDs no longer present
+    removed: dict[str, list[str]] = field(default_factory=dict)
+    # target → number of unchanged records (no writes needed)
+    unchanged: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether there is nothing to write."""
+        return not any(
+            records
+            for changes in (self.added, self.modified, self.removed)
+            for records in changes.values()
+        )
+
+    def add(self, diff: RecordDiff) -> None:
+        """Record one diff."""
+        target = diff.target
+        if diff.kind is DiffKind.ADDED:
+            self.added.setdefault(target, []).append(diff.record)  # type: ignore[arg-type]
+        elif diff.kind is DiffKind.MODIFIED:
+            # An empty string clears a field in ServiceNow
+            self.modified.setdefault(target, {})[diff.source_id] = {
+                change.field: "" if change.new is None else change.new
+                for change in diff.changes
+            }
+        elif diff.kind is DiffKind.REMOVED:
+            self.removed.setdefault(target, []).append(diff.source_id)
+        else:
+            self.unchanged[target] = self.unchanged.get(target, 0) + 1
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        """Count records per target and kind."""
+        targets = [
+            target
+            for target in TARGET_ORDER
+            if any(
+                target in changes
+                for changes in (self.added, self.modified, self.removed, self.unchanged)
+            )
+        ]
+        return {
+            target: {
+                DiffKind.ADDED.value: len(self.added.get(target, [])),
+                DiffKind.MODIFIED.value: len(self.modified.get(target, {})),
+                DiffKind.REMOVED.value: len(self.removed.get(target, [])),
+                DiffKind.UNCHANGED.value: self.unchanged.get(target, 0),
+            }
+            for target in targets
+        }
+
+
+@dataclass
+class ChangeSetResult:
+    """Outcome of applying a change set."""
+
+    created: dict[str, int] = field(default_factory=dict)
+    updated: dict[str, int] = field(default_factory=dict)
+    removed: dict[str, int] = field(default_factory=dict)
+    failed: dict[str, list[str]] = field(default_factory=dict)  # target → source IDs
+    unmapped: dict[str, list[str]] = field(default_factory=dict)  # No known sys_id
+
+
+def _source_payload(record: SnapshotRecord) -> tuple[str, dict[str, Any]]:
+    """Get (source ID, outbound payload without sys_id) of a record."""
+    payload = dict(record) if isinstance(record, dict) else outbound_payload(record)
+    payload.pop("sys_id", None)
+    return payload["u_unifi_source_id"], payload
+
+
+def diff_payloads(old: dict[str, Any], new: dict[str, Any]) -> list[FieldChange]:
+    """Get field-level changes between two payloads (absent fields are None)."""
+    if old == new:
+        return []
+    changes = [
+        FieldChange(name, old.get(name), value)
+        for name, value in new.items()
+        if old.get(name) != value
+    ]
+    changes.extend(
+        FieldChange(name, value, None)
+        for name, value in old.items()
+        if name not in new and value is not None
+    )
+    return changes
+
+
+def _classify(
+    target: str,
+    source_id: str,
+    old: dict[str, Any],
+    new: dict[str, Any],
+    record: SnapshotRecord,
+) -> RecordDiff:
+    changes = diff_payloads(old, new)
+    if not changes:
+        return RecordDiff(target, source_id, DiffKind.UNCHANGED)
+    return RecordDiff(target, source_id, DiffKind.MODIFIED, changes, record)
+
+
+def _diff_hashed(
+    target: str, old: Iterable[SnapshotRecord], new: Iterable[SnapshotRecord]
+) -> Iterator[RecordDiff]:
+    """Diff by hashing the old snapshot (any input order)."""
+    previous = dict(_source_payload(record) for record in old)
+    for record in new:
+        source_id, payload = _source_payload(record)
+        old_payload = previous.pop(source_id, None)
+        if old_payload is None:
+            yield RecordDiff(target, source_id, DiffKind.ADDED, record=record)
+        else:
+            yield _classify(target, source_id, old_payload, payload, record)
+    for source_id in previous:
+        yield RecordDiff(target, source_id, DiffKind.REMOVED)
+
+
+def _sorted_payloads(
+    records: Iterable[SnapshotRecord],
+) -> Iterator[tuple[str, dict[str, Any], SnapshotRecord]]:
+    """Yield (source ID, payload, record), checking ascending source ID order."""
+    last: str | None = None
+    for record in records:
+        source_id, payload = _source_payload(record)
+        if last is not None and source_id <= last:
+            raise ValueError(
+                f"Snapshot is not sorted by unique source ID: "
+                f"{source_id!r} after {last!r}"
+            )
+        last = source_id
+        yield source_id, payload, record
+
+
+def _diff_sorted(
+    target: str, old: Iterable[SnapshotRecord], new: Iterable[SnapshotRecord]
+) -> Iterator[RecordDiff]:
+    """Diff two snapshots sorted by source ID as a streaming merge join."""
+    old_items = _sorted_payloads(old)
+    new_items = _sorted_payloads(new)
+    old_item = next(old_items, None)
+    new_item = next(new_items, None)
+    while old_item is not None or new_item is not None:
+        if new_item is None or (old_item is not None and old_item[0] < new_item[0]):
+            yield RecordDiff(target, old_item[0], DiffKind.REMOVED)  # type: ignore[index]
+            old_item = next(old_items, None)
+        elif old_item is None or new_item[0] < old_item[0]:
+            yield RecordDiff(target, new_item[0], DiffKind.ADDED, record=new_item[2])
+            new_item = next(new_items, None)
+        else:
+            yield _classify(target, new_item[0], old_item[1], new_item[1], new_item[2])
+            old_item = next(old_items, None)
+            new_item = next(new_items, None)
+
+
+def diff_records(
+    target: str,
+    old: Iterable[SnapshotRecord],
+    new: Iterable[SnapshotRecord],
+    presorted: bool = False,
+) -> Iterator[RecordDiff]:
+    """Diff the records of one loader class between two snapshots.
+
+    Args:
+        target: Loader class key (e.g. TABLE_ENDPOINT)
+        old: Previous snapshot's records
+        new: Current snapshot's records
+        presorted: Both inputs are sorted by source ID - stream them as a
+            merge join instead of holding the old snapshot in a dict
+
+    Yields:
+        One diff per source ID (new records in input order, then removals,
+        when hashing; in source ID order when presorted)
+
+    Raises:
+        ValueError: If presorted inputs are out of order or repeat a source ID
+    """
+    if presorted:
+        return _diff_sorted(target, old, new)
+    return _diff_hashed(target, old, new)
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot, presorted: bool = False) -> ChangeSet:
+    """Diff two snapshots into a change set.
+
+    Args:
+        old: Previous snapshot (loader class → records)
+        new: Current snapshot (loader class → records)
+        presorted: Records of each class are sorted by source ID
+
+    Returns:
+        Change set covering every loader class in either snapshot
+    """
+    change_set = ChangeSet()
+    for target in TARGET_ORDER:
+        if target not in old and target not in new:
+            continue
+        for diff in diff_records(
+            target, old.get(target, ()), new.get(target, ()), presorted
+        ):
+            change_set.add(diff)
+    return change_set
+
+
+def unifi_snapshot(
+    hosts: Iterable[UniFiHost] = (),
+    sites: Iterable[UniFiSite] = (),
+    devices: Iterable[UniFiDevice] = (),
+    clients: Iterable[UniFiClient] = (),
+) -> dict[str, list[BaseModel]]:
+    """Transform a UniFi inventory into a snapshot for diff_snapshots."""
+    return {
+        TABLE_GATEWAY_CI: transform_hosts(hosts),
+        TABLE_LOCATION: transform_sites(sites),
+        TABLE_NETWORK_DEVICE_CI: transform_devices(devices),
+        TABLE_ENDPOINT: transform_clients(clients),
+    }
+
+
+def apply_change_set(
+    client: ServiceNowAPIClient,
+    change_set: ChangeSet,
+    id_mapping: Mapping[str, MutableMapping[str, str]],
+    removal_action: ReconcileAction = ReconcileAction.RETIRE,
+    batch_size: int = 100,
+    relationship_types: RelationshipTypeResolver | None = None,
+) -> ChangeSetResult:
+    """Write a change set to ServiceNow.
+
+    Added records are created (with relationships) by
+    load_entities_with_relationships, modified records are PATCHed with their
+    changed fields only, and removed records are retired (or deleted) in bulk.
+    Relationships of added records to parents created by earlier loads use
+    the sys_ids in ``id_mapping``.
+
+    Args:
+        client: ServiceNow API client
+        change_set: Changes from diff_snapshots
+        id_mapping: Loader class → {source_id: sys_id} from previous loads
+            (one entry per changed class); updated in place with created and
+            removed records
+        removal_action: Retire (default) or delete removed records
+        batch_size: Requests per Batch API call for removals
+        relationship_types: Optional resolver for cmdb_rel_type sys_ids
+
+    Returns:
+        Counts per loader class, plus failed and unmapped source IDs
+    """
+    result = ChangeSetResult()
+
+    if any(change_set.added.values()):
+        # Seed the loader's mapping with known parents (e.g. the site of a new
+        # endpoint), so their relationships are created too
+        store = IdMappingStore()
+        for target, known in id_mapping.items():
+            store.table(target).update(known)
+        loaded = load_entities_with_relationships(
+            client,
+            gateways=change_set.added.get(TABLE_GATEWAY_CI),  # type: ignore[arg-type]
+            locations=change_set.added.get(TABLE_LOCATION),  # type: ignore[arg-type]
+            devices=change_set.added.get(TABLE_NETWORK_DEVICE_CI),  # type: ignore[arg-type]
+            endpoints=change_set.added.get(TABLE_ENDPOINT),  # type: ignore[arg-type]
+            relationship_types=relationship_types,
+            id_mapping_store=store,
+        )
+        for target, records in change_set.added.items():
+            known = id_mapping.get(target, {})
+            created: dict[str, str] = {}
+            for record in records:
+                source_id = _source_payload(record)[0]
+                sys_id = loaded[target].get(source_id)
+                if sys_id and known.get(source_id) != sys_id:
+                    created[source_id] = sys_id
+            if created:
+                result.created[target] = len(created)
+                id_mapping[target].update(created)
+
+    for target, updates in change_set.modified.items():
+        table = LOAD_TARGETS[target].table
+        known = id_mapping.get(target, {})
+        updated = 0
+        for source_id, fields in updates.items():
+            sys_id = known.get(source_id)
+            if not sys_id:
+                result.unmapped.setdefault(target, []).append(source_id)
+                continue
+            try:
+                client.patch_record(table, sys_id, fields)
+                updated += 1
+            except Exception as e:
+                print(f"⚠️  Change set: Failed to update {target} {source_id}: {e}")
+                result.failed.setdefault(target, []).append(source_id)
+        result.updated[target] = updated
+
+    for target, source_ids in change_set.removed.items():
+        known = id_mapping.get(target, {})
+        by_sys_id: dict[str, str] = {}
+        for source_id in source_ids:
+            sys_id = known.get(source_id)
+            if sys_id:
+                by_sys_id[sys_id] = source_id
+            else:
+                result.unmapped.setdefault(target, []).append(source_id)
+        removed, failed = remove_records(
+            client,
+            LOAD_TARGETS[target].table,
+            list(by_sys_id),
+            action=removal_action,
+            batch_size=batch_size,
+        )
+        result.removed[target] = removed
+        if failed:
+            result.failed.setdefault(target, []).extend(by_sys_id[s] for s in failed)
+        failed_ids = set(failed)
+        for sys_id, source_id in by_sys_id.items():
+            if sys_id not in failed_ids:
+                id_mapping[target].pop(source_id, None)
+
+    return result
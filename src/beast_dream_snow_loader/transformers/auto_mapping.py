@@ -0,0 +1,264 @@
+"""Schema-driven auto-mapping of UniFi fields to ServiceNow columns.
+
+``FieldMappingConfig`` maps a handful of fields by hand. This module derives a
+full source path → column table from the UniFi schema shipped with the package
+(``data/unifi_schema.sql``, or a sample payload), keeps the hand-written
+mappings authoritative, and caches the result as a versioned JSON artifact so
+wide mappings cost nothing at transform time.
+Compile the result with ``compile_field_mapping`` for bulk transforms.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections.abc import Iterable
+from functools import lru_cache
+from importlib import resources
+from pathlib import Path
+
+from beast_dream_snow_loader.transformers.schema_mapper import (
+    FieldMappingConfig,
+    flatten_nested_field,
+)
+
+# Bump when column naming rules change (invalidates cached artifacts)
+AUTO_MAPPING_VERSION = 1
+
+# ServiceNow custom columns must start with u_
+CUSTOM_COLUMN_PREFIX = "u_unifi_"
+
+# ServiceNow column (sys_dictionary element) name length limit
+MAX_COLUMN_LENGTH = 80
+
+# Schema table → entity; entities match FieldMappingConfig getters
+SCHEMA_TABLE_ENTITIES = {
+    "hosts": "host",
+    "sites": "site",
+    "devices": "device",
+    "clients": "client",
+}
+
+# Package data (importlib.resources), so installed wheels can read it too
+DEFAULT_SCHEMA_RESOURCE = "data/unifi_schema.sql"
+
+_CREATE_TABLE = re.compile(r"CREATE TABLE\s+(\w+)\s*\((.*?)\n\);", re.DOTALL)
+_COLUMN_LINE = re.compile(r"^\s*([A-Za-z_][\w.]*)\s+[A-Z]+")
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_INVALID_COLUMN_CHARS = re.compile(r"[^a-z0-9_]+")
+
+# Columns added by the schema analysis tool, not present in API payloads
+_DERIVED_COLUMN_SUFFIX = "_parsed"
+
+
+def _default_cache_path() -> Path:
+    """Get default artifact location (user's home directory, never the project)."""
+    return Path.home() / ".cache" / "beast-dream-snow-loader" / "auto_mappings.json"
+
+
+def read_default_schema() -> str:
+    """Read the UniFi schema DDL shipped with the package."""
+    resource = resources.files("beast_dream_snow_loader")
+    for part in DEFAULT_SCHEMA_RESOURCE.split("/"):
+        resource = resource / part
+    return resource.read_text(encoding="utf-8")
+
+
+def parse_schema_sql(schema_sql: str) -> dict[str, list[str]]:
+    """Parse field paths per table from a unifi_schema.sql document.
+
+    Args:
+        schema_sql: Schema DDL text
+
+    Returns:
+        Mapping of schema table name to dotted source field paths, in order
+    """
+    tables: dict[str, list[str]] = {}
+    for table, body in _CREATE_TABLE.findall(schema_sql):
+        paths = []
+        for line in body.splitlines():
+            match = _COLUMN_LINE.match(line)
+            if not match or match.group(1) in ("FOREIGN", "PRIMARY"):
+                continue
+            path = match.group(1)
+            if path.endswith(_DERIVED_COLUMN_SUFFIX):
+                continue
+            paths.append(path)
+        tables[table] = paths
+    return tables
+
+
+def sample_field_paths(payload: dict, parent: str = "") -> list[str]:
+    """Collect dotted leaf field paths from a sample API payload.
+
+    Lists and scalars are leaves; nested dicts are walked.
+    """
+    paths = []
+    for key, value in payload.items():
+        path = f"{parent}.{key}" if parent else key
+        if isinstance(value, dict) and value:
+            paths.extend(sample_field_paths(value, path))
+        else:
+            paths.append(path)
+    return paths
+
+
+@lru_cache(maxsize=8192)
+def to_servicenow_column(
+    field_path: str, prefix: str = CUSTOM_COLUMN_PREFIX, full_path: bool = False
+) -> str:
+    """Convert a source field path to a ServiceNow custom column name.
+
+    Examples:
+        "reportedState.autoUpdate.schedule.day" → "u_unifi_auto_update_schedule_day"
+        "hardwareId" → "u_unifi_hardware_id"
+
+    Args:
+        field_path: Dotted source field path
+        prefix: Column prefix (custom columns must start with u_)
+        full_path: If True, keep common prefixes (reportedState, meta, ...)
+    """
+    flattened = (
+        field_path.replace(".", "_") if full_path else flatten_nested_field(field_path)
+    )
+    snake = _CAMEL_BOUNDARY.sub("_", flattened).lower()
+    column = prefix + _INVALID_COLUMN_CHARS.sub("_", snake).strip("_")
+    column = re.sub(r"_+", "_", column)
+    if len(column) > MAX_COLUMN_LENGTH:
+        digest = hashlib.sha1(field_path.encode()).hexdigest()[:8]
+        column = f"{column[: MAX_COLUMN_LENGTH - 9]}_{digest}"
+    return column
+
+
+def generate_field_mappings(
+    field_paths: Iterable[str],
+    curated: dict[str, str] | None = None,
+    prefix: str = CUSTOM_COLUMN_PREFIX,
+) -> dict[str, str]:
+    """Generate a source path → column mapping for all field paths.
+
+    Curated (hand-written) mappings win for the paths they cover, and their
+    target columns are reserved. If two paths flatten to the same column, the
+    later one keeps its common prefix (e.g., ``statistics_``), then gets a
+    numeric suffix as a last resort.
+
+    Args:
+        field_paths: Dotted source field paths
+        curated: Hand-written mappings (e.g., FieldMappingConfig().get_host_mappings())
+        prefix: Column prefix for generated columns
+
+    Returns:
+        Mapping of source path → ServiceNow column
+    """
+    mappings = dict(curated or {})
+    used_columns = set(mappings.values())
+
+    for path in field_paths:
+        if path in mappings:
+            continue
+        column = to_servicenow_column(path, prefix)
+        if column in used_columns:
+            column = to_servicenow_column(path, prefix, full_path=True)
+        suffix = 2
+        base = column
+        while column in used_columns:
+            column = f"{base}_{suffix}"
+            suffix += 1
+        mappings[path] = column
+        used_columns.add(column)
+
+    return mappings
+
+
+def _curated_mappings(entity: str) -> dict[str, str]:
+    """Get hand-written mappings for an entity (empty if none)."""
+    getter = getattr(FieldMappingConfig(), f"get_{entity}_mappings", None)
+    return getter() if getter else {}
+
+
+def generate_schema_mappings(
+    schema_sql: str, prefix: str = CUSTOM_COLUMN_PREFIX
+) -> dict[str, dict[str, str]]:
+    """Generate mapping tables for every entity in a schema document.
+
+    Returns:
+        Mapping of entity (host, site, device, ...) → source path → column
+    """
+    return {
+        SCHEMA_TABLE_ENTITIES.get(table, table): generate_field_mappings(
+            paths, _curated_mappings(SCHEMA_TABLE_ENTITIES.get(table, table)), prefix
+        )
+        for table, paths in parse_schema_sql(schema_sql).items()
+    }
+
+
+def load_schema_mappings(
+    schema_path: str | Path | None = None,
+    cache_path: str | Path | None = None,
+    use_cache: bool = True,
+    prefix: str = CUSTOM_COLUMN_PREFIX,
+) -> dict[str, dict[str, str]]:
+    """Load schema mapping tables, regenerating only when the schema changes.
+
+    The artifact is keyed by AUTO_MAPPING_VERSION, the column prefix and the
+    SHA-256 of the schema text.
+
+    Args:
+        schema_path: Schema DDL file (default: the packaged UniFi schema)
+        cache_path: Artifact file (default: ~/.cache/beast-dream-snow-loader/)
+        use_cache: If False, always regenerate and do not write the artifact
+        prefix: Column prefix for generated columns
+
+    Returns:
+        Mapping of entity → source path → column
+
+    Raises:
+        OSError: If the schema file cannot be read
+    """
+    schema_sql = Path(schema_path).read_text() if schema_path else read_default_schema()
+    schema_hash = hashlib.sha256(schema_sql.encode()).hexdigest()
+    cache_file = Path(cache_path) if cache_path else _default_cache_path()
+
+    if use_cache:
+        try:
+            with open(cache_file) as f:
+                artifact = json.load(f)
+            if (
+                artifact.get("version") == AUTO_MAPPING_VERSION
+                and artifact.get("schema_sha256") == schema_hash
+                and artifact.get("prefix") == prefix
+            ):
+                return artifact["mappings"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    mappings = generate_schema_mappings(schema_sql, prefix)
+
+    if use_cache:
+        artifact = {
+            "version": AUTO_MAPPING_VERSION,
+            "schema_sha256": schema_hash,
+            "prefix": prefix,
+            "mappings": mappings,
+        }
+        try:
+            text = json.dumps(artifact, indent=2)
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write a temp file and swap it in, so concurrent readers never see
+            # a truncated artifact
+            fd, temp_path = tempfile.mkstemp(
+                dir=cache_file.parent, prefix=f".{cache_file.name}."
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(text)
+                os.replace(temp_path, cache_file)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except (OSError, TypeError, ValueError):
+            # Artifact is an optimization - never fail a load because of it
+            pass
+
+    return mappings
@@ -0,0 +1,187 @@
+"""Transform result cache keyed by source content hash.
+
+In daemon-style repeated runs most UniFi objects are byte-identical to the
+previous cycle. ``TransformCache`` keys each source record by a hash of its
+JSON and returns the previously built outbound model on a hit, so unchanged
+records skip validation and transformation entirely.
+
+Keys:
+    bytes / RawJSON: hash of the bytes as received (the Site Manager API
+        serializes identical objects identically; no re-encoding per record)
+    dict: hash of its canonical JSON (sorted keys, compact separators)
+
+Cached models (compact records in trusted mode) are shared between cycles -
+treat them as read-only (the loader only reads them, via ``model_dump`` or
+``to_payload``).
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+
+from beast_dream_snow_loader.models.compact import CompactRecord
+from beast_dream_snow_loader.models.raw import RawJSON, attach_raw_json
+from beast_dream_snow_loader.models.unifi import (
+    UniFiClient,
+    UniFiDevice,
+    UniFiHost,
+    UniFiSite,
+)
+from beast_dream_snow_loader.transformers.unifi_to_snow import (
+    transform_clients,
+    transform_devices,
+    transform_hosts,
+    transform_sites,
+)
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+SourceRecord = bytes | RawJSON | dict[str, Any]
+Outbound = BaseModel | CompactRecord
+
+# Entity → (source model, batch transform)
+_ENTITIES: dict[str, tuple[type[BaseModel], Callable[..., list[Outbound]]]] = {
+    "host": (UniFiHost, transform_hosts),
+    "site": (UniFiSite, transform_sites),
+    "device": (UniFiDevice, transform_devices),
+    "client": (UniFiClient, transform_clients),
+}
+
+
+def content_key(record: SourceRecord) -> bytes:
+    """Get the cache key (128-bit BLAKE2b digest) of a source record."""
+    if isinstance(record, RawJSON):
+        data = bytes(record.data)
+    elif isinstance(record, dict):
+        data = json.dumps(
+            record, sort_keys=True, separators=(",", ":"), default=str
+        ).encode()
+    else:
+        data = record
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+@dataclass
+class CacheStats:
+    """Hit-rate metrics for a transform cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def lookups(self) -> int:
+        """Total lookups."""
+        return self.hits + self.misses
+
+    @property
+    def hit_rate_percent(self) -> float:
+        """Calculate hit rate as percentage."""
+        return (self.hits / max(1, self.lookups)) * 100
+
+
+class TransformCache:
+    """Size-bounded LRU cache of outbound models by source content hash."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize cache.
+
+        Args:
+            max_entries: Maximum cached records (least recently used evicted)
+
+        Raises:
+            ValueError: If max_entries is not positive
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: OrderedDict[bytes, Outbound] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Outbound | None:
+        """Get a cached model (counts a hit or miss)."""
+        model = self._entries.get(key)
+        if model is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return model
+
+    def put(self, key: bytes, model: Outbound) -> None:
+        """Cache a model, evicting the least recently used entry if full."""
+        self._entries[key] = model
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (stats are kept)."""
+        self._entries.clear()
+
+    def transform(
+        self,
+        records: Iterable[SourceRecord],
+        entity: str = "client",
+        keep_raw: bool = False,
+        trusted: bool = False,
+    ) -> list[Outbound]:
+        """Transform source records, reusing cached results for unchanged ones.
+
+        Only cache misses are validated and transformed (in one batch).
+
+        Args:
+            records: Raw JSON records (bytes, e.g. from iter_json_records),
+                RawJSON, or API dicts
+            entity: host, site, device or client
+            keep_raw: Pass each byte record through as u_unifi_raw_data (use
+                one setting per cache - cached models keep the original choice)
+            trusted: Build compact records, validating only sampled records
+                (use one setting per cache, as for keep_raw)
+
+        Returns:
+            ServiceNow models (compact records if trusted), in input order
+
+        Raises:
+            KeyError: If the entity is unknown
+            pydantic.ValidationError: If a changed record fails validation
+        """
+        model, transform = _ENTITIES[entity]
+        records = list(records)
+        keys = [content_key(record) for record in records]
+        results: list[Outbound | None] = [self.get(key) for key in keys]
+
+        # Validate each distinct missing record once
+        missing: dict[bytes, SourceRecord] = {}
+        for key, record, result in zip(keys, records, results, strict=True):
+            if result is None:
+                missing.setdefault(key, record)
+        built: dict[bytes, Outbound] = {}
+        if missing:
+            sources = [_validate(model, r, keep_raw) for r in missing.values()]
+            built = dict(zip(missing, transform(sources, trusted=trusted), strict=True))
+            for key, outbound in built.items():
+                self.put(key, outbound)
+
+        return [
+            result if result is not None else built[key]
+            for key, result in zip(keys, results, strict=True)
+        ]
+
+
+def _validate(model: type[BaseModel], record: SourceRecord, keep_raw: bool) -> Any:
+    """Validate one source record into its UniFi model."""
+    if isinstance(record, dict):
+        return model.model_validate(record)
+    data = bytes(record.data) if isinstance(record, RawJSON) else record
+    instance = model.model_validate_json(data)
+    return attach_raw_json(instance, data) if keep_raw else instance
@@ -0,0 +1,245 @@
+"""Columnar UniFi client → ServiceNow endpoint transformation.
+
+Endpoints are the high-volume entity, and their transformation only touches
+a handful of flat fields (hostname, IP, MAC, device type, site). Instead of
+building and validating one model per client, the columnar engine takes
+parallel columns of client fields (lists, tuples or NumPy arrays) and
+normalizes, dedups and emits endpoint payload rows a column at a time.
+
+Compared to ``transform_client``:
+    - MAC addresses are canonicalized (lowercase, colon-separated)
+    - IP addresses are stripped of whitespace and lowercased (IPv6)
+    - Rows are deduplicated by u_unifi_source_id (last occurrence wins, at the
+      position of the first)
+    - Rows are payload dicts, as ``model_dump(exclude_none=True)`` would
+      produce, and are not validated
+
+Source ids: like ``transform_client``, hostname-less clients fall back to the
+MAC as received, so existing CIs keep their identity. With
+``canonical_source_ids`` both paths use the canonical MAC instead; that
+re-keys clients whose MAC is not already canonical, so rename the existing
+CIs first (``canonical_source_id_rekeys`` gives the old → new map and
+``reconciliation.rekey_source_ids`` applies it) or they are retired as
+orphans and created again.
+"""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from beast_dream_snow_loader.models.raw import RawJSON, get_raw_json
+from beast_dream_snow_loader.models.unifi import UniFiClient
+
+_MAC_SEPARATORS = str.maketrans("", "", ":-. ")
+_CANONICAL_MAC_CHARS = b"0123456789abcdef:\n"
+_CANONICAL_MAC_COLONS = (2, 5, 8, 11, 14)
+
+
+def _as_list(column: Sequence[Any] | None, length: int) -> list[Any]:
+    """Get a column as a list (NumPy arrays via tolist, missing as all None)."""
+    if column is None:
+        return [None] * length
+    tolist = getattr(column, "tolist", None)
+    return tolist() if callable(tolist) else list(column)
+
+
+@dataclass
+class ClientColumns:
+    """Parallel columns of UniFi client fields (one entry per client)."""
+
+    hostname: Sequence[str]
+    ip: Sequence[str]
+    mac: Sequence[str]
+    device_type: Sequence[str | None] | None = None
+    site_id: Sequence[str | None] | None = None
+    device_id: Sequence[str | None] | None = None
+    # Raw source data per client for u_unifi_raw_data (None entries omitted)
+    raw: Sequence[dict[str, Any] | RawJSON | None] | None = None
+
+    def __post_init__(self):
+        """Check that all columns have the same length."""
+        lengths = {
+            name: len(column)
+            for name, column in vars(self).items()
+            if column is not None
+        }
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"Column lengths differ: {lengths}")
+
+    def __len__(self) -> int:
+        return len(self.hostname)
+
+    @classmethod
+    def from_clients(cls, clients: Iterable[UniFiClient]) -> "ClientColumns":
+        """Build columns from UniFi client models.
+
+        Raw data is only included for clients that kept their original bytes
+        (``keep_raw`` at ingestion).
+        """
+        clients = list(clients)
+        return cls(
+            hostname=[c.hostname for c in clients],
+            ip=[c.ip for c in clients],
+            mac=[c.mac for c in clients],
+            device_type=[c.deviceType for c in clients],
+            site_id=[c.siteId for c in clients],
+            device_id=[c.deviceId for c in clients],
+            raw=[get_raw_json(c) for c in clients],
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, Any]]) -> "ClientColumns":
+        """Build columns from raw UniFi API client dicts (kept as raw data).
+
+        Raises:
+            KeyError: If a record is missing hostname, ip or mac
+        """
+        records = list(records)
+        return cls(
+            hostname=[r["hostname"] for r in records],
+            ip=[r["ip"] for r in records],
+            mac=[r["mac"] for r in records],
+            device_type=[r.get("deviceType") for r in records],
+            site_id=[r.get("siteId") for r in records],
+            device_id=[r.get("deviceId") for r in records],
+            raw=records,
+        )
+
+
+def _canonical_mac_column(values: list[str]) -> list[str] | None:
+    """Lowercase a MAC column if it is otherwise canonical, else None.
+
+    Checks the whole newline-joined column with a few byte-level passes:
+    every value is 17 characters, with colons at fixed positions and only
+    hex digits elsewhere.
+    """
+    count = len(values)
+    joined = "\n".join(values).lower()
+    try:
+        data = joined.encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    if len(data) != 18 * count - 1 or data[17::18].count(b"\n") != count - 1:
+        return None
+    if data.translate(None, _CANONICAL_MAC_CHARS):
+        return None
+    if any(data[i::18].count(b":") != count for i in _CANONICAL_MAC_COLONS):
+        return None
+    return joined.split("\n")
+
+
+def normalize_macs(macs: Sequence[str]) -> list[str]:
+    """Canonicalize MAC addresses to lowercase colon-separated form.
+
+    Accepts ``AA-BB-CC-DD-EE-FF``, ``aabb.ccdd.eeff``, ``AABBCCDDEEFF`` etc.
+    Values that are not 12 hex digits are only stripped and lowercased.
+    Columns that are already canonical (apart from case) are checked as a
+    whole instead of per value.
+    """
+    values = _as_list(macs, 0)
+    if not values:
+        return []
+    canonical = _canonical_mac_column(values)
+    if canonical is not None:
+        return canonical
+    digits = [mac.translate(_MAC_SEPARATORS).lower() for mac in values]
+    return [
+        (
+            f"{d[0:2]}:{d[2:4]}:{d[4:6]}:{d[6:8]}:{d[8:10]}:{d[10:12]}"
+            if len(d) == 12
+            else mac.strip().lower()
+        )
+        for d, mac in zip(digits, values, strict=True)
+    ]
+
+
+def normalize_ips(ips: Sequence[str]) -> list[str]:
+    """Normalize IP addresses (strip whitespace, lowercase IPv6 hex digits)."""
+    return [ip.strip().lower() for ip in _as_list(ips, 0)]
+
+
+def canonical_source_id_rekeys(columns: ClientColumns) -> dict[str, str]:
+    """Get the source ids that ``canonical_source_ids`` changes (old → new).
+
+    Only hostname-less clients whose MAC is not already canonical are re-keyed.
+
+    Args:
+        columns: Parallel client field columns (the current UniFi snapshot)
+
+    Returns:
+        Raw-MAC source id → canonical-MAC source id
+    """
+    hostnames = _as_list(columns.hostname, len(columns))
+    raw_macs = _as_list(columns.mac, len(columns))
+    return {
+        raw: canonical
+        for hostname, raw, canonical in zip(
+            hostnames, raw_macs, normalize_macs(raw_macs), strict=True
+        )
+        if not hostname and raw and raw != canonical
+    }
+
+
+def transform_client_columns(
+    columns: ClientColumns, dedup: bool = True, canonical_source_ids: bool = False
+) -> list[dict[str, Any]]:
+    """Transform client columns to ServiceNow endpoint payload rows.
+
+    Args:
+        columns: Parallel client field columns
+        dedup: Drop duplicate u_unifi_source_ids (last occurrence wins)
+        canonical_source_ids: Fall back to the canonical MAC, not the MAC as
+            received, for hostname-less clients (re-keys existing CIs)
+
+    Returns:
+        Endpoint payload dicts (None fields omitted), in input order
+    """
+    length = len(columns)
+    hostnames = _as_list(columns.hostname, length)
+    ips = normalize_ips(columns.ip)
+    raw_macs = _as_list(columns.mac, length)
+    macs = normalize_macs(raw_macs)
+    fallbacks = macs if canonical_source_ids else raw_macs
+    source_ids = [
+        hostname or mac for hostname, mac in zip(hostnames, fallbacks, strict=True)
+    ]
+    device_types = _as_list(columns.device_type, length)
+    site_ids = _as_list(columns.site_id, length)
+    device_ids = _as_list(columns.device_id, length)
+    raws = _as_list(columns.raw, length)
+
+    rows = []
+    append = rows.append
+    for source_id, hostname, ip, mac, device_type, site_id, device_id, raw in zip(
+        source_ids,
+        hostnames,
+        ips,
+        macs,
+        device_types,
+        site_ids,
+        device_ids,
+        raws,
+        strict=True,
+    ):
+        row = {
+            "u_unifi_source_id": source_id,
+            "hostname": hostname,
+            "ip_address": ip,
+            "mac_address": mac,
+        }
+        if device_type is not None:
+            row["device_type"] = device_type
+        if site_id:
+            row["site_id"] = site_id
+        if device_id:
+            row["device_id"] = device_id
+        if raw is not None:
+            row["u_unifi_raw_data"] = raw
+        append(row)
+
+    if not dedup or len(set(source_ids)) == length:
+        return rows
+    unique: dict[str, dict[str, Any]] = {}
+    for source_id, row in zip(source_ids, rows, strict=True):
+        unique[source_id] = row
+    return list(unique.values())
@@ -0,0 +1,263 @@
+"""Flap damping for volatile endpoint fields.
+
+Wi-Fi clients roam, sleep and reconnect constantly, so their IP address,
+site and uplink device change from sync to sync - often flapping between the
+same few values. Without damping every such change rewrites the endpoint CI.
+
+``FlapDamper`` runs once per sync cycle over the outbound endpoints. A new
+value of a volatile field is held (the record keeps its committed value)
+until it has been observed unchanged for ``stable_cycles`` consecutive cycles
+or for ``stable_seconds``, whichever comes first. A value flapping back to the
+committed one cancels the pending change, so nothing is written at all.
+
+Records seen for the first time are committed as-is. Every observed value
+transition is kept in a bounded per-field history (for diagnostics and
+tuning), and the whole store can be saved between runs.
+"""
+
+import json
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+# Endpoint fields that change as clients roam, sleep and reconnect
+DEFAULT_VOLATILE_FIELDS = ("ip_address", "site_id", "device_id")
+
+DEFAULT_STABLE_CYCLES = 3
+DEFAULT_HISTORY_SIZE = 16
+
+RecordT = TypeVar("RecordT", BaseModel, dict[str, Any])
+
+
+@dataclass(frozen=True)
+class FieldObservation:
+    """A value transition seen for one field."""
+
+    cycle: int
+    observed_at: float  # Epoch seconds
+    value: Any
+
+
+@dataclass
+class FieldState:
+    """Committed and pending value of one volatile field of one record."""
+
+    committed: Any
+    pending: Any = None
+    has_pending: bool = False
+    pending_cycles: int = 0  # Consecutive cycles the pending value was seen
+    pending_since: float = 0.0
+    history: deque[FieldObservation] = field(default_factory=deque)
+
+
+@dataclass
+class DampingStats:
+    """Changes held and released by a damper."""
+
+    cycles: int = 0
+    records: int = 0
+    changes_observed: int = 0  # Volatile field values differing from committed
+    changes_held: int = 0
+    changes_released: int = 0
+    flaps_cancelled: int = 0  # Pending changes that flapped back
+    records_damped: int = 0  # Records with at least one held change
+
+    @property
+    def held_percent(self) -> float:
+        """Calculate share of observed changes held back, as a percentage."""
+        return (self.changes_held / max(1, self.changes_observed)) * 100
+
+
+def _get(record: BaseModel | dict[str, Any], name: str) -> Any:
+    if isinstance(record, dict):
+        return record.get(name)
+    return getattr(record, name, None)
+
+
+def _replace(record: RecordT, update: dict[str, Any]) -> RecordT:
+    if isinstance(record, dict):
+        return {**record, **update}  # type: ignore[return-value]
+    return record.model_copy(update=update)
+
+
+class FlapDamper:
+    """Holds volatile field changes until they are stable."""
+
+    def __init__(
+        self,
+        volatile_fields: Sequence[str] = DEFAULT_VOLATILE_FIELDS,
+        stable_cycles: int = DEFAULT_STABLE_CYCLES,
+        stable_seconds: float | None = None,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize damper.
+
+        Args:
+            volatile_fields: Outbound fields to damp
+            stable_cycles: Consecutive cycles a new value must be seen before
+                it is released
+            stable_seconds: Release a new value seen unchanged for this long,
+                even before stable_cycles (None = cycles only)
+            history_size: Transitions kept per field
+            clock: Time source (epoch seconds)
+
+        Raises:
+            ValueError: If stable_cycles is less than 1
+        """
+        if stable_cycles < 1:
+            raise ValueError("stable_cycles must be at least 1")
+        self.volatile_fields = tuple(volatile_fields)
+        self.stable_cycles = stable_cycles
+        self.stable_seconds = stable_seconds
+        self.history_size = history_size
+        self.clock = clock
+        self.cycle = 0
+        self.stats = DampingStats()
+        # Source ID → field → state
+        self.states: dict[str, dict[str, FieldState]] = {}
+
+    def damp(self, records: Iterable[RecordT]) -> list[RecordT]:
+        """Run one sync cycle over the current endpoints.
+
+        Args:
+            records: Outbound endpoints (models or payload dicts) of this cycle
+
+        Returns:
+            Records in input order, with held fields set to their committed
+            values (records without held changes are returned as-is)
+        """
+        self.cycle += 1
+        self.stats.cycles += 1
+        now = self.clock()
+        damped: list[RecordT] = []
+        for record in records:
+            self.stats.records += 1
+            source_id = _get(record, "u_unifi_source_id")
+            states = self.states.get(source_id)
+            if states is None:
+                self.states[source_id] = {
+                    name: self._new_state(_get(record, name), now)
+                    for name in self.volatile_fields
+                }
+                damped.append(record)
+                continue
+
+            held: dict[str, Any] = {}
+            for name in self.volatile_fields:
+                value = _get(record, name)
+                state = states.get(name)
+                if state is None:
+                    states[name] = self._new_state(value, now)
+                elif not self._observe(state, value, now):
+                    held[name] = state.committed
+            if held:
+                self.stats.records_damped += 1
+                damped.append(_replace(record, held))
+            else:
+                damped.append(record)
+        return damped
+
+    def _new_state(self, value: Any, now: float) -> FieldState:
+        state = FieldState(committed=value, history=deque(maxlen=self.history_size))
+        state.history.append(FieldObservation(self.cycle, now, value))
+        return state
+
+    def _observe(self, state: FieldState, value: Any, now: float) -> bool:
+        """Observe a field's value this cycle; False if the change is held."""
+        last = state.pending if state.has_pending else state.committed
+        if value != last:
+            state.history.append(FieldObservation(self.cycle, now, value))
+
+        if value == state.committed:
+            if state.has_pending:
+                self.stats.flaps_cancelled += 1
+                state.pending, state.has_pending = None, False
+            return True
+
+        self.stats.changes_observed += 1
+        if state.has_pending and value == state.pending:
+            state.pending_cycles += 1
+        else:
+            state.pending, state.has_pending = value, True
+            state.pending_cycles, state.pending_since = 1, now
+
+        stable = state.pending_cycles >= self.stable_cycles or (
+            self.stable_seconds is not None
+            and now - state.pending_since >= self.stable_seconds
+        )
+        if stable:
+            state.committed = value
+            state.pending, state.has_pending = None, False
+            self.stats.changes_released += 1
+            return True
+        self.stats.changes_held += 1
+        return False
+
+    def history(self, source_id: str, name: str) -> list[FieldObservation]:
+        """Get the observed value transitions of one field (oldest first)."""
+        state = self.states.get(source_id, {}).get(name)
+        return list(state.history) if state is not None else []
+
+    def forget(self, source_ids: Iterable[str]) -> None:
+        """Drop state of records that no longer exist (e.g. retired)."""
+        for source_id in source_ids:
+            self.states.pop(source_id, None)
+
+    def save(self, path: str | Path) -> None:
+        """Save the cycle count and per-field state as JSON."""
+        data = {
+            "cycle": self.cycle,
+            "states": {
+                source_id: {
+                    name: [
+                        state.committed,
+                        state.pending,
+                        state.has_pending,
+                        state.pending_cycles,
+                        state.pending_since,
+                        [[o.cycle, o.observed_at, o.value] for o in state.history],
+                    ]
+                    for name, state in states.items()
+                }
+                for source_id, states in self.states.items()
+            },
+        }
+        Path(path).write_text(json.dumps(data, separators=(",", ":")))
+
+    def load(self, path: str | Path) -> None:
+        """Restore state saved with save() (no-op if the file is missing)."""
+        path = Path(path)
+        if not path.exists():
+            return
+        data = json.loads(path.read_text())
+        self.cycle = data["cycle"]
+        self.states = {
+            source_id: {
+                name: FieldState(
+                    committed,
+                    pending,
+                    has_pending,
+                    pending_cycles,
+                    pending_since,
+                    deque(
+                        (FieldObservation(*o) for o in history),
+                        maxlen=self.history_size,
+                    ),
+                )
+                for name, (
+                    committed,
+                    pending,
+                    has_pending,
+                    pending_cycles,
+                    pending_since,
+                    history,
+                ) in states.items()
+            }
+            for source_id, states in data["states"].items()
+        }
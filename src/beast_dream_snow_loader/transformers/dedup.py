@@ -0,0 +1,174 @@
+"""Pre-load dedup of UniFi clients by canonical MAC address.
+
+The same physical client can appear several times in one inventory (seen at
+multiple sites, or with different MAC casing/separators). ``transform_client``
+derives ``u_unifi_source_id`` from ``hostname or mac``, so each copy becomes a
+separate endpoint CI and a separate write. ``dedup_clients`` indexes clients
+by canonical MAC and merges each group into one client before transformation.
+
+Precedence (which copy wins a group):
+    most_recent: highest last-seen timestamp (extra API field, ``lastSeen``)
+    most_complete: most non-empty fields
+    first / last: input order
+
+Fields the winner lacks (device type, site, device) are filled from the other
+copies in precedence order. Ties go to the later copy in input order.
+
+Only MACs that canonicalize to 12 hex digits are grouped. Clients with an
+empty or malformed MAC cannot be identified by it and are passed through
+unmerged.
+"""
+
+import re
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from beast_dream_snow_loader.models.unifi import UniFiClient
+from beast_dream_snow_loader.transformers.columnar import normalize_macs
+
+DEFAULT_LAST_SEEN_FIELD = "lastSeen"
+
+# Optional client fields filled from duplicates when the winner lacks them
+_MERGED_FIELDS = ("deviceType", "siteId", "deviceId")
+
+_CANONICAL_MAC = re.compile(r"[0-9a-f]{2}(?::[0-9a-f]{2}){5}")
+
+
+class DedupPrecedence(Enum):
+    """Which duplicate client wins a MAC group."""
+
+    MOST_RECENT = "most_recent"
+    MOST_COMPLETE = "most_complete"
+    FIRST = "first"
+    LAST = "last"
+
+
+@dataclass
+class DedupReport:
+    """Outcome of a dedup pass."""
+
+    input_count: int
+    unique_count: int
+    # Canonical MAC → number of input clients merged into one
+    merged_groups: dict[str, int]
+    # Clients passed through because their MAC is empty or malformed
+    unindexed_count: int = 0
+
+    @property
+    def writes_avoided(self) -> int:
+        """Endpoint writes saved by merging duplicates."""
+        return self.input_count - self.unique_count
+
+
+def build_mac_index(clients: Sequence[UniFiClient]) -> dict[str, list[int]]:
+    """Index clients by canonical MAC address.
+
+    Args:
+        clients: UniFi clients
+
+    Returns:
+        Canonical MAC → positions of its clients in ``clients``, in input
+        order. Clients whose MAC is not 12 hex digits are left out.
+    """
+    index: dict[str, list[int]] = {}
+    for position, mac in enumerate(normalize_macs([c.mac for c in clients])):
+        if _CANONICAL_MAC.fullmatch(mac):
+            index.setdefault(mac, []).append(position)
+    return index
+
+
+def _completeness(client: UniFiClient) -> int:
+    """Count non-empty fields (declared and extra)."""
+    values = list(client.__dict__.values()) + list((client.model_extra or {}).values())
+    return sum(value not in (None, "") for value in values)
+
+
+def _ranking(
+    precedence: DedupPrecedence, last_seen_field: str
+) -> Callable[[tuple[int, UniFiClient]], Any]:
+    """Build a sort key over (position, client); the highest key wins."""
+    if precedence is DedupPrecedence.MOST_RECENT:
+
+        def key(item: tuple[int, UniFiClient]) -> Any:
+            last_seen = (item[1].model_extra or {}).get(last_seen_field)
+            return (last_seen is not None, last_seen or 0, item[0])
+
+        return key
+    if precedence is DedupPrecedence.MOST_COMPLETE:
+        return lambda item: (_completeness(item[1]), item[0])
+    if precedence is DedupPrecedence.FIRST:
+        return lambda item: -item[0]
+    return lambda item: item[0]
+
+
+def dedup_clients(
+    clients: Iterable[UniFiClient],
+    precedence: DedupPrecedence = DedupPrecedence.MOST_RECENT,
+    last_seen_field: str = DEFAULT_LAST_SEEN_FIELD,
+) -> tuple[list[UniFiClient], DedupReport]:
+    """Merge clients that share a canonical MAC address.
+
+    Args:
+        clients: UniFi clients (e.g. from read_clients/stream_clients)
+        precedence: Which duplicate wins each MAC group
+        last_seen_field: Extra API field holding the last-seen timestamp
+            (epoch or ISO 8601; used by most_recent)
+
+    Returns:
+        (merged clients in order of first appearance, dedup report). Every
+        merged or unduplicated client carries its canonical MAC and is
+        otherwise returned as-is. Clients without a valid MAC are returned
+        unchanged.
+
+    Raises:
+        TypeError: If last-seen values of one group are not comparable
+    """
+    clients = list(clients)
+    index = build_mac_index(clients)
+    # First position of each group → its MAC; later positions are merged in
+    group_starts = {positions[0]: mac for mac, positions in index.items()}
+    indexed = {position for positions in index.values() for position in positions}
+    key = _ranking(precedence, last_seen_field)
+    merged: list[UniFiClient] = []
+    merged_groups: dict[str, int] = {}
+    unindexed_count = 0
+    for position, client in enumerate(clients):
+        if position not in indexed:
+            merged.append(client)
+            unindexed_count += 1
+            continue
+        mac = group_starts.get(position)
+        if mac is None:
+            continue
+        positions = index[mac]
+        if len(positions) == 1:
+            merged.append(
+                client if client.mac == mac else client.model_copy(update={"mac": mac})
+            )
+            continue
+
+        ranked = sorted(((p, clients[p]) for p in positions), key=key, reverse=True)
+        winner = ranked[0][1]
+        update: dict[str, Any] = {"mac": mac}
+        for field in _MERGED_FIELDS:
+            if getattr(winner, field) is None:
+                update[field] = next(
+                    (
+                        value
+                        for _, other in ranked[1:]
+                        if (value := getattr(other, field)) is not None
+                    ),
+                    None,
+                )
+        merged.append(winner.model_copy(update=update))
+        merged_groups[mac] = len(positions)
+
+    report = DedupReport(
+        input_count=len(clients),
+        unique_count=len(merged),
+        merged_groups=merged_groups,
+        unindexed_count=unindexed_count,
+    )
+    return merged, report
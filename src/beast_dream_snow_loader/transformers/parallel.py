@@ -0,0 +1,159 @@
+"""Process-parallel UniFi → ServiceNow transformation for large fleets.
+
+Validation and transformation are CPU-bound, so large inputs are chunked
+across a process pool. Workers receive raw JSON bytes (a JSON array per chunk)
+instead of pickled models and return serialized ServiceNow payloads (JSON
+bytes, as ``model_dump(exclude_none=True)`` would produce). Output order always
+matches input order.
+"""
+
+import json
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+from beast_dream_snow_loader.models.compact import CompactRecord
+from beast_dream_snow_loader.models.unifi import (
+    UniFiClient,
+    UniFiDevice,
+    UniFiHost,
+    UniFiSite,
+)
+from beast_dream_snow_loader.transformers.unifi_to_snow import (
+    transform_clients,
+    transform_devices,
+    transform_hosts,
+    transform_sites,
+)
+
+DEFAULT_CHUNK_SIZE = 5_000
+
+# Entity → (source list adapter, batch transform)
+_ENTITIES: dict[str, tuple[TypeAdapter, Callable[..., list]]] = {
+    "host": (TypeAdapter(list[UniFiHost]), transform_hosts),
+    "site": (TypeAdapter(list[UniFiSite]), transform_sites),
+    "device": (TypeAdapter(list[UniFiDevice]), transform_devices),
+    "client": (TypeAdapter(list[UniFiClient]), transform_clients),
+}
+
+_ANY_LIST = TypeAdapter(list[Any])
+
+
+def transform_json_chunk(
+    chunk: bytes, entity: str = "client", trusted: bool = False
+) -> bytes:
+    """Validate and transform one raw JSON array chunk (worker entry point).
+
+    Args:
+        chunk: JSON array of UniFi records
+        entity: host, site, device or client
+        trusted: Build compact records, validating only sampled records
+
+    Returns:
+        JSON array of ServiceNow payloads (None fields excluded)
+    """
+    adapter, transform = _ENTITIES[entity]
+    records = transform(adapter.validate_json(chunk), trusted=trusted)
+    return _ANY_LIST.dump_json(
+        [
+            (
+                record.to_payload()
+                if isinstance(record, CompactRecord)
+                else record.model_dump(exclude_none=True)
+            )
+            for record in records
+        ]
+    )
+
+
+def iter_transformed_chunks(
+    chunks: Iterable[bytes],
+    entity: str = "client",
+    workers: int | None = None,
+    trusted: bool = False,
+) -> Iterator[bytes]:
+    """Transform raw JSON array chunks across a process pool, in order.
+
+    At most ``2 * workers`` chunks are in flight, so memory stays bounded for
+    arbitrarily long inputs. With one worker, chunks are transformed inline.
+
+    Args:
+        chunks: JSON array chunks of UniFi records
+        entity: host, site, device or client
+        workers: Worker processes (default: CPU count)
+        trusted: Skip outbound validation except on sampled records
+
+    Yields:
+        JSON array of ServiceNow payloads per input chunk, in input order
+    """
+    if entity not in _ENTITIES:
+        raise ValueError(f"Unknown entity: {entity}")
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for chunk in chunks:
+            yield transform_json_chunk(chunk, entity, trusted)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[bytes]] = deque()
+        for chunk in chunks:
+            pending.append(
+                executor.submit(transform_json_chunk, chunk, entity, trusted)
+            )
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def chunk_records_as_json(
+    records: Iterable[BaseModel | dict], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Serialize records (models or dicts) into JSON array chunks."""
+    iterator = iter(records)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield _ANY_LIST.dump_json(chunk)
+
+
+def transform_parallel(
+    records: Iterable[BaseModel | dict],
+    entity: str = "client",
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    trusted: bool = False,
+) -> list[dict]:
+    """Transform UniFi records to ServiceNow payloads across a process pool.
+
+    Args:
+        records: UniFi models or raw API dicts
+        entity: host, site, device or client
+        workers: Worker processes (default: CPU count)
+        chunk_size: Records per worker task
+        trusted: Skip outbound validation except on sampled records
+
+    Returns:
+        ServiceNow payload dicts in input order. Rebuild models cheaply with
+        e.g. ``ServiceNowEndpoint.model_construct(**payload)`` if needed.
+    """
+    payloads: list[dict] = []
+    for result in iter_transformed_chunks(
+        chunk_records_as_json(records, chunk_size), entity, workers, trusted
+    ):
+        payloads.extend(json.loads(result))
+    return payloads
+
+
+def transform_clients_parallel(
+    clients: Iterable[UniFiClient | dict],
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    trusted: bool = False,
+) -> list[dict]:
+    """Transform UniFi clients to ServiceNow endpoint payloads in parallel."""
+    return transform_parallel(clients, "client", workers, chunk_size, trusted)
@@ -1,6 +1,10 @@
 """Schema mapping configuration for UniFi → ServiceNow transformation."""
 
 from collections.abc import Callable
+from functools import lru_cache
+
+# Leaf types returned as-is by field extraction (others are str()-ed)
+_SCALAR_TYPES = (str, int, float, bool)
 
 
 class FieldMappingConfig:
@@ -76,9 +80,12 @@ class FieldMappingConfig:
         return dict(self._client_mappings)
 
 
+@lru_cache(maxsize=4096)
 def flatten_nested_field(field_path: str) -> str:
     """Flatten nested field path to ServiceNow-compatible field name.
 
+    Results are memoized - the same paths are flattened for every record.
+
     Examples:
         "reportedState.hostname" → "hostname"
         "reportedState.hardware.mac" → "hardware_mac_address"
@@ -164,4 +171,41 @@ def _get_nested_value(data: dict, path: str) -> str | None:
             current = current[part]
         else:
             return None
-    return current if isinstance(current, (str, int, float, bool)) else str(current)
+    return current if isinstance(current, _SCALAR_TYPES) else str(current)
+
+
+def compile_field_mapping(mappings: dict[str, str]) -> Callable[[dict], dict]:
+    """Compile field mappings into a single extractor function.
+
+    Produces the same output as ``apply_field_mapping(source_data, mappings)``
+    but dotted paths are split once at compile time, so the per-record cost is
+    only the dict walks. Compile once per batch and reuse the extractor for
+    every record.
+
+    Args:
+        mappings: Field mappings (source → target)
+
+    Returns:
+        Function mapping a source data dictionary to mapped field names
+    """
+    compiled = tuple(
+        (target_field, tuple(source_path.split(".")))
+        for source_path, target_field in mappings.items()
+    )
+
+    def extract(source_data: dict) -> dict:
+        result = {}
+        for target_field, parts in compiled:
+            current = source_data
+            for part in parts:
+                if isinstance(current, dict) and part in current:
+                    current = current[part]
+                else:
+                    break
+            else:
+                result[target_field] = (
+                    current if isinstance(current, _SCALAR_TYPES) else str(current)
+                )
+        return result
+
+    return extract
@@ -0,0 +1,162 @@
+"""Topology index for device and client relationship enrichment.
+
+UniFi devices carry no ``siteId`` and clients often carry no ``deviceId``, so
+the loader's Device → Location and Endpoint → Device relationships were never
+created. ``TopologyIndex`` is built in one pass over hosts, sites and devices
+and then answers parent lookups in O(1):
+
+    host → sites (from each site's hostId)
+    uplink MAC → device (device ``mac``) or gateway host (host hardware MAC)
+
+Enriched models carry the parent IDs (device ``siteId``, client ``deviceId``
+and missing client ``siteId``) as source IDs, which the transformers pass on
+as ``site_id``/``device_id`` for Phase 2 of the loader.
+"""
+
+from collections.abc import Iterable, Sequence
+
+from beast_dream_snow_loader.models.unifi import (
+    UniFiClient,
+    UniFiDevice,
+    UniFiHost,
+    UniFiSite,
+)
+from beast_dream_snow_loader.transformers.columnar import normalize_macs
+
+# Client API fields naming the MAC of the device the client is connected to
+DEFAULT_UPLINK_MAC_FIELDS = ("uplinkMac", "uplink_mac", "apMac", "ap_mac", "swMac")
+
+# Site name UniFi gives a host's first site (used when a host has several)
+DEFAULT_SITE_NAME = "default"
+
+
+def _extra(model: UniFiDevice | UniFiClient, field: str) -> str | None:
+    """Get an extra API field of a model (None if missing)."""
+    return (model.model_extra or {}).get(field)
+
+
+class TopologyIndex:
+    """In-memory host/site/device topology for O(1) parent lookups."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        # Host ID → site IDs (input order); default site per host
+        self.host_sites: dict[str, list[str]] = {}
+        self.host_default_site: dict[str, str] = {}
+        # Canonical MAC → (device source ID, host ID) / gateway host ID
+        self.device_by_mac: dict[str, tuple[str, str]] = {}
+        self.gateway_by_mac: dict[str, str] = {}
+
+    @classmethod
+    def build(
+        cls,
+        hosts: Iterable[UniFiHost] = (),
+        sites: Iterable[UniFiSite] = (),
+        devices: Iterable[UniFiDevice] = (),
+    ) -> "TopologyIndex":
+        """Build the index in one pass over each input.
+
+        Args:
+            hosts: UniFi hosts (their hardware MACs identify gateway uplinks)
+            sites: UniFi sites
+            devices: UniFi devices (their ``mac`` identifies device uplinks)
+
+        Returns:
+            Populated topology index
+        """
+        index = cls()
+        hosts = list(hosts)
+        host_macs = normalize_macs(
+            [
+                (h.reportedState.model_extra or {}).get("hardware", {}).get("mac", "")
+                for h in hosts
+            ]
+        )
+        for host, mac in zip(hosts, host_macs, strict=True):
+            index.host_sites.setdefault(host.id, [])
+            if mac:
+                index.gateway_by_mac[mac] = host.id
+
+        for site in sites:
+            index.host_sites.setdefault(site.hostId, []).append(site.siteId)
+            if site.meta.name == DEFAULT_SITE_NAME:
+                index.host_default_site[site.hostId] = site.siteId
+
+        devices = list(devices)
+        device_macs = normalize_macs([_extra(d, "mac") or "" for d in devices])
+        for device, mac in zip(devices, device_macs, strict=True):
+            if mac:
+                # Device source ID is hostId (default device field mapping)
+                index.device_by_mac[mac] = (device.hostId, device.hostId)
+        return index
+
+    def site_for_host(self, host_id: str) -> str | None:
+        """Get a host's site: its only site, else its default site."""
+        sites = self.host_sites.get(host_id)
+        if not sites:
+            return None
+        if len(sites) == 1:
+            return sites[0]
+        return self.host_default_site.get(host_id)
+
+    def site_for_device(self, device: UniFiDevice) -> str | None:
+        """Get a device's site (explicit ``siteId`` wins over its host's site)."""
+        return _extra(device, "siteId") or self.site_for_host(device.hostId)
+
+    def resolve_uplink(self, uplink_mac: str) -> tuple[str | None, str | None]:
+        """Resolve a canonical uplink MAC to (device source ID, host ID)."""
+        device = self.device_by_mac.get(uplink_mac)
+        if device is not None:
+            return device
+        return None, self.gateway_by_mac.get(uplink_mac)
+
+    def enrich_devices(self, devices: Iterable[UniFiDevice]) -> list[UniFiDevice]:
+        """Set ``siteId`` on devices that lack one (when resolvable).
+
+        Returns:
+            Devices in input order (unchanged devices are returned as-is)
+        """
+        enriched = []
+        for device in devices:
+            site_id = (
+                None if _extra(device, "siteId") else self.site_for_host(device.hostId)
+            )
+            enriched.append(
+                device.model_copy(update={"siteId": site_id}) if site_id else device
+            )
+        return enriched
+
+    def enrich_clients(
+        self,
+        clients: Iterable[UniFiClient],
+        uplink_mac_fields: Sequence[str] = DEFAULT_UPLINK_MAC_FIELDS,
+    ) -> list[UniFiClient]:
+        """Set ``deviceId`` (and missing ``siteId``) from each client's uplink MAC.
+
+        Args:
+            clients: UniFi clients
+            uplink_mac_fields: Extra API fields to read the uplink MAC from
+                (first present wins)
+
+        Returns:
+            Clients in input order (unchanged clients are returned as-is)
+        """
+        clients = list(clients)
+        uplinks = normalize_macs(
+            [
+                next((mac for f in uplink_mac_fields if (mac := _extra(c, f))), "")
+                for c in clients
+            ]
+        )
+        enriched = []
+        for client, uplink_mac in zip(clients, uplinks, strict=True):
+            device_id, host_id = self.resolve_uplink(uplink_mac)
+            update: dict[str, str] = {}
+            if device_id and client.deviceId is None:
+                update["deviceId"] = device_id
+            if host_id and client.siteId is None:
+                site_id = self.site_for_host(host_id)
+                if site_id:
+                    update["siteId"] = site_id
+            enriched.append(client.model_copy(update=update) if update else client)
+        return enriched
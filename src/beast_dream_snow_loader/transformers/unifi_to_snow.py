@@ -1,5 +1,34 @@
-"""UniFi to ServiceNow transformation functions."""
-
+"""UniFi to ServiceNow transformation functions.
+
+Per-record functions (``transform_host`` etc.) are convenient for single
+records. For bulk loads use the batch variants (``transform_hosts`` etc.),
+which compile the field mappings once and dump each source model once,
+reusing that dump for both field extraction and the raw-data snapshot. When
+the source model carries its original JSON bytes (``keep_raw`` at ingestion),
+those are passed through as u_unifi_raw_data instead.
+
+Batch variants also offer a trusted mode for input that was already validated
+into UniFi models: it returns compact records (``models.compact``) built
+straight from the mapped fields, fully validating only a sample of records.
+The loader accepts compact records wherever it accepts ServiceNow models.
+"""
+
+from collections.abc import Callable, Iterable
+from functools import partial
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from beast_dream_snow_loader.models.compact import (
+    _COMPACT_TYPES,
+    CompactEndpoint,
+    CompactGatewayCI,
+    CompactLocation,
+    CompactNetworkDeviceCI,
+    CompactRecord,
+    InternTable,
+)
+from beast_dream_snow_loader.models.raw import get_raw_json
 from beast_dream_snow_loader.models.servicenow import (
     ServiceNowEndpoint,
     ServiceNowGatewayCI,
@@ -12,11 +41,44 @@ from beast_dream_snow_loader.models.unifi import (
     UniFiHost,
     UniFiSite,
 )
+from beast_dream_snow_loader.transformers.columnar import normalize_macs
 from beast_dream_snow_loader.transformers.schema_mapper import (
     FieldMappingConfig,
     apply_field_mapping,
+    compile_field_mapping,
 )
 
+# Trusted mode: fully validate one record in this many (schema drift check)
+DEFAULT_VALIDATE_EVERY = 100
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _build_models(
+    model: type[ModelT],
+    records: Iterable[dict],
+    trusted: bool,
+    validate_every: int,
+) -> list[ModelT] | list[CompactRecord]:
+    """Build outbound models, or (trusted) compact records checked by sampling.
+
+    Trusted mode skips validation for input that was already validated into
+    UniFi models and returns compact records sharing one intern table, which
+    are much cheaper to build than Pydantic models. Every
+    ``validate_every``-th record, starting with the first, is still fully
+    validated to catch schema drift (0 disables sampling).
+    """
+    if not trusted:
+        return [model.model_validate(data) for data in records]
+    compact = _COMPACT_TYPES[model]
+    interns = InternTable()
+    built: list[CompactRecord] = []
+    for index, data in enumerate(records):
+        if validate_every > 0 and index % validate_every == 0:
+            model.model_validate(data)
+        built.append(compact.from_payload(data, interns))
+    return built
+
 
 def transform_host(unifi_host: UniFiHost) -> ServiceNowGatewayCI:
     """Transform UniFi host to ServiceNow gateway CI.
@@ -27,14 +89,45 @@ def transform_host(unifi_host: UniFiHost) -> ServiceNowGatewayCI:
     Returns:
         ServiceNow gateway CI model with flattened fields
     """
-    config = FieldMappingConfig()
-    mappings = config.get_host_mappings()
+    extract = partial(
+        apply_field_mapping, mappings=FieldMappingConfig().get_host_mappings()
+    )
+    return ServiceNowGatewayCI(
+        **_gateway_ci_data(unifi_host, unifi_host.model_dump(), extract)
+    )
+
 
-    # Convert Pydantic model to dict for mapping (includes nested structures)
-    host_dict = unifi_host.model_dump()
+def transform_hosts(
+    unifi_hosts: Iterable[UniFiHost],
+    trusted: bool = False,
+    validate_every: int = DEFAULT_VALIDATE_EVERY,
+) -> list[ServiceNowGatewayCI] | list[CompactGatewayCI]:
+    """Transform UniFi hosts to ServiceNow gateway CIs in bulk.
 
+    Args:
+        unifi_hosts: UniFi host data models
+        trusted: Return compact records, validating only sampled records
+        validate_every: In trusted mode, fully validate every Nth record
+
+    Returns:
+        ServiceNow gateway CI models (compact records if trusted), in input order
+
+    Raises:
+        pydantic.ValidationError: If a (sampled) record fails validation
+    """
+    extract = compile_field_mapping(FieldMappingConfig().get_host_mappings())
+    records = (
+        _gateway_ci_data(host, host.model_dump(), extract) for host in unifi_hosts
+    )
+    return _build_models(ServiceNowGatewayCI, records, trusted, validate_every)
+
+
+def _gateway_ci_data(
+    unifi_host: UniFiHost, host_dict: dict, extract: Callable[[dict], dict]
+) -> dict:
+    """Build gateway CI field data from a host and its (single) model dump."""
     # Apply field mappings (handles nested field extraction)
-    mapped_data = apply_field_mapping(host_dict, mappings)
+    mapped_data = extract(host_dict)
 
     # Ensure required fields are present (fallbacks)
     if "u_unifi_source_id" not in mapped_data:
@@ -47,23 +140,24 @@ def transform_host(unifi_host: UniFiHost) -> ServiceNowGatewayCI:
         mapped_data["name"] = unifi_host.reportedState.name
 
     # Handle deeply nested hardware fields
-    if unifi_host.reportedState and hasattr(unifi_host.reportedState, "model_dump"):
-        reported_state = unifi_host.reportedState.model_dump()
-        if "hardware" in reported_state and isinstance(
-            reported_state["hardware"], dict
-        ):
-            hardware = reported_state["hardware"]
-            if "mac" in hardware and "mac_address" not in mapped_data:
-                mapped_data["mac_address"] = hardware["mac"]
-            if "serialno" in hardware and "serial_number" not in mapped_data:
-                mapped_data["serial_number"] = hardware["serialno"]
-
-    # Preserve raw source data for audit/reconciliation
+    reported_state = host_dict.get("reportedState")
+    if isinstance(reported_state, dict) and isinstance(
+        reported_state.get("hardware"), dict
+    ):
+        hardware = reported_state["hardware"]
+        if "mac" in hardware and "mac_address" not in mapped_data:
+            mapped_data["mac_address"] = hardware["mac"]
+        if "serialno" in hardware and "serial_number" not in mapped_data:
+            mapped_data["serial_number"] = hardware["serialno"]
+
+    # Preserve raw source data for audit/reconciliation (original bytes if kept)
     if "u_unifi_raw_data" not in mapped_data:
-        mapped_data["u_unifi_raw_data"] = unifi_host.model_dump()
+        raw_json = get_raw_json(unifi_host)
+        mapped_data["u_unifi_raw_data"] = (
+            raw_json if raw_json is not None else host_dict
+        )
 
-    # Validate and return ServiceNow model
-    return ServiceNowGatewayCI(**mapped_data)
+    return mapped_data
 
 
 def transform_site(unifi_site: UniFiSite) -> ServiceNowLocation:
@@ -75,14 +169,43 @@ def transform_site(unifi_site: UniFiSite) -> ServiceNowLocation:
     Returns:
         ServiceNow location model with flattened fields
     """
-    config = FieldMappingConfig()
-    mappings = config.get_site_mappings()
+    extract = partial(
+        apply_field_mapping, mappings=FieldMappingConfig().get_site_mappings()
+    )
+    return ServiceNowLocation(
+        **_location_data(unifi_site, unifi_site.model_dump(), extract)
+    )
+
+
+def transform_sites(
+    unifi_sites: Iterable[UniFiSite],
+    trusted: bool = False,
+    validate_every: int = DEFAULT_VALIDATE_EVERY,
+) -> list[ServiceNowLocation] | list[CompactLocation]:
+    """Transform UniFi sites to ServiceNow locations in bulk.
+
+    Args:
+        unifi_sites: UniFi site data models
+        trusted: Return compact records, validating only sampled records
+        validate_every: In trusted mode, fully validate every Nth record
+
+    Returns:
+        ServiceNow location models (compact records if trusted), in input order
+
+    Raises:
+        pydantic.ValidationError: If a (sampled) record fails validation
+    """
+    extract = compile_field_mapping(FieldMappingConfig().get_site_mappings())
+    records = (_location_data(site, site.model_dump(), extract) for site in unifi_sites)
+    return _build_models(ServiceNowLocation, records, trusted, validate_every)
 
-    # Convert Pydantic model to dict for mapping (includes nested structures)
-    site_dict = unifi_site.model_dump()
 
+def _location_data(
+    unifi_site: UniFiSite, site_dict: dict, extract: Callable[[dict], dict]
+) -> dict:
+    """Build location field data from a site and its (single) model dump."""
     # Apply field mappings (handles nested field extraction)
-    mapped_data = apply_field_mapping(site_dict, mappings)
+    mapped_data = extract(site_dict)
 
     # Ensure required fields are present (fallbacks)
     if "u_unifi_source_id" not in mapped_data:
@@ -99,12 +222,14 @@ def transform_site(unifi_site: UniFiSite) -> ServiceNowLocation:
     if unifi_site.hostId:
         mapped_data["host_id"] = unifi_site.hostId
 
-    # Preserve raw source data for audit/reconciliation
+    # Preserve raw source data for audit/reconciliation (original bytes if kept)
     if "u_unifi_raw_data" not in mapped_data:
-        mapped_data["u_unifi_raw_data"] = unifi_site.model_dump()
+        raw_json = get_raw_json(unifi_site)
+        mapped_data["u_unifi_raw_data"] = (
+            raw_json if raw_json is not None else site_dict
+        )
 
-    # Validate and return ServiceNow model
-    return ServiceNowLocation(**mapped_data)
+    return mapped_data
 
 
 def transform_device(unifi_device: UniFiDevice) -> ServiceNowNetworkDeviceCI:
@@ -116,14 +241,46 @@ def transform_device(unifi_device: UniFiDevice) -> ServiceNowNetworkDeviceCI:
     Returns:
         ServiceNow network device CI model
     """
-    config = FieldMappingConfig()
-    mappings = config.get_device_mappings()
+    extract = partial(
+        apply_field_mapping, mappings=FieldMappingConfig().get_device_mappings()
+    )
+    return ServiceNowNetworkDeviceCI(
+        **_network_device_ci_data(unifi_device, unifi_device.model_dump(), extract)
+    )
 
-    # Convert Pydantic model to dict for mapping
-    device_dict = unifi_device.model_dump()
 
+def transform_devices(
+    unifi_devices: Iterable[UniFiDevice],
+    trusted: bool = False,
+    validate_every: int = DEFAULT_VALIDATE_EVERY,
+) -> list[ServiceNowNetworkDeviceCI] | list[CompactNetworkDeviceCI]:
+    """Transform UniFi devices to ServiceNow network device CIs in bulk.
+
+    Args:
+        unifi_devices: UniFi device data models
+        trusted: Return compact records, validating only sampled records
+        validate_every: In trusted mode, fully validate every Nth record
+
+    Returns:
+        ServiceNow network device CI models (compact records if trusted), in input order
+
+    Raises:
+        pydantic.ValidationError: If a (sampled) record fails validation
+    """
+    extract = compile_field_mapping(FieldMappingConfig().get_device_mappings())
+    records = (
+        _network_device_ci_data(device, device.model_dump(), extract)
+        for device in unifi_devices
+    )
+    return _build_models(ServiceNowNetworkDeviceCI, records, trusted, validate_every)
+
+
+def _network_device_ci_data(
+    unifi_device: UniFiDevice, device_dict: dict, extract: Callable[[dict], dict]
+) -> dict:
+    """Build network device CI field data from a device and its (single) model dump."""
     # Apply field mappings
-    mapped_data = apply_field_mapping(device_dict, mappings)
+    mapped_data = extract(device_dict)
 
     # Ensure required fields are present
     if "u_unifi_source_id" not in mapped_data:
@@ -132,7 +289,6 @@ def transform_device(unifi_device: UniFiDevice) -> ServiceNowNetworkDeviceCI:
         mapped_data["name"] = unifi_device.hostId  # Fallback to hostId if no name
     if "mac_address" not in mapped_data:
         # Try to get from extra fields or use fallback
-        device_dict = unifi_device.model_dump()
         if "mac" in device_dict:
             mapped_data["mac_address"] = device_dict["mac"]
         else:
@@ -143,38 +299,92 @@ def transform_device(unifi_device: UniFiDevice) -> ServiceNowNetworkDeviceCI:
     # host_id and site_id are source IDs - loader will map to sys_ids
     if unifi_device.hostId:
         mapped_data["host_id"] = unifi_device.hostId
-    # Note: UniFiDevice doesn't have siteId - would need to be passed separately or derived
+    # UniFiDevice has no siteId field - set as an extra by TopologyIndex enrichment
+    site_id = device_dict.get("siteId")
+    if site_id:
+        mapped_data["site_id"] = site_id
 
-    # Preserve raw source data for audit/reconciliation
+    # Preserve raw source data for audit/reconciliation (original bytes if kept)
     if "u_unifi_raw_data" not in mapped_data:
-        mapped_data["u_unifi_raw_data"] = unifi_device.model_dump()
+        raw_json = get_raw_json(unifi_device)
+        mapped_data["u_unifi_raw_data"] = (
+            raw_json if raw_json is not None else device_dict
+        )
 
-    # Validate and return ServiceNow model
-    return ServiceNowNetworkDeviceCI(**mapped_data)
+    return mapped_data
 
 
-def transform_client(unifi_client: UniFiClient) -> ServiceNowEndpoint:
+def transform_client(
+    unifi_client: UniFiClient, canonical_source_ids: bool = False
+) -> ServiceNowEndpoint:
     """Transform UniFi client to ServiceNow endpoint.
 
     Args:
         unifi_client: UniFi client data model
+        canonical_source_ids: Fall back to the canonical MAC, not the MAC as
+            received, when hostname is empty (re-keys existing CIs, see
+            transformers.columnar)
 
     Returns:
         ServiceNow endpoint model
     """
-    config = FieldMappingConfig()
-    mappings = config.get_client_mappings()
+    extract = partial(
+        apply_field_mapping, mappings=FieldMappingConfig().get_client_mappings()
+    )
+    return ServiceNowEndpoint(
+        **_endpoint_data(
+            unifi_client, unifi_client.model_dump(), extract, canonical_source_ids
+        )
+    )
+
+
+def transform_clients(
+    unifi_clients: Iterable[UniFiClient],
+    trusted: bool = False,
+    validate_every: int = DEFAULT_VALIDATE_EVERY,
+    canonical_source_ids: bool = False,
+) -> list[ServiceNowEndpoint] | list[CompactEndpoint]:
+    """Transform UniFi clients to ServiceNow endpoints in bulk.
 
-    # Convert Pydantic model to dict for mapping
-    client_dict = unifi_client.model_dump()
+    Args:
+        unifi_clients: UniFi client data models
+        trusted: Return compact records, validating only sampled records
+        validate_every: In trusted mode, fully validate every Nth record
+        canonical_source_ids: Fall back to the canonical MAC, not the MAC as
+            received, when hostname is empty (re-keys existing CIs)
+
+    Returns:
+        ServiceNow endpoint models (compact records if trusted), in input order
 
+    Raises:
+        pydantic.ValidationError: If a (sampled) record fails validation
+    """
+    extract = compile_field_mapping(FieldMappingConfig().get_client_mappings())
+    records = (
+        _endpoint_data(client, client.model_dump(), extract, canonical_source_ids)
+        for client in unifi_clients
+    )
+    return _build_models(ServiceNowEndpoint, records, trusted, validate_every)
+
+
+def _endpoint_data(
+    unifi_client: UniFiClient,
+    client_dict: dict,
+    extract: Callable[[dict], dict],
+    canonical_source_ids: bool = False,
+) -> dict:
+    """Build endpoint field data from a client and its (single) model dump."""
     # Apply field mappings
-    mapped_data = apply_field_mapping(client_dict, mappings)
+    mapped_data = extract(client_dict)
 
     # Ensure required fields are present
     if "u_unifi_source_id" not in mapped_data:
-        # Generate source ID from hostname or MAC if needed
-        mapped_data["u_unifi_source_id"] = unifi_client.hostname or unifi_client.mac
+        # Generate source ID from hostname or MAC (as the columnar engine
+        # does, so both paths give a client the same identity)
+        mac = unifi_client.mac
+        if canonical_source_ids:
+            mac = normalize_macs([mac])[0]
+        mapped_data["u_unifi_source_id"] = unifi_client.hostname or mac
     if "hostname" not in mapped_data:
         mapped_data["hostname"] = unifi_client.hostname
     if "ip_address" not in mapped_data:
@@ -186,11 +396,15 @@ def transform_client(unifi_client: UniFiClient) -> ServiceNowEndpoint:
     # site_id is the source ID (UniFi siteId) - loader will map to sys_id
     if unifi_client.siteId:
         mapped_data["site_id"] = unifi_client.siteId
-    # Note: UniFiClient doesn't have deviceId - would need to be passed separately or derived
+    # deviceId is often missing from the API - TopologyIndex enrichment derives it
+    if unifi_client.deviceId:
+        mapped_data["device_id"] = unifi_client.deviceId
 
-    # Preserve raw source data for audit/reconciliation
+    # Preserve raw source data for audit/reconciliation (original bytes if kept)
     if "u_unifi_raw_data" not in mapped_data:
-        mapped_data["u_unifi_raw_data"] = unifi_client.model_dump()
+        raw_json = get_raw_json(unifi_client)
+        mapped_data["u_unifi_raw_data"] = (
+            raw_json if raw_json is not None else client_dict
+        )
 
-    # Validate and return ServiceNow model
-    return ServiceNowEndpoint(**mapped_data)
+    return mapped_data
@@ -0,0 +1 @@
+"""UniFi source data modules for beast-dream-snow-loader."""
@@ -0,0 +1,301 @@
+"""Concurrent UniFi Site Manager API fetcher.
+
+Pulls hosts, sites, devices and clients concurrently (one worker per entity,
+pages fetched in sequence via ``nextToken``) over one pooled HTTP adapter,
+and yields validated UniFi models as pages arrive. ``requests.Session`` is
+not thread-safe, so each worker thread gets its own session mounting the
+shared adapter (connections are still reused across workers).
+
+Rate limits: 429 and 5xx responses are retried, waiting for ``Retry-After``
+when the API sends it and with exponential backoff otherwise.
+
+See unifi.stub_server for a local stand-in API used by tests and benchmarks.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+import requests  # type: ignore
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from requests.adapters import HTTPAdapter  # type: ignore
+
+from beast_dream_snow_loader.models.unifi import (
+    UniFiClient,
+    UniFiDevice,
+    UniFiHost,
+    UniFiSite,
+)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+DEFAULT_BASE_URL = "https://api.ui.com"
+DEFAULT_PAGE_SIZE = 200
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Entity → API path. Clients are not part of the public Site Manager
+# API; point "client" at whichever endpoint serves them (e.g. via paths=...).
+ENTITY_PATHS: dict[str, str] = {
+    "host": "/v1/hosts",
+    "site": "/v1/sites",
+    "device": "/v1/devices",
+    "client": "/v1/clients",
+}
+_ENTITY_MODELS: dict[str, type[BaseModel]] = {
+    "host": UniFiHost,
+    "site": UniFiSite,
+    "device": UniFiDevice,
+    "client": UniFiClient,
+}
+
+
+class _Page(BaseModel, Generic[ModelT]):
+    """One Site Manager API response page."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    data: list[ModelT]
+    nextToken: str | None = None
+
+
+_PAGE_ADAPTERS: dict[str, TypeAdapter] = {
+    entity: TypeAdapter(_Page[model]) for entity, model in _ENTITY_MODELS.items()
+}
+
+
+@dataclass
+class FetchResult:
+    """All entities fetched in one run."""
+
+    hosts: list[UniFiHost] = field(default_factory=list)
+    sites: list[UniFiSite] = field(default_factory=list)
+    devices: list[UniFiDevice] = field(default_factory=list)
+    clients: list[UniFiClient] = field(default_factory=list)
+
+
+class SiteManagerFetcher:
+    """Fetches UniFi inventory from the Site Manager API."""
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str = DEFAULT_BASE_URL,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_workers: int = 4,
+        max_retries: int = 5,
+        backoff_seconds: float = 1.0,
+        timeout_seconds: float = 30.0,
+        paths: dict[str, str] | None = None,
+    ):
+        """Initialize fetcher.
+
+        Args:
+            api_key: Site Manager API key (default: UNIFI_API_KEY env var)
+            base_url: API base URL (e.g. a stub server's URL in tests)
+            page_size: Records per page (pageSize)
+            max_workers: Concurrent entity fetches (and pooled connections)
+            max_retries: Retries per page on 429/5xx/connection errors
+            backoff_seconds: Base delay for exponential backoff
+            timeout_seconds: Per-request timeout
+            paths: Overrides of ENTITY_PATHS
+
+        Raises:
+            ValueError: If no API key is available
+        """
+        self.api_key = api_key or os.getenv("UNIFI_API_KEY", "")
+        if not self.api_key:
+            raise ValueError("UniFi Site Manager API key is required")
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+        self.paths = {**ENTITY_PATHS, **(paths or {})}
+
+        # Template session: headers and one pooled adapter (connection reuse).
+        # Worker threads send through their own clones (see _thread_session).
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {"X-API-KEY": self.api_key, "Accept": "application/json"}
+        )
+
+        self._lock = threading.Lock()
+        self.requests_made = 0
+        self.retries = 0
+        self._thread_local = threading.local()
+        self._thread_sessions: list[requests.Session] = []
+
+    def _thread_session(self) -> requests.Session:
+        """Get the session for the current thread.
+
+        Each thread gets its own session with the same headers and adapters
+        as ``self.session``. Non-Session replacements (e.g. test doubles) are
+        shared.
+        """
+        if not isinstance(self.session, requests.Session):
+            return self.session
+        session = getattr(self._thread_local, "session", None)
+        if session is None or self._thread_local.base is not self.session:
+            session = requests.Session()
+            session.headers.update(self.session.headers)
+            for prefix, adapter in self.session.adapters.items():
+                session.mount(prefix, adapter)
+            self._thread_local.session = session
+            self._thread_local.base = self.session
+            with self._lock:
+                self._thread_sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        """Close sessions and pooled connections."""
+        with self._lock:
+            sessions, self._thread_sessions = self._thread_sessions, []
+        for session in sessions:
+            session.close()
+        self.session.close()
+
+    def __enter__(self) -> "SiteManagerFetcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _get(self, url: str, params: dict[str, Any]) -> bytes:
+        """GET with retries on rate limits, server errors and connection errors."""
+        for attempt in range(self.max_retries + 1):
+            with self._lock:
+                self.requests_made += 1
+            try:
+                response = self._thread_session().get(
+                    url, params=params, timeout=self.timeout_seconds
+                )
+            except requests.exceptions.ConnectionError:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_seconds * 2**attempt
+            else:
+                if (
+                    response.status_code not in RETRYABLE_STATUS_CODES
+                    or attempt == self.max_retries
+                ):
+                    response.raise_for_status()
+                    return response.content
+                retry_after = _retry_after(response)
+                delay = (
+                    retry_after
+                    if retry_after is not None
+                    else self.backoff_seconds * 2**attempt
+                )
+            with self._lock:
+                self.retries += 1
+            time.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def iter_pages(self, entity: str) -> Iterator[list[BaseModel]]:
+        """Yield validated pages of one entity, following nextToken.
+
+        Raises:
+            KeyError: If the entity is unknown
+            requests.HTTPError: If a request fails after retries
+            pydantic.ValidationError: If a page fails validation
+        """
+        url = f"{self.base_url}{self.paths[entity]}"
+        adapter = _PAGE_ADAPTERS[entity]
+        params: dict[str, Any] = {"pageSize": self.page_size}
+        while True:
+            page = adapter.validate_json(self._get(url, params))
+            yield page.data
+            if not page.nextToken:
+                return
+            params = {"pageSize": self.page_size, "nextToken": page.nextToken}
+
+    def iter_entity(self, entity: str) -> Iterator[BaseModel]:
+        """Yield models of one entity (sequential pages)."""
+        for page in self.iter_pages(entity):
+            yield from page
+
+    def stream(
+        self, entities: tuple[str, ...] = ("host", "site", "device", "client")
+    ) -> Iterator[tuple[str, BaseModel]]:
+        """Fetch entities concurrently and yield (entity, model) as pages arrive.
+
+        Order is preserved within an entity, not across entities.
+
+        Raises:
+            requests.HTTPError: If a request fails after retries (the first
+                worker error is raised once the queue drains)
+        """
+        pages: queue.Queue = queue.Queue(maxsize=self.max_workers * 4)
+        done = object()
+        stop = threading.Event()  # Set when the consumer stops early
+        errors: list[BaseException] = []
+
+        def put(item: object) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def worker(entity: str) -> None:
+            try:
+                for page in self.iter_pages(entity):
+                    if not put((entity, page)):
+                        return
+            except BaseException as e:  # Surfaced to the consumer
+                errors.append(e)
+            finally:
+                put(done)
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="unifi_fetch"
+        ) as executor:
+            for entity in entities:
+                executor.submit(worker, entity)
+            remaining = len(entities)
+            try:
+                while remaining:
+                    item = pages.get()
+                    if item is done:
+                        remaining -= 1
+                        continue
+                    entity, page = item
+                    for model in page:
+                        yield entity, model
+            finally:
+                stop.set()
+        if errors:
+            raise errors[0]
+
+    def fetch_all(self) -> FetchResult:
+        """Fetch all four entities concurrently into lists."""
+        result = FetchResult()
+        targets = {
+            "host": result.hosts,
+            "site": result.sites,
+            "device": result.devices,
+            "client": result.clients,
+        }
+        for entity, model in self.stream(tuple(targets)):
+            targets[entity].append(model)
+        return result
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    """Get the Retry-After delay in seconds (None if absent or not numeric)."""
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
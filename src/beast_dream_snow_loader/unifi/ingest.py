@@ -0,0 +1,172 @@
+"""Bulk validation of raw UniFi API JSON into models.
+
+Takes raw response bytes (or a JSON file path) and validates the whole array
+in one pass with ``TypeAdapter.validate_json`` - no intermediate Python dicts.
+Accepts a bare JSON array or the Site Manager API envelope
+(``{"data": [...], "httpStatusCode": 200, ...}``).
+
+With ``lean=True`` only the fields referenced by the active field mappings are
+kept per record (see models.lean), which cuts memory for whole-fleet loads.
+"""
+
+from functools import cached_property
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+from beast_dream_snow_loader.models.raw import attach_raw_json
+from beast_dream_snow_loader.models.unifi import (
+    UniFiClient,
+    UniFiDevice,
+    UniFiHost,
+    UniFiSite,
+)
+from beast_dream_snow_loader.unifi.streaming import iter_array_records, mapped_model
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+JSONSource = bytes | bytearray | str | Path
+
+
+class _Envelope(BaseModel, Generic[ModelT]):
+    """Site Manager API response envelope (only ``data`` is kept)."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    data: list[ModelT]
+
+
+class _Reader(Generic[ModelT]):
+    """Prebuilt list and envelope adapters for one UniFi model."""
+
+    def __init__(self, model: type[ModelT]):
+        self.model = model
+        self.list_adapter = TypeAdapter(list[model])
+        self.envelope_adapter = TypeAdapter(_Envelope[model])
+
+    @cached_property
+    def lean(self) -> "_Reader[ModelT]":
+        """Reader for the lean variant (built on first use)."""
+        return _Reader(mapped_model(self.model))
+
+    def read(
+        self, source: JSONSource, keep_raw: bool = False, lean: bool = False
+    ) -> list[ModelT]:
+        if lean:
+            return self.lean.read(source, keep_raw)
+        raw = _read_bytes(source)
+        if keep_raw:
+            # Per-record validation so each model keeps its original bytes
+            return [
+                attach_raw_json(self.model.model_validate_json(record), record)
+                for record in iter_array_records(raw)
+            ]
+        if _is_object(raw):
+            return self.envelope_adapter.validate_json(raw).data
+        return self.list_adapter.validate_json(raw)
+
+
+def _read_bytes(source: JSONSource) -> bytes | bytearray:
+    """Get raw JSON bytes; str and Path sources are file paths."""
+    if isinstance(source, str | Path):
+        return Path(source).read_bytes()
+    return source
+
+
+def _is_object(raw: bytes | bytearray) -> bool:
+    """Check whether the JSON document is an object (envelope) not an array."""
+    for byte in raw:
+        if byte not in b" \t\r\n":
+            return byte == ord("{")
+    return False
+
+
+_HOSTS = _Reader(UniFiHost)
+_SITES = _Reader(UniFiSite)
+_DEVICES = _Reader(UniFiDevice)
+_CLIENTS = _Reader(UniFiClient)
+
+
+def read_hosts(
+    source: JSONSource, keep_raw: bool = False, lean: bool = False
+) -> list[UniFiHost]:
+    """Validate UniFi hosts from raw JSON bytes or a JSON file path.
+
+    Args:
+        source: Response bytes, or path to a JSON file (str or Path)
+        keep_raw: Keep each record's original bytes for u_unifi_raw_data
+            passthrough (validates record by record instead of in one pass)
+        lean: Keep only fields referenced by the active field mappings
+
+    Returns:
+        Validated UniFi host models, ready for transform_hosts
+
+    Raises:
+        pydantic.ValidationError: If the JSON is malformed or fails validation
+        OSError: If a file path cannot be read
+    """
+    return _HOSTS.read(source, keep_raw, lean)
+
+
+def read_sites(
+    source: JSONSource, keep_raw: bool = False, lean: bool = False
+) -> list[UniFiSite]:
+    """Validate UniFi sites from raw JSON bytes or a JSON file path.
+
+    Args:
+        source: Response bytes, or path to a JSON file (str or Path)
+        keep_raw: Keep each record's original bytes for u_unifi_raw_data
+            passthrough (validates record by record instead of in one pass)
+        lean: Keep only fields referenced by the active field mappings
+
+    Returns:
+        Validated UniFi site models, ready for transform_sites
+
+    Raises:
+        pydantic.ValidationError: If the JSON is malformed or fails validation
+        OSError: If a file path cannot be read
+    """
+    return _SITES.read(source, keep_raw, lean)
+
+
+def read_devices(
+    source: JSONSource, keep_raw: bool = False, lean: bool = False
+) -> list[UniFiDevice]:
+    """Validate UniFi devices from raw JSON bytes or a JSON file path.
+
+    Args:
+        source: Response bytes, or path to a JSON file (str or Path)
+        keep_raw: Keep each record's original bytes for u_unifi_raw_data
+            passthrough (validates record by record instead of in one pass)
+        lean: Keep only fields referenced by the active field mappings
+
+    Returns:
+        Validated UniFi device models, ready for transform_devices
+
+    Raises:
+        pydantic.ValidationError: If the JSON is malformed or fails validation
+        OSError: If a file path cannot be read
+    """
+    return _DEVICES.read(source, keep_raw, lean)
+
+
+def read_clients(
+    source: JSONSource, keep_raw: bool = False, lean: bool = False
+) -> list[UniFiClient]:
+    """Validate UniFi clients from raw JSON bytes or a JSON file path.
+
+    Args:
+        source: Response bytes, or path to a JSON file (str or Path)
+        keep_raw: Keep each record's original bytes for u_unifi_raw_data
+            passthrough (validates record by record instead of in one pass)
+        lean: Keep only fields referenced by the active field mappings
+
+    Returns:
+        Validated UniFi client models, ready for transform_clients
+
+    Raises:
+        pydantic.ValidationError: If the JSON is malformed or fails validation
+        OSError: If a file path cannot be read
+    """
+    return _CLIENTS.read(source, keep_raw, lean)
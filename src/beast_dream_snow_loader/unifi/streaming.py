@@ -0,0 +1,229 @@
+"""Streaming ingestion of large UniFi export files in bounded memory.
+
+The file is memory-mapped and scanned incrementally; each record's bytes are
+sliced out and validated on its own with ``model_validate_json``, so memory use
+is bounded by one record (plus OS page cache) rather than the whole document.
+
+Supported formats:
+    - JSON array: ``[{...}, {...}]``
+    - Site Manager API envelope: ``{"data": [{...}, ...], ...}``
+    - NDJSON / JSON Lines: one record object per line (``.ndjson``/``.jsonl``)
+
+With ``lean=True`` records are validated into lean model variants that keep
+only the fields referenced by the active field mappings, plus the extra API
+fields read by topology enrichment and dedup (see models.lean).
+"""
+
+import mmap
+import re
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from beast_dream_snow_loader.models.lean import lean_model
+from beast_dream_snow_loader.models.raw import attach_raw_json
+from beast_dream_snow_loader.models.unifi import (
+    UniFiClient,
+    UniFiDevice,
+    UniFiHost,
+    UniFiSite,
+)
+from beast_dream_snow_loader.transformers.dedup import DEFAULT_LAST_SEEN_FIELD
+from beast_dream_snow_loader.transformers.schema_mapper import FieldMappingConfig
+from beast_dream_snow_loader.transformers.topology import DEFAULT_UPLINK_MAC_FIELDS
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+T = TypeVar("T")
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+# Structural tokens: whole strings (so brackets inside strings are skipped),
+# brackets and braces. Commas/colons/scalars are not needed to find records.
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]')
+_DATA_KEY = b'"data"'
+
+# Extra API fields read outside the field mappings, kept by lean models:
+# device site and MAC (TopologyIndex), client uplink MACs and last-seen time
+# (TopologyIndex.enrich_clients, dedup_clients)
+ENRICHMENT_PATHS: dict[type[BaseModel], tuple[str, ...]] = {
+    UniFiDevice: ("siteId", "mac"),
+    UniFiClient: (*DEFAULT_UPLINK_MAC_FIELDS, DEFAULT_LAST_SEEN_FIELD),
+}
+
+
+def mapped_model(model: type[ModelT]) -> type[ModelT]:
+    """Get the lean variant of a UniFi model for the active field mappings."""
+    config = FieldMappingConfig()
+    mappings = {
+        UniFiHost: config.get_host_mappings,
+        UniFiSite: config.get_site_mappings,
+        UniFiDevice: config.get_device_mappings,
+        UniFiClient: config.get_client_mappings,
+    }[model]()
+    return lean_model(model, [*mappings, *ENRICHMENT_PATHS.get(model, ())])
+
+
+def iter_array_records(buffer: bytes | mmap.mmap) -> Iterator[bytes]:
+    """Yield the raw bytes of each object in a JSON array (or envelope).
+
+    The records array is the top-level array, or the array under the
+    top-level ``"data"`` key of an envelope object.
+    """
+    depth = 0
+    array_depth: int | None = None
+    record_start = 0
+    after_data_key = False
+
+    for match in _TOKEN.finditer(buffer):
+        token = buffer[match.start()]
+        if token == 0x22:  # '"'
+            after_data_key = (
+                array_depth is None and depth == 1 and match.group() == _DATA_KEY
+            )
+            continue
+        if token in (0x5B, 0x7B):  # '[' or '{'
+            if array_depth is None and token == 0x5B and (depth == 0 or after_data_key):
+                array_depth = depth + 1
+            elif token == 0x7B and depth == array_depth:
+                record_start = match.start()
+            depth += 1
+        else:  # ']' or '}'
+            depth -= 1
+            if array_depth is None:
+                pass
+            elif depth == array_depth and token == 0x7D:
+                yield buffer[record_start : match.end()]
+            elif depth < array_depth:
+                return  # End of records array
+        after_data_key = False
+
+
+def iter_ndjson_records(buffer: bytes | mmap.mmap) -> Iterator[bytes]:
+    """Yield the raw bytes of each non-blank line of an NDJSON document."""
+    position = 0
+    size = len(buffer)
+    while position < size:
+        end = buffer.find(b"\n", position)
+        if end == -1:
+            end = size
+        line = buffer[position:end].strip()
+        if line:
+            yield line
+        position = end + 1
+
+
+def iter_json_records(path: str | Path, ndjson: bool | None = None) -> Iterator[bytes]:
+    """Memory-map an export file and yield each record's raw JSON bytes.
+
+    Args:
+        path: JSON array, envelope or NDJSON file
+        ndjson: Force NDJSON (True) or array (False); default from file suffix
+
+    Yields:
+        Raw JSON bytes of one record object
+    """
+    path = Path(path)
+    if ndjson is None:
+        ndjson = path.suffix.lower() in NDJSON_SUFFIXES
+
+    with open(path, "rb") as f:
+        if path.stat().st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            records = iter_ndjson_records if ndjson else iter_array_records
+            yield from records(buffer)
+
+
+def stream_models(
+    path: str | Path,
+    model: type[ModelT],
+    ndjson: bool | None = None,
+    keep_raw: bool = False,
+    lean: bool = False,
+) -> Iterator[ModelT]:
+    """Yield validated models one at a time from an export file.
+
+    Args:
+        path: JSON array, envelope or NDJSON file
+        model: UniFi model class
+        ndjson: Force NDJSON (True) or array (False); default from file suffix
+        keep_raw: Attach each record's original bytes (u_unifi_raw_data passthrough)
+        lean: Keep only fields referenced by the active field mappings
+
+    Raises:
+        pydantic.ValidationError: If a record fails validation
+    """
+    if lean:
+        model = mapped_model(model)
+    for record in iter_json_records(path, ndjson):
+        instance = model.model_validate_json(record)
+        if keep_raw:
+            attach_raw_json(instance, record)
+        yield instance
+
+
+def stream_hosts(
+    path: str | Path,
+    ndjson: bool | None = None,
+    keep_raw: bool = False,
+    lean: bool = False,
+) -> Iterator[UniFiHost]:
+    """Yield UniFi hosts one at a time from an export file."""
+    return stream_models(path, UniFiHost, ndjson, keep_raw, lean)
+
+
+def stream_sites(
+    path: str | Path,
+    ndjson: bool | None = None,
+    keep_raw: bool = False,
+    lean: bool = False,
+) -> Iterator[UniFiSite]:
+    """Yield UniFi sites one at a time from an export file."""
+    return stream_models(path, UniFiSite, ndjson, keep_raw, lean)
+
+
+def stream_devices(
+    path: str | Path,
+    ndjson: bool | None = None,
+    keep_raw: bool = False,
+    lean: bool = False,
+) -> Iterator[UniFiDevice]:
+    """Yield UniFi devices one at a time from an export file."""
+    return stream_models(path, UniFiDevice, ndjson, keep_raw, lean)
+
+
+def stream_clients(
+    path: str | Path,
+    ndjson: bool | None = None,
+    keep_raw: bool = False,
+    lean: bool = False,
+) -> Iterator[UniFiClient]:
+    """Yield UniFi clients one at a time from an export file."""
+    return stream_models(path, UniFiClient, ndjson, keep_raw, lean)
+
+
+def iter_batches(items: Iterable[T], batch_size: int) -> Iterator[list[T]]:
+    """Group an iterable into lists of at most ``batch_size`` items.
+
+    Example:
+        for batch in iter_batches(stream_clients(path), 5000):
+            endpoints = transform_clients(batch)
+    """
+    iterator = iter(items)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def iter_json_chunks(
+    path: str | Path, chunk_size: int, ndjson: bool | None = None
+) -> Iterator[bytes]:
+    """Yield JSON array chunks of raw records (for parallel transformation).
+
+    Records are never parsed in this process - feed the chunks to
+    ``transformers.parallel.iter_transformed_chunks``.
+    """
+    for batch in iter_batches(iter_json_records(path, ndjson), chunk_size):
+        yield b"[" + b",".join(batch) + b"]"
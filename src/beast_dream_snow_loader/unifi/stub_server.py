@@ -0,0 +1,141 @@
+"""Local stub of the UniFi Site Manager API for tests and benchmarks.
+
+Serves given (or generated) records from the SiteManagerFetcher paths with
+``pageSize``/``nextToken`` pagination and the API response envelope. Can add
+per-request latency and inject 429 rate-limit responses.
+
+Usage:
+    with StubSiteManager({"host": hosts, "client": clients}) as stub:
+        fetcher = SiteManagerFetcher(api_key="test", base_url=stub.url)
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from beast_dream_snow_loader.unifi.fetcher import DEFAULT_PAGE_SIZE, ENTITY_PATHS
+
+
+class StubSiteManager:
+    """Threaded HTTP server mimicking the Site Manager API (context manager)."""
+
+    def __init__(
+        self,
+        records: dict[str, list[dict[str, Any]]],
+        latency_seconds: float = 0.0,
+        rate_limit_every: int = 0,
+        retry_after_seconds: float = 0.0,
+        api_key: str | None = None,
+    ):
+        """Initialize stub (call start() or use as a context manager).
+
+        Args:
+            records: Entity (host, site, device, client) → API record dicts
+            latency_seconds: Delay added to every response
+            rate_limit_every: Answer every Nth request with 429 (0 = never)
+            retry_after_seconds: Retry-After header sent with 429 responses
+            api_key: Required X-API-KEY value (None accepts any key)
+        """
+        self.records = records
+        self.latency_seconds = latency_seconds
+        self.rate_limit_every = rate_limit_every
+        self.retry_after_seconds = retry_after_seconds
+        self.api_key = api_key
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self._lock = threading.Lock()
+        self._entities = {path: entity for entity, path in ENTITY_PATHS.items()}
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        if self._server is None:
+            raise RuntimeError("Stub server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubSiteManager":
+        """Start serving on a free localhost port."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 (http.server API)
+                status, headers, body = stub.handle(self.path, self.headers)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # Keep test/benchmark output clean
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},  # Fast shutdown
+            name="unifi_stub",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubSiteManager":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def handle(self, path: str, headers: Any) -> tuple[int, dict[str, str], bytes]:
+        """Build the (status, headers, body) response for a GET request."""
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        with self._lock:
+            self.request_count += 1
+            rate_limited = (
+                self.rate_limit_every > 0
+                and self.request_count % self.rate_limit_every == 0
+            )
+            if rate_limited:
+                self.rate_limited_count += 1
+        json_headers = {"Content-Type": "application/json"}
+        if rate_limited:
+            return (
+                429,
+                {**json_headers, "Retry-After": str(self.retry_after_seconds)},
+                b'{"httpStatusCode": 429, "message": "rate limit exceeded"}',
+            )
+        if self.api_key is not None and headers.get("X-API-KEY") != self.api_key:
+            return 401, json_headers, b'{"httpStatusCode": 401}'
+
+        url = urlparse(path)
+        entity = self._entities.get(url.path)
+        if entity is None:
+            return 404, json_headers, b'{"httpStatusCode": 404}'
+        query = parse_qs(url.query)
+        page_size = int(query.get("pageSize", [DEFAULT_PAGE_SIZE])[0])
+        offset = int(query.get("nextToken", ["0"])[0])
+        records = self.records.get(entity, [])
+        page = records[offset : offset + page_size]
+        envelope: dict[str, Any] = {
+            "data": page,
+            "httpStatusCode": 200,
+            "traceId": f"stub-{self.request_count}",
+        }
+        if offset + page_size < len(records):
+            envelope["nextToken"] = str(offset + page_size)
+        return 200, json_headers, json.dumps(envelope).encode()
@@ -0,0 +1,136 @@
+"""Unit tests for RequestHedger and HedgePolicy."""
+
+import threading
+import time
+
+import pytest
+
+from beast_dream_snow_loader.operations.hedging import HedgePolicy, RequestHedger
+from beast_dream_snow_loader.operations.metrics import MetricsCollector
+
+
+class TestHedgePolicy:
+    """Test cases for HedgePolicy dataclass."""
+
+    def test_default_policy(self):
+        """Test default hedge policy values."""
+        policy = HedgePolicy()
+
+        assert policy.delay_seconds == 0.1
+        assert policy.delay_percentile == 95.0
+        assert policy.max_hedge_ratio == 0.1
+
+
+class TestRequestHedger:
+    """Test cases for RequestHedger."""
+
+    def test_fast_operation_is_not_hedged(self):
+        """Test that operations finishing before the delay are not duplicated."""
+        hedger = RequestHedger(HedgePolicy(delay_seconds=1.0, max_hedge_ratio=1.0))
+        calls = []
+
+        def operation():
+            calls.append(1)
+            return "ok"
+
+        assert hedger.execute(operation, "get_record") == "ok"
+        assert len(calls) == 1
+        assert hedger.get_stats()["hedged_requests"] == 0
+
+    def test_slow_primary_is_hedged_and_hedge_wins(self):
+        """Test that a slow primary triggers a hedge whose result wins."""
+        hedger = RequestHedger(HedgePolicy(delay_seconds=0.01, max_hedge_ratio=1.0))
+        release_primary = threading.Event()
+        call_count = 0
+        lock = threading.Lock()
+
+        def operation():
+            nonlocal call_count
+            with lock:
+                call_count += 1
+                attempt = call_count
+            if attempt == 1:
+                release_primary.wait(timeout=2)
+                return "primary"
+            return "hedge"
+
+        try:
+            assert hedger.execute(operation, "get_record") == "hedge"
+        finally:
+            release_primary.set()
+
+        stats = hedger.get_stats()
+        assert stats["hedged_requests"] == 1
+        assert stats["hedge_wins"] == 1
+
+    def test_hedge_ratio_cap_prevents_hedging(self):
+        """Test that hedges are not sent once the ratio cap is reached."""
+        hedger = RequestHedger(HedgePolicy(delay_seconds=0.001, max_hedge_ratio=0.5))
+        calls = []
+
+        def slow_operation():
+            calls.append(1)
+            time.sleep(0.02)
+            return "ok"
+
+        for _ in range(4):
+            hedger.execute(slow_operation, "query_records")
+
+        stats = hedger.get_stats()
+        assert stats["total_requests"] == 4
+        assert stats["hedged_requests"] == 2
+        assert stats["hedge_ratio"] <= 0.5
+
+    def test_failed_primary_falls_back_to_hedge(self):
+        """Test that a failing attempt does not win over a successful one."""
+        hedger = RequestHedger(HedgePolicy(delay_seconds=0.01, max_hedge_ratio=1.0))
+        call_count = 0
+        lock = threading.Lock()
+
+        def operation():
+            nonlocal call_count
+            with lock:
+                call_count += 1
+                attempt = call_count
+            if attempt == 1:
+                time.sleep(0.05)
+                raise ConnectionError("slow node failed")
+            return "hedge"
+
+        assert hedger.execute(operation, "get_record") == "hedge"
+
+    def test_both_attempts_fail_raises(self):
+        """Test that an exception is raised if both attempts fail."""
+        hedger = RequestHedger(HedgePolicy(delay_seconds=0.01, max_hedge_ratio=1.0))
+
+        def operation():
+            time.sleep(0.02)
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            hedger.execute(operation, "get_record")
+
+    def test_delay_uses_observed_percentile(self):
+        """Test that hedge delay comes from the metrics percentile."""
+        metrics = MetricsCollector()
+        for response_time_ms in range(1, 101):
+            metrics.record_request("get_record", float(response_time_ms), True)
+
+        hedger = RequestHedger(
+            HedgePolicy(delay_seconds=5.0, delay_percentile=95.0, min_samples=20),
+            metrics=metrics,
+        )
+
+        assert hedger.get_hedge_delay("get_record") == pytest.approx(0.096)
+
+    def test_delay_falls_back_without_enough_samples(self):
+        """Test that policy delay is used when metrics history is too small."""
+        metrics = MetricsCollector()
+        metrics.record_request("get_record", 500.0, True)
+
+        hedger = RequestHedger(
+            HedgePolicy(delay_seconds=0.2, min_samples=20), metrics=metrics
+        )
+
+        assert hedger.get_hedge_delay("get_record") == 0.2
+        assert hedger.get_hedge_delay("unknown_operation") == 0.2
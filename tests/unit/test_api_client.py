@@ -0,0 +1,215 @@
+"""Unit tests for ServiceNow API client."""
+
+import base64
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from beast_dream_snow_loader.operations.hedging import HedgePolicy, RequestHedger
+from beast_dream_snow_loader.operations.metrics import MetricsCollector
+from beast_dream_snow_loader.servicenow.api_client import ServiceNowAPIClient
+
+
+def _response(status_code: int = 200, payload: dict | None = None) -> MagicMock:
+    """Build a mock JSON response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {"Content-Type": "application/json"}
+    response.json.return_value = payload if payload is not None else {"result": {}}
+    return response
+
+
+@pytest.fixture
+def client() -> ServiceNowAPIClient:
+    """API client with explicit credentials (no env or 1Password lookup)."""
+    return ServiceNowAPIClient(
+        instance="https://dev12345.service-now.com/",
+        username="svc_loader",
+        api_key="secret",
+    )
+
+
+class TestClientInitialization:
+    """Test client initialization."""
+
+    def test_instance_url_is_normalized(self, client):
+        """Test that scheme and trailing slash are stripped from instance."""
+        assert client.instance == "dev12345.service-now.com"
+        assert client.base_url == "https://dev12345.service-now.com/api/now"
+
+    def test_hedging_is_opt_in(self, client):
+        """Test that hedging and metrics are disabled by default."""
+        assert client.hedger is None
+        assert client.metrics is None
+
+
+class TestClientMetricsAndHedging:
+    """Test metrics recording and hedged reads."""
+
+    def test_requests_are_recorded_in_metrics(self):
+        """Test that each request records response time by operation."""
+        metrics = MetricsCollector()
+        client = ServiceNowAPIClient(
+            instance="dev12345.service-now.com",
+            username="svc_loader",
+            api_key="secret",
+            metrics=metrics,
+        )
+        client.session = MagicMock()
+        client.session.get.return_value = _response(payload={"result": []})
+
+        client.query_records("cmdb_ci", query="name=test")
+
+        operation_metrics = metrics.get_operation_metrics("query_records")
+        assert operation_metrics is not None
+        assert operation_metrics.total_requests == 1
+        assert operation_metrics.successful_requests == 1
+
+    def test_get_record_uses_hedger(self):
+        """Test that idempotent reads are routed through the hedger."""
+        client = ServiceNowAPIClient(
+            instance="dev12345.service-now.com",
+            username="svc_loader",
+            api_key="secret",
+            hedge_policy=HedgePolicy(delay_seconds=1.0),
+        )
+        client.session = MagicMock()
+        client.session.get.return_value = _response(
+            payload={"result": {"sys_id": "abc"}}
+        )
+
+        assert client.get_record("cmdb_ci", "abc") == {"sys_id": "abc"}
+        assert client.hedger.get_stats()["total_requests"] == 1
+
+    def test_hedged_reads_record_per_attempt_latency(self):
+        """Test that the hedge delay's metric gets per-attempt latencies."""
+        metrics = MetricsCollector()
+        client = ServiceNowAPIClient(
+            instance="dev12345.service-now.com",
+            username="svc_loader",
+            api_key="secret",
+            metrics=metrics,
+            hedge_policy=HedgePolicy(delay_seconds=1.0),
+        )
+        client.session = MagicMock()
+        client.session.get.return_value = _response(payload={"result": {}})
+
+        client.get_record("cmdb_ci", "abc")
+
+        assert metrics.get_operation_metrics("get_record").total_requests == 1
+        assert metrics.get_operation_metrics("get_record_hedged").total_requests == 1
+
+    def test_hedged_reads_use_a_session_per_thread(self, client):
+        """Test that worker threads get their own session with the same auth."""
+        client.hedger = RequestHedger(HedgePolicy())
+
+        worker_session = client.hedger._executor.submit(client._read_session).result()
+
+        assert worker_session is not client._read_session()
+        assert worker_session.auth == client.session.auth
+        client.close()
+        assert client._thread_sessions == []
+
+    def test_writes_are_never_hedged(self):
+        """Test that creates bypass the hedger."""
+        client = ServiceNowAPIClient(
+            instance="dev12345.service-now.com",
+            username="svc_loader",
+            api_key="secret",
+            hedge_policy=HedgePolicy(delay_seconds=0.001, max_hedge_ratio=1.0),
+        )
+        client.session = MagicMock()
+        client.session.post.return_value = _response(
+            status_code=201, payload={"result": {"sys_id": "new"}}
+        )
+
+        client.create_record("cmdb_ci", {"name": "test"})
+
+        assert client.session.post.call_count == 1
+        assert client.hedger.get_stats()["total_requests"] == 0
+
+
+class TestClientUpdates:
+    """Test full and partial record updates."""
+
+    def test_patch_record_sends_only_given_fields(self, client):
+        """Test that patch_record uses PATCH, update_record PUT."""
+        client.session = MagicMock()
+        client.session.patch.return_value = _response(payload={"result": {"a": 1}})
+        client.session.put.return_value = _response()
+
+        result = client.patch_record("cmdb_ci", "sys1", {"ip_address": "10.0.0.2"})
+        client.update_record("cmdb_ci", "sys1", {"ip_address": "10.0.0.3"})
+
+        assert result == {"a": 1}
+        url = client.session.patch.call_args.args[0]
+        assert url.endswith("/table/cmdb_ci/sys1")
+        assert client.session.patch.call_args.kwargs["json"] == {
+            "ip_address": "10.0.0.2"
+        }
+        client.session.put.assert_called_once()
+
+
+class TestClientStreamingAndBatch:
+    """Test paged streaming and Batch API requests."""
+
+    def test_iter_records_pages_until_short_page(self, client):
+        """Test that records are streamed page by page with projection."""
+        client.session = MagicMock()
+        client.session.get.side_effect = [
+            _response(payload={"result": [{"sys_id": "1"}, {"sys_id": "2"}]}),
+            _response(payload={"result": [{"sys_id": "3"}]}),
+        ]
+
+        records = list(client.iter_records("cmdb_ci", fields=["sys_id"], page_size=2))
+
+        assert [r["sys_id"] for r in records] == ["1", "2", "3"]
+        offsets = [
+            call.kwargs["params"]["sysparm_offset"]
+            for call in client.session.get.call_args_list
+        ]
+        assert offsets == [0, 2]
+        params = client.session.get.call_args.kwargs["params"]
+        assert params["sysparm_fields"] == "sys_id"
+        assert params["sysparm_query"] == "ORDERBYsys_id"
+
+    def test_iter_records_orders_filtered_query_by_sys_id(self, client):
+        """Test that a filter query gets a stable order for offset paging."""
+        client.session = MagicMock()
+        client.session.get.return_value = _response(payload={"result": []})
+
+        list(client.iter_records("cmdb_ci", query="name=test"))
+
+        params = client.session.get.call_args.kwargs["params"]
+        assert params["sysparm_query"] == "name=test^ORDERBYsys_id"
+
+    def test_batch_requests_encodes_and_decodes_bodies(self, client):
+        """Test that Batch API bodies are base64 JSON in both directions."""
+        body = base64.b64encode(json.dumps({"result": {"sys_id": "a"}}).encode())
+        client.session = MagicMock()
+        client.session.post.return_value = _response(
+            payload={
+                "serviced_requests": [
+                    {"id": "0", "status_code": 200, "body": body.decode()}
+                ],
+                "unserviced_requests": ["1"],
+            }
+        )
+
+        results = client.batch_requests(
+            [
+                {"method": "patch", "path": "/table/cmdb_ci/a", "body": {"x": "1"}},
+                {"method": "DELETE", "path": "/table/cmdb_ci/b"},
+            ]
+        )
+
+        assert results == [
+            {"status_code": 200, "result": {"sys_id": "a"}},
+            {"status_code": None, "result": None},
+        ]
+        sent = client.session.post.call_args.kwargs["json"]["rest_requests"]
+        assert sent[0]["method"] == "PATCH"
+        assert sent[0]["url"] == "/api/now/table/cmdb_ci/a"
+        assert json.loads(base64.b64decode(sent[0]["body"])) == {"x": "1"}
+        assert "body" not in sent[1]
@@ -0,0 +1,181 @@
+"""Unit tests for schema-driven auto-mapping."""
+
+import json
+
+from beast_dream_snow_loader.transformers import auto_mapping
+from beast_dream_snow_loader.transformers.auto_mapping import (
+    AUTO_MAPPING_VERSION,
+    MAX_COLUMN_LENGTH,
+    generate_field_mappings,
+    load_schema_mappings,
+    parse_schema_sql,
+    sample_field_paths,
+    to_servicenow_column,
+)
+from beast_dream_snow_loader.transformers.schema_mapper import compile_field_mapping
+
+SCHEMA_SQL = """-- test schema
+CREATE TABLE hosts (
+    id TEXT NOT NULL PRIMARY KEY,
+    hardwareId TEXT NOT NULL,
+    reportedState.hostname TEXT NOT NULL,
+    reportedState.autoUpdate.schedule.day REAL,
+    statistics.name TEXT,
+    meta.name TEXT,
+    reportedState.version_parsed TIMESTAMP
+);
+
+CREATE TABLE devices (
+    hostId TEXT NOT NULL PRIMARY KEY,
+    updatedAt TEXT NOT NULL,
+    FOREIGN KEY (hostId) REFERENCES sites(hostId)
+);
+"""
+
+
+class TestSchemaParsing:
+    """Test field path discovery."""
+
+    def test_parse_schema_sql(self):
+        """Test that column paths are parsed per table, skipping derived columns."""
+        tables = parse_schema_sql(SCHEMA_SQL)
+
+        assert tables["hosts"] == [
+            "id",
+            "hardwareId",
+            "reportedState.hostname",
+            "reportedState.autoUpdate.schedule.day",
+            "statistics.name",
+            "meta.name",
+        ]
+        assert tables["devices"] == ["hostId", "updatedAt"]
+
+    def test_sample_field_paths(self):
+        """Test that leaf paths are collected from a sample payload."""
+        payload = {"id": "1", "reportedState": {"hardware": {"mac": "m"}}, "tags": []}
+
+        assert sample_field_paths(payload) == [
+            "id",
+            "reportedState.hardware.mac",
+            "tags",
+        ]
+
+
+class TestGenerateFieldMappings:
+    """Test mapping table generation."""
+
+    def test_column_names(self):
+        """Test flattened, prefixed snake_case column names."""
+        assert (
+            to_servicenow_column("reportedState.autoUpdate.schedule.day")
+            == "u_unifi_auto_update_schedule_day"
+        )
+        assert to_servicenow_column("hardwareId") == "u_unifi_hardware_id"
+
+    def test_long_column_names_are_truncated_uniquely(self):
+        """Test that column names respect the ServiceNow length limit."""
+        path_a = "reportedState." + "veryLongSegment." * 8 + "a"
+        path_b = "reportedState." + "veryLongSegment." * 8 + "b"
+
+        column_a = to_servicenow_column(path_a)
+        column_b = to_servicenow_column(path_b)
+
+        assert len(column_a) <= MAX_COLUMN_LENGTH
+        assert column_a != column_b
+
+    def test_curated_mappings_win(self):
+        """Test that hand-written mappings are kept and their columns reserved."""
+        mappings = generate_field_mappings(
+            ["id", "reportedState.hostname", "hostname"],
+            curated={"id": "u_unifi_source_id"},
+            prefix="",
+        )
+
+        assert mappings["id"] == "u_unifi_source_id"
+        assert mappings["reportedState.hostname"] == "hostname"
+        # Collision falls back to full-path naming, then numeric suffix
+        assert mappings["hostname"] == "hostname_2"
+
+    def test_collisions_keep_common_prefix(self):
+        """Test that colliding flattened names keep their common prefix."""
+        mappings = generate_field_mappings(["meta.name", "statistics.name"])
+
+        assert mappings == {
+            "meta.name": "u_unifi_name",
+            "statistics.name": "u_unifi_statistics_name",
+        }
+
+    def test_generated_mapping_compiles(self):
+        """Test that generated tables work with compile_field_mapping."""
+        mappings = generate_field_mappings(["reportedState.autoUpdate.schedule.day"])
+        extract = compile_field_mapping(mappings)
+
+        result = extract({"reportedState": {"autoUpdate": {"schedule": {"day": 3}}}})
+
+        assert result == {"u_unifi_auto_update_schedule_day": 3}
+
+
+class TestLoadSchemaMappings:
+    """Test versioned artifact caching."""
+
+    def test_default_schema_covers_nested_fields(self, tmp_path):
+        """Test generation from the packaged unifi_schema.sql."""
+        mappings = load_schema_mappings(cache_path=tmp_path / "m.json")
+
+        host = mappings["host"]
+        assert host["id"] == "u_unifi_source_id"
+        assert host["reportedState.hostname"] == "hostname"
+        assert (
+            host["reportedState.autoUpdate.schedule.day"]
+            == "u_unifi_auto_update_schedule_day"
+        )
+        assert len(host) > 100
+        assert len(set(host.values())) == len(host)
+
+    def test_artifact_is_reused(self, tmp_path):
+        """Test that an up-to-date artifact is returned without regenerating."""
+        schema_path = tmp_path / "schema.sql"
+        schema_path.write_text(SCHEMA_SQL)
+        cache_path = tmp_path / "m.json"
+
+        load_schema_mappings(schema_path, cache_path)
+        artifact = json.loads(cache_path.read_text())
+        assert artifact["version"] == AUTO_MAPPING_VERSION
+        artifact["mappings"]["host"]["id"] = "from_cache"
+        cache_path.write_text(json.dumps(artifact))
+
+        assert load_schema_mappings(schema_path, cache_path)["host"]["id"] == (
+            "from_cache"
+        )
+
+    def test_artifact_is_regenerated_when_schema_changes(self, tmp_path):
+        """Test that schema or version changes invalidate the artifact."""
+        schema_path = tmp_path / "schema.sql"
+        schema_path.write_text(SCHEMA_SQL)
+        cache_path = tmp_path / "m.json"
+        load_schema_mappings(schema_path, cache_path)
+
+        schema_path.write_text(SCHEMA_SQL.replace("updatedAt", "lastSeen"))
+        mappings = load_schema_mappings(schema_path, cache_path)
+
+        assert "lastSeen" in mappings["device"]
+        assert "updatedAt" not in mappings["device"]
+
+    def test_failed_write_keeps_previous_artifact(self, tmp_path, monkeypatch):
+        """Test that the artifact is swapped in whole, never left truncated."""
+        schema_path = tmp_path / "schema.sql"
+        schema_path.write_text(SCHEMA_SQL)
+        cache_path = tmp_path / "m.json"
+        load_schema_mappings(schema_path, cache_path)
+        previous = cache_path.read_text()
+
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(auto_mapping.os, "replace", fail_replace)
+        schema_path.write_text(SCHEMA_SQL.replace("updatedAt", "lastSeen"))
+        mappings = load_schema_mappings(schema_path, cache_path)
+
+        assert "lastSeen" in mappings["device"]
+        assert cache_path.read_text() == previous
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["m.json", "schema.sql"]
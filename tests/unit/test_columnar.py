@@ -0,0 +1,155 @@
+"""Unit tests for the columnar client transform engine."""
+
+import pytest
+
+from beast_dream_snow_loader.models.raw import RawJSON, attach_raw_json
+from beast_dream_snow_loader.models.unifi import UniFiClient
+from beast_dream_snow_loader.transformers.columnar import (
+    ClientColumns,
+    canonical_source_id_rekeys,
+    normalize_ips,
+    normalize_macs,
+    transform_client_columns,
+)
+from beast_dream_snow_loader.transformers.unifi_to_snow import transform_client
+
+CLIENTS = [
+    {
+        "hostname": "laptop",
+        "ip": "192.168.1.10",
+        "mac": "aa:bb:cc:dd:ee:01",
+        "deviceType": "computer",
+        "siteId": "site-1",
+    },
+    {
+        "hostname": "phone",
+        "ip": "192.168.1.11",
+        "mac": "aa:bb:cc:dd:ee:02",
+        "deviceType": "phone",
+    },
+]
+
+
+class TestNormalization:
+    """Test column normalization."""
+
+    def test_normalize_macs(self):
+        """Test MAC canonicalization across common formats."""
+        assert normalize_macs(
+            ["AA-BB-CC-DD-EE-FF", "aabb.ccdd.eeff", "AABBCCDDEEFF", " Unknown "]
+        ) == ["aa:bb:cc:dd:ee:ff"] * 3 + ["unknown"]
+
+    def test_normalize_canonical_column(self):
+        """Test the whole-column fast path and its fallbacks."""
+        assert normalize_macs(["AA:BB:CC:DD:EE:FF", "aa:bb:cc:dd:ee:01"]) == [
+            "aa:bb:cc:dd:ee:ff",
+            "aa:bb:cc:dd:ee:01",
+        ]
+        # Right length, wrong separator positions
+        assert normalize_macs(["aab:bcc:dd:ee:ff:"]) == ["aa:bb:cc:dd:ee:ff"]
+        assert normalize_macs([]) == []
+
+    def test_normalize_ips(self):
+        """Test IP whitespace and case normalization."""
+        assert normalize_ips([" 10.0.0.1 ", "FE80::1"]) == ["10.0.0.1", "fe80::1"]
+
+
+class TestTransformClientColumns:
+    """Test columnar endpoint row generation."""
+
+    def test_matches_transform_client(self):
+        """Test that rows match per-record transform output for canonical input."""
+        rows = transform_client_columns(ClientColumns.from_records(CLIENTS))
+
+        expected = [
+            transform_client(UniFiClient(**c)).model_dump(
+                exclude_none=True, exclude={"u_unifi_raw_data"}
+            )
+            for c in CLIENTS
+        ]
+        assert [row.pop("u_unifi_raw_data") for row in rows] == CLIENTS
+        assert rows == expected
+
+    def test_source_id_falls_back_to_mac_as_received_on_both_paths(self):
+        """Test that hostname-less clients keep their existing source id."""
+        client = {"hostname": "", "ip": "10.0.0.2", "mac": "AA-BB-CC-DD-EE-03"}
+
+        row = transform_client_columns(ClientColumns.from_records([client]))[0]
+
+        assert row["u_unifi_source_id"] == "AA-BB-CC-DD-EE-03"
+        assert row["mac_address"] == "aa:bb:cc:dd:ee:03"
+        assert transform_client(UniFiClient(**client)).u_unifi_source_id == (
+            row["u_unifi_source_id"]
+        )
+
+    def test_canonical_source_ids_on_both_paths(self):
+        """Test that the opt-in canonical fallback agrees across paths."""
+        client = {"hostname": "", "ip": "10.0.0.2", "mac": "AA-BB-CC-DD-EE-03"}
+
+        row = transform_client_columns(
+            ClientColumns.from_records([client]), canonical_source_ids=True
+        )[0]
+
+        endpoint = transform_client(UniFiClient(**client), canonical_source_ids=True)
+        assert row["u_unifi_source_id"] == "aa:bb:cc:dd:ee:03"
+        assert endpoint.u_unifi_source_id == row["u_unifi_source_id"]
+
+    def test_canonical_source_id_rekeys(self):
+        """Test that only source ids the canonical fallback changes are mapped."""
+        columns = ClientColumns.from_records(
+            [
+                {"hostname": "", "ip": "10.0.0.2", "mac": "AA-BB-CC-DD-EE-03"},
+                {"hostname": "", "ip": "10.0.0.3", "mac": "aa:bb:cc:dd:ee:04"},
+                {"hostname": "tv", "ip": "10.0.0.4", "mac": "AABBCCDDEE05"},
+            ]
+        )
+
+        assert canonical_source_id_rekeys(columns) == {
+            "AA-BB-CC-DD-EE-03": "aa:bb:cc:dd:ee:03"
+        }
+
+    def test_dedup_by_source_id(self):
+        """Test that the last duplicate wins, at the first one's position."""
+        columns = ClientColumns(
+            hostname=["a", "", "a"],
+            ip=["10.0.0.1", "10.0.0.2", "10.0.0.3"],
+            mac=["AA:BB:CC:DD:EE:01", "AA-BB-CC-DD-EE-02", "aa:bb:cc:dd:ee:01"],
+        )
+
+        rows = transform_client_columns(columns)
+
+        assert [r["u_unifi_source_id"] for r in rows] == ["a", "AA-BB-CC-DD-EE-02"]
+        assert rows[0]["ip_address"] == "10.0.0.3"
+        assert len(transform_client_columns(columns, dedup=False)) == 3
+
+    def test_from_clients_passes_kept_bytes(self):
+        """Test that kept raw bytes are passed through, dumps are not made."""
+        kept, plain = UniFiClient(**CLIENTS[0]), UniFiClient(**CLIENTS[1])
+        attach_raw_json(kept, b'{"hostname": "laptop"}')
+
+        rows = transform_client_columns(ClientColumns.from_clients([kept, plain]))
+
+        assert rows[0]["u_unifi_raw_data"] == RawJSON(b'{"hostname": "laptop"}')
+        assert "u_unifi_raw_data" not in rows[1]
+
+    def test_array_like_columns(self):
+        """Test columns that provide tolist() (e.g. NumPy arrays)."""
+
+        class Column(list):
+            def tolist(self):
+                return list(self)
+
+        columns = ClientColumns(
+            hostname=Column(["a"]),
+            ip=Column(["10.0.0.1"]),
+            mac=Column(["AABBCCDDEEFF"]),
+        )
+
+        assert transform_client_columns(columns)[0]["mac_address"] == (
+            "aa:bb:cc:dd:ee:ff"
+        )
+
+    def test_mismatched_lengths_raise(self):
+        """Test that columns of different lengths are rejected."""
+        with pytest.raises(ValueError, match="lengths differ"):
+            ClientColumns(hostname=["a"], ip=[], mac=["x"])
@@ -0,0 +1,84 @@
+"""Unit tests for compact outbound records."""
+
+import pytest
+
+from beast_dream_snow_loader.models.compact import (
+    CompactEndpoint,
+    CompactLocation,
+    InternTable,
+    compact_records,
+)
+from beast_dream_snow_loader.models.servicenow import (
+    ServiceNowEndpoint,
+    ServiceNowLocation,
+)
+
+
+def _endpoint(index: int, **extra) -> ServiceNowEndpoint:
+    return ServiceNowEndpoint(
+        u_unifi_source_id=f"client-{index}",
+        hostname=f"client-{index}",
+        ip_address=f"192.168.1.{index}",
+        mac_address=f"aa:bb:cc:dd:ee:{index:02x}",
+        device_type="".join(["comp", "uter"]),  # distinct object per record
+        site_id="".join(["site-", "1"]),
+        **extra,
+    )
+
+
+class TestInternTable:
+    """Test string interning."""
+
+    def test_shares_equal_strings(self):
+        """Test that equal strings map to one object and others pass through."""
+        interns = InternTable()
+        first = interns.intern("".join(["site-", "1"]))
+
+        assert interns.intern("".join(["site-", "1"])) is first
+        assert interns.intern(None) is None
+        assert interns.intern(42) == 42
+        assert len(interns) == 1
+
+
+class TestCompactRecord:
+    """Test compact record conversion."""
+
+    def test_round_trip(self):
+        """Test model → compact → model and payload parity."""
+        endpoint = _endpoint(1, u_custom="x")
+        compact = CompactEndpoint.from_model(endpoint)
+
+        assert not hasattr(compact, "__dict__")
+        assert compact.to_payload() == endpoint.model_dump(exclude_none=True)
+        assert compact.to_model() == endpoint
+        assert compact.u_custom == "x"
+        assert compact.device_id is None
+
+    def test_unknown_attribute_raises(self):
+        """Test that missing extra fields raise AttributeError."""
+        with pytest.raises(AttributeError):
+            _ = CompactEndpoint.from_model(_endpoint(1)).u_missing
+
+    def test_repeated_values_are_interned(self):
+        """Test that compact_records shares repeated strings across records."""
+        first, second = compact_records([_endpoint(1), _endpoint(2)])
+
+        assert first.site_id is second.site_id
+        assert first.device_type is second.device_type
+        assert first.hostname is not second.hostname
+
+    def test_mixed_types(self):
+        """Test that each model type maps to its compact type."""
+        location = ServiceNowLocation(
+            u_unifi_source_id="site-1", name="HQ", description="HQ", timezone="UTC"
+        )
+
+        records = compact_records([location, _endpoint(1)])
+
+        assert [type(r) for r in records] == [CompactLocation, CompactEndpoint]
+
+    def test_from_payload(self):
+        """Test building from a payload dict (e.g. a columnar row)."""
+        payload = _endpoint(1).model_dump(exclude_none=True)
+
+        assert CompactEndpoint.from_payload(payload).to_payload() == payload
@@ -0,0 +1,110 @@
+"""Unit tests for endpoint flap damping."""
+
+import pytest
+
+from beast_dream_snow_loader.models.servicenow import ServiceNowEndpoint
+from beast_dream_snow_loader.transformers.damping import FlapDamper
+
+
+def _endpoint(ip: str, site_id: str = "site-1") -> ServiceNowEndpoint:
+    return ServiceNowEndpoint(
+        u_unifi_source_id="client-1",
+        hostname="phone",
+        ip_address=ip,
+        mac_address="aa:bb:cc:dd:ee:01",
+        site_id=site_id,
+    )
+
+
+class FakeClock:
+    """Settable time source."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestFlapDamper:
+    """Test holding and releasing volatile changes."""
+
+    def test_new_records_pass_through(self):
+        """Test that the first sighting is committed as-is."""
+        damper = FlapDamper()
+        record = _endpoint("10.0.0.1")
+
+        assert damper.damp([record])[0] is record
+
+    def test_change_released_after_stable_cycles(self):
+        """Test that a new value is held until seen N cycles in a row."""
+        damper = FlapDamper(stable_cycles=3)
+        damper.damp([_endpoint("10.0.0.1")])
+
+        ips = [damper.damp([_endpoint("10.0.0.2")])[0].ip_address for _ in range(3)]
+
+        assert ips == ["10.0.0.1", "10.0.0.1", "10.0.0.2"]
+        assert damper.stats.changes_held == 2
+        assert damper.stats.changes_released == 1
+
+    def test_flapping_never_writes(self):
+        """Test that a value flapping back cancels the pending change."""
+        damper = FlapDamper(stable_cycles=2)
+        damper.damp([_endpoint("10.0.0.1")])
+
+        outputs = [
+            damper.damp([_endpoint(ip)])[0].ip_address
+            for ip in ["10.0.0.2", "10.0.0.1", "10.0.0.2", "10.0.0.1"]
+        ]
+
+        assert outputs == ["10.0.0.1"] * 4
+        assert damper.stats.flaps_cancelled == 2
+        assert [o.value for o in damper.history("client-1", "ip_address")] == [
+            "10.0.0.1",
+            "10.0.0.2",
+            "10.0.0.1",
+            "10.0.0.2",
+            "10.0.0.1",
+        ]
+
+    def test_change_released_after_stable_seconds(self):
+        """Test that a value stable long enough is released before N cycles."""
+        clock = FakeClock()
+        damper = FlapDamper(stable_cycles=10, stable_seconds=600, clock=clock)
+        damper.damp([_endpoint("10.0.0.1", site_id="site-1")])
+
+        held = damper.damp([_endpoint("10.0.0.1", site_id="site-2")])[0]
+        clock.now += 600
+        released = damper.damp([_endpoint("10.0.0.1", site_id="site-2")])[0]
+
+        assert held.site_id == "site-1"
+        assert released.site_id == "site-2"
+
+    def test_payload_dicts(self):
+        """Test that payload dicts are damped like models."""
+        damper = FlapDamper()
+        damper.damp([{"u_unifi_source_id": "c", "ip_address": "10.0.0.1"}])
+
+        (record,) = damper.damp([{"u_unifi_source_id": "c", "ip_address": "10.0.0.9"}])
+
+        assert record == {"u_unifi_source_id": "c", "ip_address": "10.0.0.1"}
+
+    def test_save_and_load(self, tmp_path):
+        """Test that pending changes survive a restart."""
+        damper = FlapDamper(stable_cycles=2)
+        damper.damp([_endpoint("10.0.0.1")])
+        damper.damp([_endpoint("10.0.0.2")])
+        damper.save(tmp_path / "damping.json")
+
+        restored = FlapDamper(stable_cycles=2)
+        restored.load(tmp_path / "damping.json")
+
+        assert restored.damp([_endpoint("10.0.0.2")])[0].ip_address == "10.0.0.2"
+        assert restored.history("client-1", "ip_address") == damper.history(
+            "client-1", "ip_address"
+        )
+
+    def test_invalid_stable_cycles(self):
+        """Test that stable_cycles must be positive."""
+        with pytest.raises(ValueError):
+            FlapDamper(stable_cycles=0)
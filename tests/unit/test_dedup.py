@@ -0,0 +1,113 @@
+"""Unit tests for pre-load client dedup."""
+
+import pytest
+
+from beast_dream_snow_loader.models.raw import attach_raw_json, get_raw_json
+from beast_dream_snow_loader.models.unifi import UniFiClient
+from beast_dream_snow_loader.transformers.dedup import (
+    DedupPrecedence,
+    build_mac_index,
+    dedup_clients,
+)
+
+
+def _client(hostname: str, mac: str, **fields) -> UniFiClient:
+    return UniFiClient(hostname=hostname, ip="192.168.1.10", mac=mac, **fields)
+
+
+class TestBuildMacIndex:
+    """Test the canonical MAC index."""
+
+    def test_groups_mac_variants(self):
+        """Test that casing and separator variants share one entry."""
+        clients = [
+            _client("a", "AA:BB:CC:DD:EE:01"),
+            _client("b", "aa:bb:cc:dd:ee:02"),
+            _client("c", "aa-bb-cc-dd-ee-01"),
+        ]
+
+        assert build_mac_index(clients) == {
+            "aa:bb:cc:dd:ee:01": [0, 2],
+            "aa:bb:cc:dd:ee:02": [1],
+        }
+
+    def test_empty_and_malformed_macs_are_not_indexed(self):
+        """Test that only 12-hex-digit MACs are grouped."""
+        clients = [
+            _client("a", ""),
+            _client("b", "unknown"),
+            _client("c", ""),
+            _client("d", "aa:bb:cc:dd:ee:01"),
+        ]
+
+        assert build_mac_index(clients) == {"aa:bb:cc:dd:ee:01": [3]}
+
+
+class TestDedupClients:
+    """Test duplicate merging."""
+
+    def test_clients_without_valid_mac_pass_through(self):
+        """Test that empty MACs are never merged into one client."""
+        clients = [
+            _client("a", ""),
+            _client("b", "AA:BB:CC:DD:EE:01"),
+            _client("c", ""),
+            _client("d", "aa-bb-cc-dd-ee-01"),
+            _client("e", "n/a"),
+        ]
+
+        merged, report = dedup_clients(clients, precedence=DedupPrecedence.FIRST)
+
+        assert [c.hostname for c in merged] == ["a", "b", "c", "e"]
+        assert merged[0] is clients[0]
+        assert report.merged_groups == {"aa:bb:cc:dd:ee:01": 2}
+        assert report.unindexed_count == 3
+        assert report.writes_avoided == 1
+
+    def test_most_recent_wins_and_gaps_are_filled(self):
+        """Test most_recent precedence with field merging."""
+        clients = [
+            _client("old", "AA:BB:CC:DD:EE:01", siteId="site-1", lastSeen=100),
+            _client("new", "aa:bb:cc:dd:ee:01", lastSeen=200),
+            _client("other", "aa:bb:cc:dd:ee:02"),
+        ]
+
+        merged, report = dedup_clients(clients)
+
+        assert [c.hostname for c in merged] == ["new", "other"]
+        assert merged[0].siteId == "site-1"
+        assert report.writes_avoided == 1
+        assert report.merged_groups == {"aa:bb:cc:dd:ee:01": 2}
+
+    def test_most_complete(self):
+        """Test most_complete precedence."""
+        clients = [
+            _client("full", "aa:bb:cc:dd:ee:01", deviceType="phone", siteId="s"),
+            _client("sparse", "AA:BB:CC:DD:EE:01"),
+        ]
+
+        merged, _ = dedup_clients(clients, DedupPrecedence.MOST_COMPLETE)
+
+        assert merged[0].hostname == "full"
+
+    @pytest.mark.parametrize(
+        ("precedence", "winner"),
+        [(DedupPrecedence.FIRST, "a"), (DedupPrecedence.LAST, "b")],
+    )
+    def test_input_order_precedence(self, precedence, winner):
+        """Test first/last precedence."""
+        clients = [_client("a", "aa:bb:cc:dd:ee:01"), _client("b", "AABBCCDDEE01")]
+
+        merged, _ = dedup_clients(clients, precedence)
+
+        assert [c.hostname for c in merged] == [winner]
+
+    def test_macs_are_canonical_and_raw_bytes_kept(self):
+        """Test that returned clients carry canonical MACs and kept raw bytes."""
+        client = attach_raw_json(_client("a", "AA-BB-CC-DD-EE-01"), b"{}")
+
+        (merged,), report = dedup_clients([client])
+
+        assert merged.mac == "aa:bb:cc:dd:ee:01"
+        assert get_raw_json(merged) is not None
+        assert report.writes_avoided == 0
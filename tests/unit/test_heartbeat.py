@@ -0,0 +1,126 @@
+"""Unit tests for batched last-seen heartbeats."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from beast_dream_snow_loader.servicenow.heartbeat import (
+    HEARTBEAT_FIELD,
+    HeartbeatFieldMissingError,
+    HeartbeatTracker,
+    format_glide_datetime,
+)
+from beast_dream_snow_loader.servicenow.loader import TABLE_ENDPOINT
+
+ID_MAPPING = {TABLE_ENDPOINT: {f"client-{i}": f"sys-{i}" for i in range(5)}}
+
+
+class FakeClock:
+    """Settable time source."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Fake clock at a fixed time."""
+    return FakeClock()
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    """Mock API client whose Batch API calls succeed."""
+    client = MagicMock()
+    client.batch_requests.side_effect = lambda rest_requests: [
+        {"status_code": 200} for _ in rest_requests
+    ]
+    return client
+
+
+class TestHeartbeatTracker:
+    """Test recording and flushing heartbeats."""
+
+    def test_flush_sends_batched_single_field_patches(self, client, clock):
+        """Test that each record gets one PATCH of the heartbeat field."""
+        tracker = HeartbeatTracker(client, ID_MAPPING, batch_size=2, clock=clock)
+        tracker.record(TABLE_ENDPOINT, ["client-0", "client-1", "client-2"])
+
+        result = tracker.flush()
+
+        assert result.updated == {TABLE_ENDPOINT: 3}
+        assert result.batch_calls == 2
+        first, _ = client.batch_requests.call_args_list
+        assert first.args[0][0] == {
+            "method": "PATCH",
+            "path": f"/table/{TABLE_ENDPOINT}/sys-0",
+            "body": {HEARTBEAT_FIELD: "2023-11-14 22:13:20"},
+        }
+        assert tracker.pending_count == 0
+
+    def test_cycles_coalesce_until_due(self, client, clock):
+        """Test that repeated sightings are written once, at the interval."""
+        tracker = HeartbeatTracker(client, ID_MAPPING, clock=clock)
+
+        for _ in range(4):
+            tracker.record(TABLE_ENDPOINT, ["client-0"])
+            assert tracker.maybe_flush() is None
+            clock.now += 900
+        result = tracker.maybe_flush()
+
+        assert result is not None
+        (request,) = client.batch_requests.call_args.args[0]
+        assert request["body"] == {
+            HEARTBEAT_FIELD: format_glide_datetime(clock.now - 900)
+        }
+        assert tracker.stats.recorded == 4
+        assert tracker.stats.coalesced == 3
+
+    def test_failed_writes_stay_pending(self, client, clock):
+        """Test that failures are retried and unmapped records dropped."""
+        client.batch_requests.side_effect = lambda rest_requests: [
+            {"status_code": 500} for _ in rest_requests
+        ]
+        tracker = HeartbeatTracker(client, ID_MAPPING, clock=clock)
+        tracker.record(TABLE_ENDPOINT, ["client-0", "unknown"])
+
+        result = tracker.flush()
+
+        assert result.failed == {TABLE_ENDPOINT: ["client-0"]}
+        assert result.unmapped == {TABLE_ENDPOINT: ["unknown"]}
+        assert tracker.pending == {TABLE_ENDPOINT: {"client-0": clock.now}}
+
+    def test_missing_column_fails_loudly(self, client, clock):
+        """Test that a 200 without the heartbeat column raises, keeping pending."""
+        client.batch_requests.side_effect = lambda rest_requests: [
+            {"status_code": 200, "result": {"sys_id": "sys-0"}} for _ in rest_requests
+        ]
+        tracker = HeartbeatTracker(client, ID_MAPPING, clock=clock)
+        tracker.record(TABLE_ENDPOINT, ["client-0", "client-1"])
+
+        with pytest.raises(HeartbeatFieldMissingError, match=HEARTBEAT_FIELD):
+            tracker.flush()
+
+        assert tracker.pending == {
+            TABLE_ENDPOINT: {"client-0": clock.now, "client-1": clock.now}
+        }
+
+    def test_column_is_checked_once_per_table(self, client, clock):
+        """Test that later flushes skip the check once the column was seen."""
+        client.batch_requests.side_effect = lambda rest_requests: [
+            {"status_code": 200, "result": {HEARTBEAT_FIELD: "2023-11-14 22:13:20"}}
+            for _ in rest_requests
+        ]
+        tracker = HeartbeatTracker(client, ID_MAPPING, clock=clock)
+        tracker.record(TABLE_ENDPOINT, ["client-0"])
+        tracker.flush()
+
+        client.batch_requests.side_effect = lambda rest_requests: [
+            {"status_code": 200, "result": {}} for _ in rest_requests
+        ]
+        tracker.record(TABLE_ENDPOINT, ["client-1"])
+
+        assert tracker.flush().updated == {TABLE_ENDPOINT: 1}
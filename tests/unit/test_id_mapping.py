@@ -0,0 +1,122 @@
+"""Unit tests for compact id mapping storage."""
+
+import sys
+
+import pytest
+
+from beast_dream_snow_loader.servicenow.id_mapping import (
+    CompactIdMap,
+    IdMappingStore,
+    SQLiteIdMap,
+)
+
+SYS_ID_1 = "0123456789abcdef0123456789abcdef"
+SYS_ID_2 = "fedcba9876543210fedcba9876543210"
+
+
+class TestCompactIdMap:
+    """Test CompactIdMap."""
+
+    def test_hex_sys_ids_round_trip(self):
+        """Test that packed sys_ids are returned unchanged."""
+        id_map = CompactIdMap()
+        id_map["host-1"] = SYS_ID_1
+        id_map["host-2"] = SYS_ID_2
+
+        assert id_map["host-1"] == SYS_ID_1
+        assert id_map.get("host-2") == SYS_ID_2
+        assert id_map.get("missing") is None
+        assert len(id_map) == 2
+        assert set(id_map) == {"host-1", "host-2"}
+
+    def test_hex_sys_ids_are_packed(self):
+        """Test that 32-char hex sys_ids take 16 bytes each."""
+        id_map = CompactIdMap({"a": SYS_ID_1, "b": SYS_ID_2})
+
+        assert len(id_map._sys_ids) == 32
+        assert id_map._overflow == {}
+
+    def test_non_hex_sys_ids_use_overflow(self):
+        """Test that non-packable sys_ids are preserved exactly."""
+        id_map = CompactIdMap()
+        id_map["a"] = "sys_id_1"
+        id_map["b"] = SYS_ID_1.upper()
+
+        assert id_map["a"] == "sys_id_1"
+        assert id_map["b"] == SYS_ID_1.upper()
+
+    def test_overwrite_and_delete(self):
+        """Test overwriting between packed and overflow values and deleting."""
+        id_map = CompactIdMap()
+        id_map["a"] = SYS_ID_1
+        id_map["a"] = SYS_ID_2
+        assert id_map["a"] == SYS_ID_2
+        id_map["a"] = "not-hex"
+        assert id_map["a"] == "not-hex"
+        id_map["a"] = SYS_ID_1
+        assert id_map["a"] == SYS_ID_1
+        assert len(id_map) == 1
+
+        del id_map["a"]
+        assert "a" not in id_map
+        with pytest.raises(KeyError):
+            del id_map["a"]
+
+    def test_source_keys_are_interned(self):
+        """Test that source keys are interned."""
+        id_map = CompactIdMap()
+        key = "".join(["site-", "42"])
+        id_map[key] = SYS_ID_1
+
+        stored_key = next(iter(id_map))
+        assert stored_key is sys.intern("site-42")
+
+
+class TestSQLiteIdMap:
+    """Test SQLiteIdMap through a spilled store."""
+
+    def test_spilled_store_keeps_entries(self, tmp_path):
+        """Test that spilling moves all entries to SQLite."""
+        store = IdMappingStore(
+            ["gateways", "endpoints"],
+            spill_path=tmp_path / "ids.sqlite",
+            max_memory_entries=2,
+        )
+        store["gateways"]["host-1"] = SYS_ID_1
+        store["endpoints"]["client-1"] = "sys_id_text"
+        assert not store.spilled
+
+        store["endpoints"]["client-2"] = SYS_ID_2
+
+        assert store.spilled
+        assert isinstance(store["endpoints"].backend, SQLiteIdMap)
+        assert store["gateways"]["host-1"] == SYS_ID_1
+        assert store["endpoints"]["client-1"] == "sys_id_text"
+        assert store["endpoints"].get("client-2") == SYS_ID_2
+        assert len(store["endpoints"]) == 2
+        assert store.to_dict()["gateways"] == {"host-1": SYS_ID_1}
+
+        del store["endpoints"]["client-1"]
+        assert "client-1" not in store["endpoints"]
+        store.close()
+
+    def test_store_without_spill_path_stays_in_memory(self):
+        """Test that spilling is disabled without a path."""
+        store = IdMappingStore(["endpoints"], max_memory_entries=1)
+        store["endpoints"]["a"] = SYS_ID_1
+        store["endpoints"]["b"] = SYS_ID_2
+
+        assert not store.spilled
+        with pytest.raises(ValueError):
+            store.spill()
+
+    def test_tables_added_after_spill_use_sqlite(self, tmp_path):
+        """Test that new tables on a spilled store are SQLite-backed."""
+        store = IdMappingStore(spill_path=tmp_path / "ids.sqlite")
+        store.spill()
+
+        store.table("locations")["site-1"] = SYS_ID_1
+
+        assert isinstance(store["locations"].backend, SQLiteIdMap)
+        assert store["locations"]["site-1"] == SYS_ID_1
+        store.close()
@@ -0,0 +1,115 @@
+"""Unit tests for lean UniFi model variants."""
+
+import json
+
+from beast_dream_snow_loader.models.lean import build_keep_tree, lean_model, prune
+from beast_dream_snow_loader.models.unifi import UniFiClient, UniFiHost
+from beast_dream_snow_loader.transformers.unifi_to_snow import (
+    transform_clients,
+    transform_hosts,
+)
+from beast_dream_snow_loader.unifi.ingest import read_clients, read_hosts
+from beast_dream_snow_loader.unifi.streaming import stream_hosts
+
+HOST = {
+    "id": "host-1",
+    "hardwareId": "hw-1",
+    "type": "console",
+    "ipAddress": "10.0.0.1",
+    "owner": True,
+    "isBlocked": False,
+    "registrationTime": "2025-01-01T00:00:00Z",
+    "lastConnectionStateChange": "2025-01-01T00:00:00Z",
+    "latestBackupTime": "2025-01-01T00:00:00Z",
+    "reportedState": {
+        "controller_uuid": "uuid-1",
+        "host_type": 1,
+        "hostname": "udm",
+        "mgmt_port": 443,
+        "name": "UDM",
+        "state": "connected",
+        "version": "4.0.6",
+        "hardware": {"mac": "aa:bb:cc:dd:ee:ff", "serialno": "SN1", "sysid": 1},
+        "features": {"cloudBackup": True, "teleport": {"enabled": True}},
+    },
+    "userData": {"status": "ACTIVE", "features": {"deviceGroups": True}},
+}
+
+CLIENT = {
+    "hostname": "laptop",
+    "ip": "192.168.1.10",
+    "mac": "aa:bb:cc:dd:ee:01",
+    "fingerprint": {"devCat": 1},
+}
+
+
+class TestKeepTree:
+    """Test keep tree construction and pruning."""
+
+    def test_declared_fields_and_paths(self):
+        """Test that declared fields and mapped paths are kept, nothing else."""
+        keep = build_keep_tree(UniFiHost, ["reportedState.hardware.mac"])
+
+        pruned = prune(HOST, keep)
+
+        assert pruned["reportedState"]["hardware"] == {"mac": "aa:bb:cc:dd:ee:ff"}
+        assert "features" not in pruned["reportedState"]
+        assert pruned["userData"] == {"status": "ACTIVE"}
+        assert pruned["id"] == "host-1"
+
+    def test_whole_value_kept_for_prefix_path(self):
+        """Test that a shorter path keeps the whole subtree."""
+        keep = build_keep_tree(
+            UniFiHost, ["reportedState.hardware", "reportedState.hardware.mac"]
+        )
+
+        assert prune(HOST, keep)["reportedState"]["hardware"] == (
+            HOST["reportedState"]["hardware"]
+        )
+
+
+class TestLeanModel:
+    """Test lean model variants."""
+
+    def test_is_cached_subclass(self):
+        """Test that the lean variant is a cached subclass of the model."""
+        lean = lean_model(UniFiClient, ["hostname"])
+
+        assert issubclass(lean, UniFiClient)
+        assert lean_model(UniFiClient, ["hostname"]) is lean
+
+    def test_drops_unmapped_extras(self):
+        """Test that unmapped extra fields are not retained."""
+        client = lean_model(UniFiClient, [])(**CLIENT)
+
+        assert client.model_extra == {}
+        assert client.mac == "aa:bb:cc:dd:ee:01"
+
+    def test_read_lean_matches_full_transform(self):
+        """Test that lean ingestion transforms to the same mapped fields."""
+        body = json.dumps([HOST]).encode()
+        full = transform_hosts(read_hosts(body))[0]
+        lean = transform_hosts(read_hosts(body, lean=True))[0]
+
+        assert lean.mac_address == full.mac_address == "aa:bb:cc:dd:ee:ff"
+        assert lean.serial_number == full.serial_number
+        assert "features" not in lean.u_unifi_raw_data
+
+    def test_read_lean_keep_raw(self):
+        """Test that keep_raw still passes the full source bytes through."""
+        body = json.dumps([CLIENT]).encode()
+        clients = read_clients(body, keep_raw=True, lean=True)
+
+        assert "fingerprint" not in (clients[0].model_extra or {})
+        raw_data = transform_clients(clients)[0].u_unifi_raw_data
+        assert "fingerprint" in raw_data.loads()
+
+    def test_stream_lean(self, tmp_path):
+        """Test lean streaming from an export file."""
+        path = tmp_path / "hosts.json"
+        path.write_text(json.dumps({"data": [HOST]}))
+
+        (host,) = stream_hosts(path, lean=True)
+
+        assert isinstance(host, UniFiHost)
+        assert "features" not in host.reportedState.model_extra
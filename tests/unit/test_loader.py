@@ -0,0 +1,168 @@
+"""Unit tests for ServiceNow data loading functions."""
+
+from itertools import count
+from unittest.mock import MagicMock
+
+from beast_dream_snow_loader.models.compact import compact_records
+from beast_dream_snow_loader.models.servicenow import (
+    ServiceNowEndpoint,
+    ServiceNowGatewayCI,
+    ServiceNowLocation,
+)
+from beast_dream_snow_loader.servicenow.id_mapping import IdMappingStore
+from beast_dream_snow_loader.servicenow.loader import (
+    TABLE_ENDPOINT,
+    TABLE_GATEWAY_CI,
+    TABLE_LOCATION,
+    load_entities_with_relationships,
+)
+from beast_dream_snow_loader.servicenow.relationship_types import (
+    REL_TYPE_LOCATED_IN,
+    REL_TYPE_MANAGED_BY,
+    RelationshipTypeResolver,
+)
+
+
+def _mock_client() -> MagicMock:
+    """Build a mock API client that assigns sequential sys_ids on create."""
+    client = MagicMock()
+    client.instance = "dev12345.service-now.com"
+    client.get_current_changeset.return_value = None
+    sys_ids = count(1)
+    client.create_record.side_effect = lambda table, data: {
+        "sys_id": f"{next(sys_ids):032x}"
+    }
+    client.query_records.return_value = [
+        {"name": REL_TYPE_MANAGED_BY, "sys_id": "rel_managed"},
+        {"name": REL_TYPE_LOCATED_IN, "sys_id": "rel_located"},
+    ]
+    return client
+
+
+def _entities() -> dict:
+    """Build a small gateway → site → endpoint inventory."""
+    return {
+        "gateways": [
+            ServiceNowGatewayCI(
+                u_unifi_source_id="host-1",
+                name="UDM-Pro",
+                ip_address="192.168.1.1",
+                hostname="udm-pro",
+            )
+        ],
+        "locations": [
+            ServiceNowLocation(
+                u_unifi_source_id="site-1",
+                name="HQ",
+                description="Headquarters",
+                timezone="UTC",
+                host_id="host-1",
+            )
+        ],
+        "endpoints": [
+            ServiceNowEndpoint(
+                u_unifi_source_id="laptop",
+                hostname="laptop",
+                ip_address="192.168.1.10",
+                mac_address="aa:bb:cc:dd:ee:ff",
+                site_id="site-1",
+            )
+        ],
+    }
+
+
+def _relationship_rows(client: MagicMock) -> list[dict]:
+    """Get cmdb_rel_ci payloads sent to the mock client."""
+    return [
+        call.args[1]
+        for call in client.create_record.call_args_list
+        if call.args[0] == "cmdb_rel_ci"
+    ]
+
+
+class TestLoadEntitiesWithRelationships:
+    """Test multi-phase batch loading."""
+
+    def test_records_are_mapped_to_sys_ids(self, tmp_path):
+        """Test that Phase 1 captures sys_ids per source id."""
+        client = _mock_client()
+        resolver = RelationshipTypeResolver(client, cache_path=tmp_path / "c.json")
+
+        id_mapping = load_entities_with_relationships(
+            client, relationship_types=resolver, **_entities()
+        )
+
+        assert "host-1" in id_mapping[TABLE_GATEWAY_CI]
+        assert "site-1" in id_mapping[TABLE_LOCATION]
+        assert "laptop" in id_mapping[TABLE_ENDPOINT]
+
+    def test_relationships_carry_resolved_type_sys_ids(self, tmp_path):
+        """Test that cmdb_rel_ci rows use cmdb_rel_type sys_ids."""
+        client = _mock_client()
+        resolver = RelationshipTypeResolver(client, cache_path=tmp_path / "c.json")
+
+        load_entities_with_relationships(
+            client, relationship_types=resolver, **_entities()
+        )
+
+        types = [row["type"] for row in _relationship_rows(client)]
+        assert types == ["rel_managed", "rel_located"]
+        client.query_records.assert_called_once()
+
+    def test_unresolved_types_fall_back_to_display_name(self, tmp_path):
+        """Test that the display name is used when resolution fails."""
+        client = _mock_client()
+        client.query_records.side_effect = Exception("query failed")
+        resolver = RelationshipTypeResolver(client, cache_path=tmp_path / "c.json")
+
+        load_entities_with_relationships(
+            client, relationship_types=resolver, **_entities()
+        )
+
+        types = [row["type"] for row in _relationship_rows(client)]
+        assert types == [REL_TYPE_MANAGED_BY, REL_TYPE_LOCATED_IN]
+
+    def test_compact_id_mapping_store_is_used(self, tmp_path):
+        """Test that a compact store can replace the dict of dicts."""
+        client = _mock_client()
+        resolver = RelationshipTypeResolver(client, cache_path=tmp_path / "c.json")
+        store = IdMappingStore(spill_path=tmp_path / "ids.sqlite", max_memory_entries=1)
+
+        id_mapping = load_entities_with_relationships(
+            client,
+            relationship_types=resolver,
+            id_mapping_store=store,
+            **_entities(),
+        )
+
+        assert id_mapping is store
+        assert store.spilled
+        assert store[TABLE_ENDPOINT]["laptop"] == f"{3:032x}"
+        assert len(_relationship_rows(client)) == 2
+        store.close()
+
+    def test_compact_records_load_like_models(self, tmp_path):
+        """Test that compact records produce the same payloads as models."""
+        entities = _entities()
+        model_client = _mock_client()
+        compact_client = _mock_client()
+
+        load_entities_with_relationships(
+            model_client,
+            relationship_types=RelationshipTypeResolver(
+                model_client, cache_path=tmp_path / "m.json"
+            ),
+            **entities,
+        )
+        load_entities_with_relationships(
+            compact_client,
+            relationship_types=RelationshipTypeResolver(
+                compact_client, cache_path=tmp_path / "c.json"
+            ),
+            **{name: compact_records(models) for name, models in entities.items()},
+        )
+
+        assert (
+            compact_client.create_record.call_args_list
+            == model_client.create_record.call_args_list
+        )
@@ -0,0 +1,79 @@
+"""Unit tests for process-parallel transformation."""
+
+import json
+
+import pytest
+
+from beast_dream_snow_loader.models.unifi import UniFiClient
+from beast_dream_snow_loader.transformers.parallel import (
+    chunk_records_as_json,
+    iter_transformed_chunks,
+    transform_clients_parallel,
+    transform_json_chunk,
+    transform_parallel,
+)
+from beast_dream_snow_loader.transformers.unifi_to_snow import transform_client
+
+
+def _clients(count: int) -> list[UniFiClient]:
+    """Build UniFi clients with distinct hostnames."""
+    return [
+        UniFiClient(
+            hostname=f"client-{i}",
+            ip=f"192.168.1.{i}",
+            mac=f"aa:bb:cc:dd:ee:{i:02x}",
+            siteId="site-1" if i % 2 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def _expected(clients: list[UniFiClient]) -> list[dict]:
+    """Per-record payloads as the loader would send them."""
+    return [transform_client(c).model_dump(exclude_none=True) for c in clients]
+
+
+class TestTransformParallel:
+    """Test parallel transformation."""
+
+    def test_worker_transforms_raw_json_chunk(self):
+        """Test that a worker turns a JSON array into payload JSON."""
+        clients = _clients(3)
+        chunk = json.dumps([c.model_dump() for c in clients]).encode()
+
+        result = transform_json_chunk(chunk)
+
+        assert json.loads(result) == _expected(clients)
+
+    def test_chunking(self):
+        """Test that records are serialized into fixed-size JSON arrays."""
+        chunks = list(chunk_records_as_json(_clients(5), chunk_size=2))
+
+        assert [len(json.loads(chunk)) for chunk in chunks] == [2, 2, 1]
+
+    def test_inline_single_worker_preserves_order(self):
+        """Test single-worker mode (no pool) with dict inputs."""
+        clients = _clients(7)
+
+        payloads = transform_clients_parallel(
+            [c.model_dump() for c in clients], workers=1, chunk_size=3
+        )
+
+        assert payloads == _expected(clients)
+
+    def test_process_pool_preserves_order(self):
+        """Test that pool output order matches input order."""
+        clients = _clients(25)
+
+        payloads = transform_clients_parallel(clients, workers=2, chunk_size=4)
+
+        assert payloads == _expected(clients)
+
+    def test_unknown_entity_is_rejected(self):
+        """Test that an unknown entity raises ValueError."""
+        with pytest.raises(ValueError):
+            list(iter_transformed_chunks([b"[]"], entity="switch"))
+
+    def test_empty_input(self):
+        """Test that empty input yields no payloads."""
+        assert transform_parallel([], workers=2) == []
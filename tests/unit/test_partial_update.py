@@ -0,0 +1,130 @@
+"""Unit tests for PATCH-based partial updates."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from beast_dream_snow_loader.models.raw import RawJSON
+from beast_dream_snow_loader.models.servicenow import ServiceNowEndpoint
+from beast_dream_snow_loader.servicenow.loader import TABLE_ENDPOINT
+from beast_dream_snow_loader.servicenow.partial_update import (
+    PartialUpdater,
+    RecordMirror,
+    normalize_payload,
+)
+from beast_dream_snow_loader.servicenow.raw_data_policy import (
+    RAW_DATA_FIELD,
+    RAW_DIGEST_FIELD,
+    raw_data_bytes,
+    raw_data_digest,
+)
+
+RAW = RawJSON(b'{"mac":"aa:bb:cc:dd:ee:01"}')
+
+
+def _endpoint(ip: str = "10.0.0.1", **kwargs) -> ServiceNowEndpoint:
+    return ServiceNowEndpoint(
+        u_unifi_source_id="client-1",
+        hostname="laptop",
+        ip_address=ip,
+        mac_address="aa:bb:cc:dd:ee:01",
+        u_unifi_raw_data=RAW,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def updater() -> PartialUpdater:
+    """Updater whose mirror knows the current state of client-1."""
+    mirror = RecordMirror()
+    payload = _endpoint(device_type="phone").model_dump(exclude_none=True)
+    mirror.put(TABLE_ENDPOINT, "client-1", "sys1", normalize_payload(payload))
+    return PartialUpdater(MagicMock(), mirror)
+
+
+class TestPartialUpdater:
+    """Test diffing against the mirror."""
+
+    def test_only_changed_fields_are_patched(self, updater):
+        """Test that one changed field sends one field (no raw data)."""
+        updater.update(TABLE_ENDPOINT, _endpoint(ip="10.0.0.2", device_type="phone"))
+
+        updater.client.patch_record.assert_called_once_with(
+            TABLE_ENDPOINT, "sys1", {"ip_address": "10.0.0.2"}
+        )
+        assert updater.stats.patched == 1
+        assert updater.stats.fields_sent == 1
+
+    def test_unchanged_record_is_skipped(self, updater):
+        """Test that no request is sent when nothing changed."""
+        result = updater.update(TABLE_ENDPOINT, _endpoint(device_type="phone"))
+
+        assert result is None
+        updater.client.patch_record.assert_not_called()
+        assert updater.stats.skipped == 1
+
+    def test_cleared_field_is_sent_empty(self, updater):
+        """Test that a field missing from the new record is cleared."""
+        updater.update(TABLE_ENDPOINT, _endpoint())
+
+        body = updater.client.patch_record.call_args.args[2]
+        assert body == {"device_type": ""}
+
+    def test_mirror_follows_writes(self, updater):
+        """Test that the second identical update is skipped."""
+        updater.update(TABLE_ENDPOINT, _endpoint(ip="10.0.0.2"))
+        updater.update(TABLE_ENDPOINT, _endpoint(ip="10.0.0.2"))
+
+        assert updater.client.patch_record.call_count == 1
+        assert updater.stats.skipped == 1
+
+    def test_unknown_record_needs_sys_id(self):
+        """Test that records missing from the mirror are written in full."""
+        updater = PartialUpdater(MagicMock())
+
+        with pytest.raises(ValueError):
+            updater.update(TABLE_ENDPOINT, _endpoint())
+        updater.update(TABLE_ENDPOINT, _endpoint(), sys_id="sys1")
+
+        body = updater.client.patch_record.call_args.args[2]
+        assert body["u_unifi_raw_data"] is RAW
+        assert updater.stats.full == 1
+
+
+class TestRecordMirror:
+    """Test mirror prefetch and persistence."""
+
+    def test_prefetch_uses_raw_digest(self):
+        """Test that a prefetched projection matches an unchanged record."""
+        client = MagicMock()
+        client.iter_records.return_value = [
+            {
+                "sys_id": "sys1",
+                "u_unifi_source_id": "client-1",
+                "hostname": "laptop",
+                "ip_address": "10.0.0.1",
+                "mac_address": "aa:bb:cc:dd:ee:01",
+                "device_type": "",
+                RAW_DIGEST_FIELD: raw_data_digest(raw_data_bytes(RAW)),
+            }
+        ]
+        mirror = RecordMirror()
+
+        count = mirror.prefetch(client, TABLE_ENDPOINT, ServiceNowEndpoint.model_fields)
+        updater = PartialUpdater(client, mirror)
+        updater.update(TABLE_ENDPOINT, _endpoint())
+
+        assert count == 1
+        fields = client.iter_records.call_args.kwargs["fields"]
+        assert RAW_DIGEST_FIELD in fields and RAW_DATA_FIELD not in fields
+        assert updater.stats.skipped == 1
+
+    def test_save_and_load(self, updater, tmp_path):
+        """Test that a saved mirror round-trips."""
+        path = tmp_path / "mirror.json"
+        updater.mirror.save(path)
+
+        mirror = RecordMirror.load(path)
+
+        assert mirror.records == updater.mirror.records
+        assert len(RecordMirror.load(tmp_path / "missing.json")) == 0
@@ -0,0 +1,221 @@
+"""Unit tests for dry-run load planning."""
+
+from itertools import count
+from unittest.mock import MagicMock
+
+import pytest
+
+from beast_dream_snow_loader.models.servicenow import (
+    ServiceNowEndpoint,
+    ServiceNowGatewayCI,
+    ServiceNowLocation,
+)
+from beast_dream_snow_loader.operations.metrics import MetricsCollector
+from beast_dream_snow_loader.servicenow.loader import (
+    TABLE_ENDPOINT,
+    TABLE_GATEWAY_CI,
+    TABLE_LOCATION,
+)
+from beast_dream_snow_loader.servicenow.planner import (
+    ACTION_CREATE,
+    ACTION_UPDATE,
+    BACKEND_BATCH_API,
+    BACKEND_IMPORT_SET,
+    BACKEND_TABLE_API,
+    LoadPlan,
+    execute_plan,
+    plan_load,
+)
+from beast_dream_snow_loader.servicenow.relationship_types import (
+    REL_TYPE_LOCATED_IN,
+    REL_TYPE_MANAGED_BY,
+    RelationshipTypeResolver,
+)
+
+
+def _entities() -> dict:
+    """Build a small gateway → site → endpoints inventory."""
+    return {
+        "gateways": [
+            ServiceNowGatewayCI(
+                u_unifi_source_id="host-1",
+                name="UDM-Pro",
+                ip_address="192.168.1.1",
+                hostname="udm-pro",
+            )
+        ],
+        "locations": [
+            ServiceNowLocation(
+                u_unifi_source_id="site-1",
+                name="HQ",
+                description="Headquarters",
+                timezone="UTC",
+                host_id="host-1",
+            )
+        ],
+        "endpoints": [
+            ServiceNowEndpoint(
+                u_unifi_source_id=f"client-{i}",
+                hostname=f"client-{i}",
+                ip_address=f"192.168.1.{10 + i}",
+                mac_address=f"aa:bb:cc:dd:ee:{i:02x}",
+                site_id="site-1",
+            )
+            for i in range(3)
+        ],
+    }
+
+
+def _mock_client(
+    existing_endpoints: list[dict] | None = None,
+    existing_locations: list[dict] | None = None,
+) -> MagicMock:
+    """Build a mock read-only client; endpoints and sites may already exist."""
+    client = MagicMock()
+    client.instance = "dev12345.service-now.com"
+
+    def _iter_records(table, query=None, fields=None, page_size=1000):
+        if query.endswith("sys_class_name=cmdb_ci"):
+            return iter(existing_endpoints or [])
+        if query.endswith("sys_class_name=cmdb_ci_site"):
+            return iter(existing_locations or [])
+        return iter([])
+
+    client.iter_records.side_effect = _iter_records
+    client.query_records.return_value = [
+        {"name": REL_TYPE_MANAGED_BY, "sys_id": "rel_managed"},
+        {"name": REL_TYPE_LOCATED_IN, "sys_id": "rel_located"},
+    ]
+    return client
+
+
+class TestPlanLoad:
+    """Test plan_load."""
+
+    def test_plan_without_client_creates_everything(self):
+        """Test that all records are planned as creates without a client."""
+        plan = plan_load(**_entities())
+
+        assert [op.action for op in plan.operations] == [ACTION_CREATE] * 5
+        summary = plan.summary()
+        assert summary["operations"]["cmdb_ci_site"] == {ACTION_CREATE: 1}
+        assert summary["operations"]["cmdb_ci"] == {ACTION_CREATE: 3}
+        assert summary["relationships"] == {
+            REL_TYPE_MANAGED_BY: 1,
+            REL_TYPE_LOCATED_IN: 3,
+        }
+
+    def test_plan_detects_existing_records_as_updates(self, tmp_path):
+        """Test that existing source ids are planned as updates, read-only."""
+        client = _mock_client(
+            [{"sys_id": "existing-0", "u_unifi_source_id": "client-0"}]
+        )
+        resolver = RelationshipTypeResolver(client, cache_path=tmp_path / "c.json")
+
+        plan = plan_load(client, relationship_types=resolver, **_entities())
+
+        updates = [op for op in plan.operations if op.action == ACTION_UPDATE]
+        assert [(op.source_id, op.sys_id) for op in updates] == [
+            ("client-0", "existing-0")
+        ]
+        # Relationships only for created children, with resolved type sys_ids
+        assert len(plan.relationships) == 3
+        assert {rel.type_sys_id for rel in plan.relationships} == {
+            "rel_managed",
+            "rel_located",
+        }
+        client.create_record.assert_not_called()
+        client.update_record.assert_not_called()
+
+    def test_relationships_to_existing_parents_carry_their_sys_id(self, tmp_path):
+        """Test that parents outside this load are looked up and executed."""
+        client = _mock_client(
+            existing_locations=[{"sys_id": "site-sys", "u_unifi_source_id": "site-1"}]
+        )
+        resolver = RelationshipTypeResolver(client, cache_path=tmp_path / "c.json")
+
+        plan = plan_load(
+            client, relationship_types=resolver, endpoints=_entities()["endpoints"]
+        )
+
+        assert len(plan.relationships) == 3
+        assert {rel.parent_sys_id for rel in plan.relationships} == {"site-sys"}
+
+        plan = LoadPlan.from_json(plan.to_json())
+        writer = MagicMock()
+        sys_ids = count(1)
+        writer.create_record.side_effect = lambda table, data: {
+            "sys_id": f"sys-{next(sys_ids)}"
+        }
+        execute_plan(writer, plan)
+
+        parents = [
+            call.args[1]["parent"]
+            for call in writer.create_record.call_args_list
+            if call.args[0] == "cmdb_rel_ci"
+        ]
+        assert parents == ["site-sys"] * 3
+
+    def test_estimates_per_backend(self):
+        """Test request counts per backend."""
+        plan = plan_load(**_entities())
+
+        assert plan.estimates[BACKEND_TABLE_API].requests == 5 + 4
+        # One batch call per non-empty phase: gateways, locations, endpoints, rels
+        assert plan.estimates[BACKEND_BATCH_API].requests == 4
+        assert plan.estimates[BACKEND_IMPORT_SET].requests == 4
+
+    def test_duration_uses_observed_latency(self):
+        """Test that duration estimate uses recent latency metrics."""
+        metrics = MetricsCollector()
+        metrics.record_request("create_record", 1000.0, True)
+
+        plan = plan_load(metrics=metrics, **_entities())
+
+        assert plan.estimates[BACKEND_TABLE_API].estimated_seconds == pytest.approx(9.0)
+
+
+class TestPlanSerialization:
+    """Test plan round-trip and execution."""
+
+    def test_plan_round_trips_through_json(self):
+        """Test that a plan survives JSON serialization."""
+        plan = plan_load(**_entities())
+
+        restored = LoadPlan.from_json(plan.to_json())
+
+        assert restored == plan
+
+    def test_unsupported_version_is_rejected(self):
+        """Test that plans with an unknown format version are rejected."""
+        data = plan_load(**_entities()).to_dict()
+        data["version"] = 99
+
+        with pytest.raises(ValueError):
+            LoadPlan.from_dict(data)
+
+    def test_execute_plan_writes_records_and_relationships(self):
+        """Test that a deserialized plan can be executed later."""
+        plan = LoadPlan.from_json(plan_load(**_entities()).to_json())
+        client = MagicMock()
+        sys_ids = count(1)
+        client.create_record.side_effect = lambda table, data: {
+            "sys_id": f"sys-{next(sys_ids)}"
+        }
+
+        id_mapping = execute_plan(client, plan)
+
+        assert id_mapping[TABLE_GATEWAY_CI] == {"host-1": "sys-1"}
+        assert id_mapping[TABLE_LOCATION] == {"site-1": "sys-2"}
+        assert len(id_mapping[TABLE_ENDPOINT]) == 3
+        relationship_rows = [
+            call.args[1]
+            for call in client.create_record.call_args_list
+            if call.args[0] == "cmdb_rel_ci"
+        ]
+        assert relationship_rows[0] == {
+            "parent": "sys-1",
+            "child": "sys-2",
+            "type": REL_TYPE_MANAGED_BY,
+        }
+        assert len(relationship_rows) == 4
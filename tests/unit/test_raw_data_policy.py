@@ -0,0 +1,223 @@
+"""Unit tests for raw data storage policies."""
+
+import base64
+import json
+import zlib
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from beast_dream_snow_loader.models.raw import RawJSON
+from beast_dream_snow_loader.models.servicenow import ServiceNowGatewayCI
+from beast_dream_snow_loader.servicenow.api_client import ServiceNowAPIClient
+from beast_dream_snow_loader.servicenow.loader import TABLE_GATEWAY_CI, load_gateway_ci
+from beast_dream_snow_loader.servicenow.raw_data_policy import (
+    RAW_ATTACHMENT_FILE_NAME,
+    RAW_DATA_FIELD,
+    RAW_DIGEST_FIELD,
+    RAW_ENCODING_FIELD,
+    RawDataMode,
+    RawDataPolicy,
+    raw_data_bytes,
+    raw_data_digest,
+)
+
+RAW = {"hostname": "laptop", "ip": "192.168.1.10", "uptime": 1234, "tags": ["a"] * 50}
+TABLE = "cmdb_ci"
+GATEWAY = ServiceNowGatewayCI(
+    u_unifi_source_id="host-1",
+    name="UDM-Pro",
+    ip_address="192.168.1.1",
+    hostname="udm-pro",
+    u_unifi_raw_data=RAW,
+)
+
+
+def _payload(raw=RAW) -> dict:
+    return {"name": "laptop", "u_unifi_source_id": "client-1", RAW_DATA_FIELD: raw}
+
+
+def _response(payload: dict) -> MagicMock:
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {"Content-Type": "application/json"}
+    response.json.return_value = payload
+    return response
+
+
+@pytest.fixture
+def client() -> ServiceNowAPIClient:
+    """API client with explicit credentials (no env or 1Password lookup)."""
+    return ServiceNowAPIClient(
+        instance="dev12345.service-now.com", username="svc_loader", api_key="secret"
+    )
+
+
+class TestRawDataPolicy:
+    """Test payload shape per mode."""
+
+    def test_full_mode_leaves_payload_untouched(self):
+        """Test that full mode sends raw data as-is."""
+        policy = RawDataPolicy(RawDataMode.FULL)
+        payload = _payload()
+
+        prepared = policy.prepare(TABLE, payload)
+
+        assert prepared.data is payload
+        assert prepared.attachment is None
+        assert policy.get_stats()["bytes_saved"] == 0
+
+    def test_digest_matches_raw_json_bytes(self):
+        """Test that RawJSON is digested over its original bytes."""
+        raw = RawJSON(b'{"b": 1, "a": 2}')
+
+        assert raw_data_bytes(raw) == b'{"b": 1, "a": 2}'
+        assert raw_data_bytes({"b": 1, "a": 2}) == b'{"a":2,"b":1}'
+
+    def test_digest_compressed_round_trips(self):
+        """Test that the compressed blob decodes back to the raw data."""
+        policy = RawDataPolicy(RawDataMode.DIGEST_COMPRESSED)
+
+        prepared = policy.prepare(TABLE, _payload())
+        data = prepared.data
+        decoded = zlib.decompress(base64.b64decode(data[RAW_DATA_FIELD]))
+
+        assert json.loads(decoded) == RAW
+        assert data[RAW_ENCODING_FIELD] == "zlib+base64"
+        assert data[RAW_DIGEST_FIELD] == raw_data_digest(decoded)
+        assert policy.get_stats()["bytes_saved"] > 0
+
+    def test_on_change_skips_unchanged_digest(self):
+        """Test that raw data is only sent when its digest changes."""
+        policy = RawDataPolicy(RawDataMode.ON_CHANGE)
+        client = MagicMock()
+
+        first = policy.prepare(TABLE, _payload())
+        policy.complete(client, TABLE, "sys1", first)
+        second = policy.prepare(TABLE, _payload())
+        third = policy.prepare(TABLE, _payload({**RAW, "uptime": 9999}))
+
+        assert first.data[RAW_DATA_FIELD] == RAW
+        assert RAW_DATA_FIELD not in second.data
+        assert second.data[RAW_DIGEST_FIELD] == first.data[RAW_DIGEST_FIELD]
+        assert third.data[RAW_DATA_FIELD]["uptime"] == 9999
+        assert policy.get_stats()["raw_skipped_unchanged"] == 1
+
+    def test_failed_write_does_not_record_digest(self):
+        """Test that digests are only remembered after complete()."""
+        policy = RawDataPolicy(RawDataMode.ON_CHANGE)
+
+        policy.prepare(TABLE, _payload())
+        retry = policy.prepare(TABLE, _payload())
+
+        assert RAW_DATA_FIELD in retry.data
+
+    def test_attachment_mode_defers_upload(self):
+        """Test that attachment mode strips raw data and uploads once."""
+        policy = RawDataPolicy(RawDataMode.ATTACHMENT)
+        client = MagicMock()
+
+        prepared = policy.prepare(TABLE, _payload())
+        policy.complete(client, TABLE, "sys1", prepared)
+        unchanged = policy.prepare(TABLE, _payload())
+        policy.complete(client, TABLE, "sys1", unchanged)
+
+        assert RAW_DATA_FIELD not in prepared.data
+        client.upload_attachment.assert_called_once_with(
+            TABLE, "sys1", RAW_ATTACHMENT_FILE_NAME, raw_data_bytes(RAW)
+        )
+        stats = policy.get_stats()
+        assert stats["attachments_uploaded"] == 1
+        assert stats["raw_bytes"] == 2 * len(raw_data_bytes(RAW))
+        assert stats["sent_bytes"] == len(raw_data_bytes(RAW)) + 2 * 64
+
+    def test_payload_without_raw_data_is_ignored(self):
+        """Test that payloads without raw data pass through uncounted."""
+        policy = RawDataPolicy(RawDataMode.ON_CHANGE)
+
+        prepared = policy.prepare(TABLE, {"name": "x"})
+
+        assert prepared.data == {"name": "x"}
+        assert policy.get_stats()["records"] == 0
+
+
+class TestClientRawDataPolicy:
+    """Test raw data policy integration in the API client."""
+
+    def test_create_record_applies_policy_and_uploads(self, client):
+        """Test that create_record sends the digest and uploads the attachment."""
+        client.raw_data_policy = RawDataPolicy(RawDataMode.ATTACHMENT)
+        client.session.post = MagicMock(
+            side_effect=[
+                _response({"result": {"sys_id": "sys1"}}),
+                _response({"result": {"sys_id": "att1"}}),
+            ]
+        )
+
+        client.create_record(TABLE, _payload())
+
+        create_call, upload_call = client.session.post.call_args_list
+        assert RAW_DATA_FIELD not in create_call.kwargs["json"]
+        assert RAW_DIGEST_FIELD in create_call.kwargs["json"]
+        assert upload_call.args[0].endswith("/api/now/attachment/file")
+        assert upload_call.kwargs["params"] == {
+            "table_name": TABLE,
+            "table_sys_id": "sys1",
+            "file_name": RAW_ATTACHMENT_FILE_NAME,
+        }
+        assert upload_call.kwargs["data"] == raw_data_bytes(RAW)
+
+    def test_failed_upload_does_not_fail_the_create(self, client):
+        """Test that an attachment error never makes a written record look failed."""
+        client.raw_data_policy = RawDataPolicy(RawDataMode.ATTACHMENT)
+        forbidden = _response({"error": {"message": "ACL"}})
+        forbidden.status_code = 403
+        forbidden.raise_for_status.side_effect = requests.HTTPError("403 Forbidden")
+        client.session.post = MagicMock(
+            side_effect=[_response({"result": {"sys_id": "sys1"}}), forbidden]
+        )
+
+        result = load_gateway_ci(client, GATEWAY)
+
+        assert result == {"sys_id": "sys1"}
+        tables = [call.args[0] for call in client.session.post.call_args_list]
+        assert [url.rsplit("/api/now/", 1)[1] for url in tables] == [
+            f"table/{TABLE_GATEWAY_CI}",
+            "attachment/file",
+        ]
+        stats = client.raw_data_policy.get_stats()
+        assert stats["attachments_failed"] == 1
+        assert stats["attachments_uploaded"] == 0
+        # Digest not remembered, so the upload is retried on the next write
+        assert client.raw_data_policy.known_digests == {}
+
+    def test_update_replaces_previous_attachment(self):
+        """Test that a changed record keeps only its latest raw data upload."""
+        policy = RawDataPolicy(RawDataMode.ATTACHMENT)
+        client = MagicMock()
+        client.upload_attachment.return_value = {"sys_id": "att-new"}
+        client.query_records.return_value = [{"sys_id": "att-old"}]
+
+        policy.complete(client, TABLE, "sys1", policy.prepare(TABLE, _payload()))
+
+        query = client.query_records.call_args.kwargs["query"]
+        assert client.query_records.call_args.args == ("sys_attachment",)
+        assert "table_sys_id=sys1" in query
+        assert query.endswith("^sys_id!=att-new")
+        client.delete_attachment.assert_called_once_with("att-old")
+        assert policy.get_stats()["attachments_replaced"] == 1
+
+    def test_update_record_skips_unchanged_raw_data(self, client):
+        """Test that update_record omits raw data already stored."""
+        client.raw_data_policy = RawDataPolicy(
+            RawDataMode.ON_CHANGE,
+            known_digests={(TABLE, "client-1"): raw_data_digest(raw_data_bytes(RAW))},
+        )
+        client.session.put = MagicMock(return_value=_response({"result": {}}))
+
+        client.update_record(TABLE, "sys1", _payload())
+
+        body = client.session.put.call_args.kwargs["json"]
+        assert RAW_DATA_FIELD not in body
+        assert client.raw_data_policy.get_stats()["raw_skipped_unchanged"] == 1
@@ -0,0 +1,120 @@
+"""Unit tests for raw source JSON passthrough."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from beast_dream_snow_loader.models.raw import (
+    RawJSON,
+    attach_raw_json,
+    encode_json_body,
+    get_raw_json,
+)
+from beast_dream_snow_loader.models.servicenow import ServiceNowEndpoint
+from beast_dream_snow_loader.models.unifi import UniFiClient
+from beast_dream_snow_loader.servicenow.api_client import ServiceNowAPIClient
+from beast_dream_snow_loader.transformers.unifi_to_snow import (
+    transform_client,
+    transform_clients,
+)
+from beast_dream_snow_loader.unifi.ingest import read_clients
+from beast_dream_snow_loader.unifi.streaming import stream_clients
+
+RAW_CLIENT = b'{"hostname": "laptop", "ip": "192.168.1.10", "mac": "aa:bb:cc:dd:ee:01"}'
+
+
+class TestRawJSON:
+    """Test RawJSON wrapper and body encoding."""
+
+    def test_encode_splices_raw_bytes(self):
+        """Test that raw bytes appear verbatim in the encoded body."""
+        body = encode_json_body(
+            {"name": "laptop", "u_unifi_raw_data": RawJSON(RAW_CLIENT)}
+        )
+
+        assert RAW_CLIENT in body
+        assert json.loads(body) == {
+            "name": "laptop",
+            "u_unifi_raw_data": json.loads(RAW_CLIENT),
+        }
+
+    def test_encode_rejects_unknown_types(self):
+        """Test that non-JSON values still fail."""
+        with pytest.raises(TypeError):
+            encode_json_body({"value": object()})
+
+    def test_model_dump_modes(self):
+        """Test python-mode keeps the wrapper and JSON-mode decodes it."""
+        raw = RawJSON(RAW_CLIENT)
+        endpoint = ServiceNowEndpoint(
+            u_unifi_source_id="laptop",
+            hostname="laptop",
+            ip_address="192.168.1.10",
+            mac_address="aa:bb:cc:dd:ee:01",
+            u_unifi_raw_data=raw,
+        )
+
+        assert endpoint.model_dump()["u_unifi_raw_data"] is raw
+        assert endpoint.model_dump(mode="json")["u_unifi_raw_data"] == (
+            json.loads(RAW_CLIENT)
+        )
+
+
+class TestPassthrough:
+    """Test raw bytes flowing from ingestion to the request body."""
+
+    def test_transformers_pass_kept_bytes_through(self):
+        """Test that kept bytes are attached as-is, not re-dumped."""
+        client = attach_raw_json(
+            UniFiClient.model_validate_json(RAW_CLIENT), RAW_CLIENT
+        )
+
+        endpoint = transform_client(client)
+
+        assert endpoint.u_unifi_raw_data.data is RAW_CLIENT
+        assert transform_clients([client], trusted=True)[0].u_unifi_raw_data.data is (
+            RAW_CLIENT
+        )
+
+    def test_without_kept_bytes_raw_data_is_a_dump(self):
+        """Test the default behavior is unchanged."""
+        client = UniFiClient.model_validate_json(RAW_CLIENT)
+
+        assert get_raw_json(client) is None
+        assert transform_client(client).u_unifi_raw_data == client.model_dump()
+
+    def test_ingest_keep_raw(self):
+        """Test that bulk ingestion can keep per-record bytes."""
+        clients = read_clients(b'{"data": [' + RAW_CLIENT + b"]}", keep_raw=True)
+
+        assert bytes(get_raw_json(clients[0])) == RAW_CLIENT
+
+    def test_streaming_keep_raw(self, tmp_path):
+        """Test that streaming ingestion can keep per-record bytes."""
+        path = tmp_path / "clients.ndjson"
+        path.write_bytes(RAW_CLIENT + b"\n")
+
+        (client,) = stream_clients(path, keep_raw=True)
+
+        assert bytes(get_raw_json(client)) == RAW_CLIENT
+
+    def test_api_client_sends_spliced_body(self):
+        """Test that create_record posts pre-encoded bytes with raw data."""
+        api_client = ServiceNowAPIClient(
+            instance="dev12345.service-now.com", username="u", api_key="k"
+        )
+        response = MagicMock(status_code=201, headers={})
+        response.json.return_value = {"result": {"sys_id": "abc"}}
+        api_client.session = MagicMock()
+        api_client.session.post.return_value = response
+        client = attach_raw_json(
+            UniFiClient.model_validate_json(RAW_CLIENT), RAW_CLIENT
+        )
+        payload = transform_client(client).model_dump(exclude_none=True)
+
+        api_client.create_record("cmdb_ci", payload)
+
+        body = api_client.session.post.call_args.kwargs["data"]
+        assert RAW_CLIENT in body
+        assert json.loads(body)["hostname"] == "laptop"
@@ -0,0 +1,213 @@
+"""Unit tests for stale CI reconciliation."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from beast_dream_snow_loader.models.servicenow import ServiceNowEndpoint
+from beast_dream_snow_loader.servicenow.loader import (
+    TABLE_ENDPOINT,
+    TABLE_GATEWAY_CI,
+    TABLE_LOCATION,
+)
+from beast_dream_snow_loader.servicenow.reconciliation import (
+    INSTALL_STATUS_RETIRED,
+    ReconcileAction,
+    StaleRecordThresholdError,
+    build_source_snapshot,
+    find_stale_records,
+    reconcile_stale_records,
+    rekey_source_ids,
+)
+from beast_dream_snow_loader.transformers.columnar import (
+    ClientColumns,
+    canonical_source_id_rekeys,
+    transform_client_columns,
+)
+
+
+def _mock_client(records: list[dict]) -> MagicMock:
+    """Build a mock API client streaming the given projected records."""
+    client = MagicMock()
+    client.iter_records.side_effect = lambda *args, **kwargs: iter(records)
+    client.batch_requests.side_effect = lambda rest_requests: [
+        {"status_code": 200, "result": {}} for _ in rest_requests
+    ]
+    return client
+
+
+def _records(count: int) -> list[dict]:
+    """Build projected (sys_id, u_unifi_source_id) records."""
+    return [
+        {"sys_id": f"sys-{i}", "u_unifi_source_id": f"client-{i}"} for i in range(count)
+    ]
+
+
+class TestFindStaleRecords:
+    """Test orphan detection."""
+
+    def test_orphans_are_set_difference_with_snapshot(self):
+        """Test that only records missing from the snapshot are orphans."""
+        client = _mock_client(_records(4))
+
+        stale = find_stale_records(
+            client, TABLE_ENDPOINT, {"client-0", "client-1", "client-2"}
+        )
+
+        assert stale.total == 4
+        assert stale.orphans == [("sys-3", "client-3")]
+
+    def test_query_projects_only_needed_fields(self):
+        """Test that only sys_id and source id are requested."""
+        client = _mock_client([])
+
+        find_stale_records(client, TABLE_LOCATION, set())
+
+        args, kwargs = client.iter_records.call_args
+        assert args[0] == "cmdb_ci"
+        assert kwargs["fields"] == ["sys_id", "u_unifi_source_id"]
+        assert "sys_class_name=cmdb_ci_site" in kwargs["query"]
+        assert f"install_status!={INSTALL_STATUS_RETIRED}" in kwargs["query"]
+
+
+class TestReconcileStaleRecords:
+    """Test bulk retire/delete with safety threshold."""
+
+    def test_orphans_are_retired_in_bulk(self):
+        """Test that orphans are retired through the Batch API."""
+        client = _mock_client(_records(20))
+        snapshot = {TABLE_ENDPOINT: {f"client-{i}" for i in range(18)}}
+
+        result = reconcile_stale_records(client, snapshot, max_removal_fraction=0.2)
+
+        assert result.removed == {TABLE_ENDPOINT: 2}
+        client.batch_requests.assert_called_once()
+        rest_requests = client.batch_requests.call_args.args[0]
+        assert [r["method"] for r in rest_requests] == ["PATCH", "PATCH"]
+        assert rest_requests[0]["body"] == {"install_status": INSTALL_STATUS_RETIRED}
+
+    def test_delete_action_sends_delete_requests(self):
+        """Test that delete mode issues DELETE requests."""
+        client = _mock_client(_records(10))
+        snapshot = {TABLE_ENDPOINT: {f"client-{i}" for i in range(9)}}
+
+        reconcile_stale_records(
+            client, snapshot, action=ReconcileAction.DELETE, max_removal_fraction=0.5
+        )
+
+        rest_requests = client.batch_requests.call_args.args[0]
+        assert rest_requests == [
+            {"method": "DELETE", "path": "/table/cmdb_ci/sys-9"},
+        ]
+
+    def test_threshold_aborts_before_any_write(self):
+        """Test that exceeding the safety threshold removes nothing."""
+        client = _mock_client(_records(10))
+        snapshot = {TABLE_ENDPOINT: {"client-0"}}
+
+        with pytest.raises(StaleRecordThresholdError):
+            reconcile_stale_records(client, snapshot, max_removal_fraction=0.1)
+
+        client.batch_requests.assert_not_called()
+
+    def test_dry_run_reports_without_writing(self):
+        """Test that dry run only reports orphans."""
+        client = _mock_client(_records(10))
+        snapshot = {TABLE_ENDPOINT: {f"client-{i}" for i in range(9)}}
+
+        result = reconcile_stale_records(client, snapshot, dry_run=True)
+
+        assert len(result.stale[TABLE_ENDPOINT].orphans) == 1
+        client.batch_requests.assert_not_called()
+
+    def test_failed_requests_are_reported(self):
+        """Test that unserviced or failed requests are reported per target."""
+        client = _mock_client(_records(10))
+        client.batch_requests.side_effect = lambda rest_requests: [
+            {"status_code": None, "result": None} for _ in rest_requests
+        ]
+        snapshot = {TABLE_ENDPOINT: {f"client-{i}" for i in range(9)}}
+
+        result = reconcile_stale_records(client, snapshot)
+
+        assert result.removed == {TABLE_ENDPOINT: 0}
+        assert result.failed == {TABLE_ENDPOINT: ["sys-9"]}
+
+
+class TestRekeySourceIds:
+    """Test migrating existing CIs to new source ids."""
+
+    # An existing endpoint keyed by the MAC exactly as UniFi reported it
+    EXISTING = [{"sys_id": "sys-mac", "u_unifi_source_id": "AA-BB-CC-DD-EE-03"}]
+    CLIENT = {"hostname": "", "ip": "10.0.0.2", "mac": "AA-BB-CC-DD-EE-03"}
+
+    def _source_ids(self, canonical_source_ids: bool) -> set[str]:
+        rows = transform_client_columns(
+            ClientColumns.from_records([self.CLIENT]),
+            canonical_source_ids=canonical_source_ids,
+        )
+        return {row["u_unifi_source_id"] for row in rows}
+
+    def test_existing_uppercase_mac_record_is_not_orphaned(self):
+        """Test that the default fallback keeps matching the existing CI."""
+        client = _mock_client(self.EXISTING)
+
+        stale = find_stale_records(client, TABLE_ENDPOINT, self._source_ids(False))
+
+        assert stale.orphans == []
+
+    def test_rekey_before_switching_to_canonical_source_ids(self):
+        """Test that re-keyed CIs match the canonical source ids."""
+        client = _mock_client(self.EXISTING)
+        rekeys = canonical_source_id_rekeys(ClientColumns.from_records([self.CLIENT]))
+
+        assert rekey_source_ids(client, rekeys) == (1, [])
+        assert client.batch_requests.call_args.args[0] == [
+            {
+                "method": "PATCH",
+                "path": "/table/cmdb_ci/sys-mac",
+                "body": {"u_unifi_source_id": "aa:bb:cc:dd:ee:03"},
+            }
+        ]
+
+        renamed = [{"sys_id": "sys-mac", "u_unifi_source_id": "aa:bb:cc:dd:ee:03"}]
+        stale = find_stale_records(
+            _mock_client(renamed), TABLE_ENDPOINT, self._source_ids(True)
+        )
+        assert stale.orphans == []
+
+    def test_taken_source_id_is_not_overwritten(self):
+        """Test that a CI is not re-keyed onto a source id already in use."""
+        client = _mock_client(
+            self.EXISTING
+            + [{"sys_id": "sys-dup", "u_unifi_source_id": "aa:bb:cc:dd:ee:03"}]
+        )
+
+        assert rekey_source_ids(client, {"AA-BB-CC-DD-EE-03": "aa:bb:cc:dd:ee:03"}) == (
+            0,
+            ["sys-mac"],
+        )
+        client.batch_requests.assert_not_called()
+
+
+class TestBuildSourceSnapshot:
+    """Test snapshot construction from outbound models."""
+
+    def test_snapshot_groups_source_ids_by_class(self):
+        """Test that source ids are grouped by loader class."""
+        endpoint = ServiceNowEndpoint(
+            u_unifi_source_id="laptop",
+            hostname="laptop",
+            ip_address="192.168.1.10",
+            mac_address="aa:bb:cc:dd:ee:ff",
+        )
+
+        snapshot = build_source_snapshot(endpoints=[endpoint])
+
+        assert snapshot == {TABLE_ENDPOINT: {"laptop"}}
+
+    def test_empty_list_is_kept_in_snapshot(self):
+        """Test that an explicitly empty class is still reconciled."""
+        snapshot = build_source_snapshot(gateways=[], endpoints=[])
+
+        assert snapshot == {TABLE_GATEWAY_CI: set(), TABLE_ENDPOINT: set()}
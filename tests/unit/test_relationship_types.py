@@ -0,0 +1,111 @@
+"""Unit tests for relationship type resolution."""
+
+import json
+from unittest.mock import MagicMock
+
+from beast_dream_snow_loader.servicenow.relationship_types import (
+    LOADER_RELATIONSHIP_TYPES,
+    REL_TYPE_LOCATED_IN,
+    REL_TYPE_MANAGED_BY,
+    TABLE_RELATIONSHIP_TYPE,
+    RelationshipTypeResolver,
+)
+
+
+def _mock_client() -> MagicMock:
+    """Build a mock API client returning two of the three loader types."""
+    client = MagicMock()
+    client.instance = "dev12345.service-now.com"
+    client.query_records.return_value = [
+        {"name": REL_TYPE_MANAGED_BY, "sys_id": "rel_managed"},
+        {"name": REL_TYPE_LOCATED_IN, "sys_id": "rel_located"},
+    ]
+    return client
+
+
+class TestRelationshipTypeResolver:
+    """Test RelationshipTypeResolver."""
+
+    def test_resolves_all_names_with_one_query(self, tmp_path):
+        """Test that missing names are resolved in a single bulk query."""
+        client = _mock_client()
+        resolver = RelationshipTypeResolver(client, cache_path=tmp_path / "c.json")
+
+        result = resolver.resolve(LOADER_RELATIONSHIP_TYPES)
+
+        assert result == {
+            REL_TYPE_MANAGED_BY: "rel_managed",
+            REL_TYPE_LOCATED_IN: "rel_located",
+        }
+        client.query_records.assert_called_once()
+        table = client.query_records.call_args.args[0]
+        query = client.query_records.call_args.kwargs["query"]
+        assert table == TABLE_RELATIONSHIP_TYPE
+        assert query.startswith("nameIN")
+        assert REL_TYPE_MANAGED_BY in query
+
+    def test_cached_names_are_not_queried_again(self, tmp_path):
+        """Test that resolved names are served from memory."""
+        client = _mock_client()
+        resolver = RelationshipTypeResolver(client, cache_path=tmp_path / "c.json")
+
+        resolver.resolve([REL_TYPE_MANAGED_BY])
+        resolver.resolve([REL_TYPE_MANAGED_BY])
+
+        assert client.query_records.call_count == 1
+        assert resolver.get(REL_TYPE_MANAGED_BY) == "rel_managed"
+
+    def test_disk_cache_is_reused_across_runs(self, tmp_path):
+        """Test that a new resolver loads cached ids from disk."""
+        cache_path = tmp_path / "c.json"
+        RelationshipTypeResolver(_mock_client(), cache_path=cache_path).resolve(
+            [REL_TYPE_MANAGED_BY]
+        )
+
+        client = _mock_client()
+        resolver = RelationshipTypeResolver(client, cache_path=cache_path)
+        result = resolver.resolve([REL_TYPE_MANAGED_BY])
+
+        assert result == {REL_TYPE_MANAGED_BY: "rel_managed"}
+        client.query_records.assert_not_called()
+        cache = json.loads(cache_path.read_text())
+        assert cache["dev12345.service-now.com"][REL_TYPE_MANAGED_BY] == "rel_managed"
+
+    def test_disk_cache_can_be_disabled(self, tmp_path):
+        """Test that no file is written when disk cache is disabled."""
+        cache_path = tmp_path / "c.json"
+        resolver = RelationshipTypeResolver(
+            _mock_client(), cache_path=cache_path, use_disk_cache=False
+        )
+
+        resolver.resolve([REL_TYPE_MANAGED_BY])
+
+        assert not cache_path.exists()
+
+    def test_disk_cache_is_opt_in(self, tmp_path, monkeypatch):
+        """Test that the default resolver writes nothing to disk."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+
+        RelationshipTypeResolver(_mock_client()).resolve([REL_TYPE_MANAGED_BY])
+
+        assert not any(tmp_path.rglob("*.json"))
+
+    def test_failed_write_keeps_existing_cache(self, tmp_path, monkeypatch):
+        """Test that a serialization error never truncates the cache file."""
+        cache_path = tmp_path / "c.json"
+        cache_path.write_text('{"other.service-now.com": {"a": "b"}}')
+
+        def _fail(*args, **kwargs):
+            raise TypeError("not serializable")
+
+        monkeypatch.setattr(
+            "beast_dream_snow_loader.servicenow.relationship_types.json.dumps", _fail
+        )
+        RelationshipTypeResolver(_mock_client(), cache_path=cache_path).resolve(
+            [REL_TYPE_MANAGED_BY]
+        )
+
+        assert json.loads(cache_path.read_text()) == {
+            "other.service-now.com": {"a": "b"}
+        }
+        assert [p.name for p in tmp_path.iterdir()] == ["c.json"]
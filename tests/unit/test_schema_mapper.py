@@ -2,6 +2,8 @@
 
 from beast_dream_snow_loader.transformers.schema_mapper import (
     FieldMappingConfig,
+    apply_field_mapping,
+    compile_field_mapping,
     flatten_nested_field,
     get_field_mapping,
 )
@@ -95,3 +97,49 @@ class TestFieldFlattening:
         target = get_field_mapping("nonexistent.field", mappings)
         # Should return None or use flattening as fallback
         assert target is None or isinstance(target, str)
+
+
+class TestCompileFieldMapping:
+    """Test compiled field mapping extractors."""
+
+    SOURCES = [
+        {
+            "id": "host-1",
+            "ipAddress": "192.168.1.1",
+            "reportedState": {
+                "hostname": "udm-pro",
+                "version": None,
+                "hardware": {"mac": "aa:bb:cc:dd:ee:ff", "serialno": 12345},
+                "features": {"a": 1},
+            },
+        },
+        {"id": "host-2", "reportedState": "not-a-dict"},
+        {"id": "host-3", "reportedState": {"hardware": None}},
+        {},
+    ]
+
+    def test_compiled_output_matches_apply_field_mapping(self):
+        """Test identical output to the interpreted mapping."""
+        mappings = FieldMappingConfig().get_host_mappings()
+        mappings["reportedState.features"] = "features"
+        extract = compile_field_mapping(mappings)
+
+        for source in self.SOURCES:
+            assert extract(source) == apply_field_mapping(source, mappings)
+
+    def test_compiled_preserves_leaf_coercion(self):
+        """Test that None and container leaves are str()-ed like the original."""
+        extract = compile_field_mapping(
+            {"reportedState.version": "version", "reportedState.features": "f"}
+        )
+
+        result = extract(self.SOURCES[0])
+
+        assert result == {"version": "None", "f": "{'a': 1}"}
+
+    def test_compiled_later_mapping_wins_on_duplicate_target(self):
+        """Test that duplicate targets resolve in mapping order."""
+        mappings = {"id": "name", "reportedState.hostname": "name"}
+
+        assert compile_field_mapping(mappings)(self.SOURCES[0]) == {"name": "udm-pro"}
+        assert apply_field_mapping(self.SOURCES[0], mappings) == {"name": "udm-pro"}
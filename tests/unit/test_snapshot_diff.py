@@ -0,0 +1,167 @@
+"""Unit tests for the snapshot diff engine."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from beast_dream_snow_loader.models.servicenow import ServiceNowEndpoint
+from beast_dream_snow_loader.models.unifi import UniFiClient
+from beast_dream_snow_loader.servicenow.loader import TABLE_ENDPOINT, TABLE_LOCATION
+from beast_dream_snow_loader.servicenow.relationship_types import (
+    REL_TYPE_LOCATED_IN,
+    RelationshipTypeResolver,
+)
+from beast_dream_snow_loader.servicenow.snapshot_diff import (
+    DiffKind,
+    FieldChange,
+    apply_change_set,
+    diff_records,
+    diff_snapshots,
+    unifi_snapshot,
+)
+
+
+def _endpoint(i: int, ip: str | None = None, **kwargs) -> ServiceNowEndpoint:
+    return ServiceNowEndpoint(
+        u_unifi_source_id=f"client-{i}",
+        hostname=f"client-{i}",
+        ip_address=ip or f"10.0.0.{i}",
+        mac_address=f"aa:bb:cc:dd:ee:{i:02x}",
+        **kwargs,
+    )
+
+
+OLD = [_endpoint(0), _endpoint(1), _endpoint(2, device_type="phone")]
+NEW = [_endpoint(3), _endpoint(2), _endpoint(1, ip="10.0.1.1")]
+
+
+class TestDiffRecords:
+    """Test per-record classification."""
+
+    @pytest.mark.parametrize("presorted", [False, True])
+    def test_classification(self, presorted):
+        """Test added, removed, modified and unchanged records."""
+        new = sorted(NEW, key=lambda e: e.u_unifi_source_id) if presorted else NEW
+
+        diffs = {
+            d.source_id: d
+            for d in diff_records(TABLE_ENDPOINT, OLD, new, presorted=presorted)
+        }
+
+        assert {s: d.kind for s, d in diffs.items()} == {
+            "client-0": DiffKind.REMOVED,
+            "client-1": DiffKind.MODIFIED,
+            "client-2": DiffKind.MODIFIED,
+            "client-3": DiffKind.ADDED,
+        }
+        assert diffs["client-1"].changes == [
+            FieldChange("ip_address", "10.0.0.1", "10.0.1.1")
+        ]
+        assert diffs["client-2"].changes == [FieldChange("device_type", "phone", None)]
+        assert diffs["client-3"].record is NEW[0]
+
+    def test_unchanged(self):
+        """Test that equal records (models or payload dicts) are unchanged."""
+        old = [_endpoint(0).model_dump(exclude_none=True)]
+
+        (diff,) = diff_records(TABLE_ENDPOINT, old, [_endpoint(0)])
+
+        assert diff.kind is DiffKind.UNCHANGED
+        assert diff.changes == []
+
+    def test_unsorted_input_rejected(self):
+        """Test that presorted mode checks the order."""
+        with pytest.raises(ValueError):
+            list(diff_records(TABLE_ENDPOINT, [], NEW, presorted=True))
+
+
+class TestChangeSet:
+    """Test change set building and application."""
+
+    def test_minimal_change_set(self):
+        """Test that only changed fields are kept, and cleared fields are empty."""
+        change_set = diff_snapshots({TABLE_ENDPOINT: OLD}, {TABLE_ENDPOINT: NEW})
+
+        assert change_set.added == {TABLE_ENDPOINT: [NEW[0]]}
+        assert change_set.modified == {
+            TABLE_ENDPOINT: {
+                "client-1": {"ip_address": "10.0.1.1"},
+                "client-2": {"device_type": ""},
+            }
+        }
+        assert change_set.removed == {TABLE_ENDPOINT: ["client-0"]}
+        assert change_set.summary() == {
+            TABLE_ENDPOINT: {"added": 1, "modified": 2, "removed": 1, "unchanged": 0}
+        }
+
+    def test_identical_snapshots_are_empty(self):
+        """Test that an unchanged inventory needs no writes."""
+        clients = [
+            UniFiClient(hostname="laptop", ip="10.0.0.5", mac="aa:bb:cc:dd:ee:ff")
+        ]
+
+        change_set = diff_snapshots(
+            unifi_snapshot(clients=clients), unifi_snapshot(clients=clients)
+        )
+
+        assert change_set.is_empty
+        assert change_set.summary() == {
+            TABLE_ENDPOINT: {"added": 0, "modified": 0, "removed": 0, "unchanged": 1}
+        }
+
+    def test_apply_change_set(self):
+        """Test that the loader creates, patches and retires as needed."""
+        client = MagicMock()
+        client.get_current_changeset.return_value = None
+        client.create_record.return_value = {"sys_id": "sys-3"}
+        client.batch_requests.side_effect = lambda rest_requests: [
+            {"status_code": 200} for _ in rest_requests
+        ]
+        id_mapping = {
+            TABLE_ENDPOINT: {"client-0": "sys-0", "client-1": "sys-1"},
+        }
+        change_set = diff_snapshots({TABLE_ENDPOINT: OLD}, {TABLE_ENDPOINT: NEW})
+        resolver = RelationshipTypeResolver(client, use_disk_cache=False)
+
+        result = apply_change_set(
+            client, change_set, id_mapping, relationship_types=resolver
+        )
+
+        client.patch_record.assert_called_once_with(
+            TABLE_ENDPOINT, "sys-1", {"ip_address": "10.0.1.1"}
+        )
+        (rest_requests,) = client.batch_requests.call_args.args
+        assert [r["path"] for r in rest_requests] == [f"/table/{TABLE_ENDPOINT}/sys-0"]
+        assert result.created == {TABLE_ENDPOINT: 1}
+        assert result.updated == {TABLE_ENDPOINT: 1}
+        assert result.removed == {TABLE_ENDPOINT: 1}
+        assert result.unmapped == {TABLE_ENDPOINT: ["client-2"]}
+        assert id_mapping[TABLE_ENDPOINT] == {"client-1": "sys-1", "client-3": "sys-3"}
+
+    def test_added_records_link_to_existing_parents(self):
+        """Test that a new endpoint is related to a site from an earlier load."""
+        client = MagicMock()
+        client.get_current_changeset.return_value = None
+        client.create_record.return_value = {"sys_id": "sys-new"}
+        client.query_records.return_value = [
+            {"name": REL_TYPE_LOCATED_IN, "sys_id": "rel_located"}
+        ]
+        id_mapping = {TABLE_LOCATION: {"site-1": "site-sys"}, TABLE_ENDPOINT: {}}
+        change_set = diff_snapshots(
+            {TABLE_ENDPOINT: []}, {TABLE_ENDPOINT: [_endpoint(4, site_id="site-1")]}
+        )
+        resolver = RelationshipTypeResolver(client, use_disk_cache=False)
+
+        result = apply_change_set(
+            client, change_set, id_mapping, relationship_types=resolver
+        )
+
+        client.create_record.assert_called_with(
+            "cmdb_rel_ci",
+            {"parent": "site-sys", "child": "sys-new", "type": "rel_located"},
+        )
+        assert result.created == {TABLE_ENDPOINT: 1}
+        assert id_mapping == {
+            TABLE_LOCATION: {"site-1": "site-sys"},
+            TABLE_ENDPOINT: {"client-4": "sys-new"},
+        }
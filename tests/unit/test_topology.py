@@ -0,0 +1,194 @@
+"""Unit tests for the topology enrichment index."""
+
+import json
+
+from beast_dream_snow_loader.models.unifi import (
+    UniFiClient,
+    UniFiDevice,
+    UniFiHost,
+    UniFiSite,
+)
+from beast_dream_snow_loader.transformers.topology import TopologyIndex
+from beast_dream_snow_loader.transformers.unifi_to_snow import (
+    transform_client,
+    transform_device,
+)
+from beast_dream_snow_loader.unifi.ingest import read_clients, read_devices
+
+COUNTS = dict.fromkeys(
+    (
+        "criticalNotification",
+        "gatewayDevice",
+        "guestClient",
+        "lanConfiguration",
+        "offlineDevice",
+        "offlineGatewayDevice",
+        "offlineWifiDevice",
+        "offlineWiredDevice",
+        "pendingUpdateDevice",
+        "totalDevice",
+        "wanConfiguration",
+        "wifiClient",
+        "wifiConfiguration",
+        "wifiDevice",
+        "wiredClient",
+        "wiredDevice",
+    ),
+    0,
+)
+
+
+def _host(host_id: str, mac: str) -> UniFiHost:
+    return UniFiHost(
+        id=host_id,
+        hardwareId="hw",
+        type="console",
+        ipAddress="10.0.0.1",
+        owner=True,
+        isBlocked=False,
+        registrationTime="2025-01-01T00:00:00Z",
+        lastConnectionStateChange="2025-01-01T00:00:00Z",
+        latestBackupTime="2025-01-01T00:00:00Z",
+        reportedState={
+            "controller_uuid": "uuid",
+            "host_type": 1,
+            "hostname": "udm",
+            "mgmt_port": 443,
+            "name": "UDM",
+            "state": "connected",
+            "version": "4.0.6",
+            "hardware": {"mac": mac},
+        },
+        userData={"status": "ACTIVE"},
+    )
+
+
+def _site(site_id: str, host_id: str, name: str = "default") -> UniFiSite:
+    return UniFiSite(
+        siteId=site_id,
+        hostId=host_id,
+        permission="admin",
+        isOwner=True,
+        meta={"desc": name, "name": name, "timezone": "UTC"},
+        statistics={"counts": COUNTS},
+    )
+
+
+def _index() -> TopologyIndex:
+    return TopologyIndex.build(
+        hosts=[_host("host-1", "AA:AA:AA:AA:AA:01"), _host("host-2", "")],
+        sites=[
+            _site("site-1", "host-1"),
+            _site("site-2a", "host-2", "branch"),
+            _site("site-2b", "host-2", "default"),
+        ],
+        devices=[
+            UniFiDevice(hostId="host-1", updatedAt="now", mac="BB-BB-BB-BB-BB-01")
+        ],
+    )
+
+
+class TestTopologyIndex:
+    """Test index lookups."""
+
+    def test_site_for_host(self):
+        """Test only-site and default-site resolution."""
+        index = _index()
+
+        assert index.host_sites == {
+            "host-1": ["site-1"],
+            "host-2": ["site-2a", "site-2b"],
+        }
+        assert index.site_for_host("host-1") == "site-1"
+        assert index.site_for_host("host-2") == "site-2b"
+        assert index.site_for_host("unknown") is None
+
+    def test_resolve_uplink(self):
+        """Test device and gateway uplink MACs."""
+        index = _index()
+
+        assert index.resolve_uplink("bb:bb:bb:bb:bb:01") == ("host-1", "host-1")
+        assert index.resolve_uplink("aa:aa:aa:aa:aa:01") == (None, "host-1")
+        assert index.resolve_uplink("cc:cc:cc:cc:cc:01") == (None, None)
+
+
+class TestEnrichment:
+    """Test device and client enrichment."""
+
+    def test_devices_get_site_id(self):
+        """Test that devices get their host's site, explicit siteId wins."""
+        devices = [
+            UniFiDevice(hostId="host-1", updatedAt="now"),
+            UniFiDevice(hostId="host-1", updatedAt="now", siteId="explicit"),
+        ]
+
+        enriched = _index().enrich_devices(devices)
+
+        assert [transform_device(d).site_id for d in enriched] == [
+            "site-1",
+            "explicit",
+        ]
+        assert enriched[1] is devices[1]
+
+    def test_clients_get_device_and_site_ids(self):
+        """Test client enrichment from the uplink MAC."""
+        clients = [
+            UniFiClient(
+                hostname="laptop",
+                ip="10.0.0.2",
+                mac="m1",
+                uplinkMac="bb:bb:bb:bb:bb:01",
+            ),
+            UniFiClient(hostname="tv", ip="10.0.0.3", mac="m2", ap_mac="AAAAAAAAAA01"),
+            UniFiClient(hostname="nas", ip="10.0.0.4", mac="m3", siteId="site-x"),
+        ]
+
+        enriched = _index().enrich_clients(clients)
+
+        endpoints = [transform_client(c) for c in enriched]
+        assert [(e.device_id, e.site_id) for e in endpoints] == [
+            ("host-1", "site-1"),
+            (None, "site-1"),
+            (None, "site-x"),
+        ]
+        assert enriched[2] is clients[2]
+
+    def test_lean_ingestion_keeps_topology_fields(self):
+        """Test that lean models keep the fields enrichment reads."""
+        devices = read_devices(
+            json.dumps(
+                [
+                    {"hostId": "host-1", "updatedAt": "now", "siteId": "explicit"},
+                    {
+                        "hostId": "host-1",
+                        "updatedAt": "now",
+                        "mac": "bb:bb:bb:00:00:02",
+                    },
+                ]
+            ).encode(),
+            lean=True,
+        )
+        clients = read_clients(
+            json.dumps(
+                [
+                    {
+                        "hostname": "laptop",
+                        "ip": "10.0.0.2",
+                        "mac": "m1",
+                        "uplinkMac": "bb:bb:bb:bb:bb:01",
+                        "fingerprint": {"dev_id": 1},
+                    },
+                    {"hostname": "tv", "ip": "10.0.0.3", "mac": "m2", "apMac": "x"},
+                ]
+            ).encode(),
+            lean=True,
+        )
+
+        enriched_devices = _index().enrich_devices(devices)
+        enriched_clients = _index().enrich_clients(clients)
+
+        assert transform_device(enriched_devices[0]).site_id == "explicit"
+        assert "mac" in enriched_devices[1].model_extra
+        assert transform_client(enriched_clients[0]).device_id == "host-1"
+        assert enriched_clients[1].model_extra["apMac"] == "x"
+        assert "fingerprint" not in enriched_clients[0].model_extra
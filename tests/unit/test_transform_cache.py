@@ -0,0 +1,81 @@
+"""Unit tests for the transform result cache."""
+
+import json
+
+import pytest
+
+from beast_dream_snow_loader.models.raw import RawJSON
+from beast_dream_snow_loader.transformers.cache import TransformCache, content_key
+
+
+def _client_json(hostname: str, **fields) -> bytes:
+    return json.dumps(
+        {"hostname": hostname, "ip": "10.0.0.1", "mac": "aa:bb:cc:dd:ee:01", **fields}
+    ).encode()
+
+
+class TestContentKey:
+    """Test cache keys."""
+
+    def test_dict_keys_are_canonical(self):
+        """Test that key order does not change a dict's key."""
+        assert content_key({"a": 1, "b": 2}) == content_key({"b": 2, "a": 1})
+
+    def test_bytes_and_raw_json_match(self):
+        """Test that RawJSON keys on its bytes."""
+        data = _client_json("a")
+
+        assert content_key(RawJSON(data)) == content_key(data)
+        assert content_key(data) != content_key(_client_json("b"))
+
+
+class TestTransformCache:
+    """Test cached transformation."""
+
+    def test_unchanged_records_hit(self):
+        """Test that a second cycle reuses the first cycle's models."""
+        cache = TransformCache()
+        records = [_client_json("a"), _client_json("b")]
+
+        first = cache.transform(records)
+        second = cache.transform([records[0], _client_json("b", siteId="s")])
+
+        assert second[0] is first[0]
+        assert second[1].site_id == "s"
+        assert (cache.stats.hits, cache.stats.misses) == (1, 3)
+        assert cache.stats.hit_rate_percent == 25.0
+
+    def test_duplicates_in_one_batch_are_transformed_once(self):
+        """Test that identical records share one model."""
+        cache = TransformCache()
+
+        endpoints = cache.transform([_client_json("a"), _client_json("a")])
+
+        assert endpoints[0] is endpoints[1]
+        assert len(cache) == 1
+
+    def test_lru_eviction(self):
+        """Test the size bound, including batches larger than the cache."""
+        cache = TransformCache(max_entries=1)
+
+        endpoints = cache.transform([_client_json("a"), _client_json("b")])
+
+        assert [e.hostname for e in endpoints] == ["a", "b"]
+        assert len(cache) == 1
+        assert cache.stats.evictions == 1
+
+    def test_keep_raw_and_dict_records(self):
+        """Test raw bytes passthrough and dict input."""
+        cache = TransformCache()
+        data = _client_json("a")
+
+        (endpoint,) = cache.transform([data], keep_raw=True)
+        (from_dict,) = cache.transform([json.loads(data)], entity="client")
+
+        assert endpoint.u_unifi_raw_data == RawJSON(data)
+        assert from_dict.hostname == "a"
+
+    def test_invalid_max_entries(self):
+        """Test that a non-positive size bound is rejected."""
+        with pytest.raises(ValueError):
+            TransformCache(max_entries=0)
@@ -1,5 +1,9 @@
 """Unit tests for UniFi to ServiceNow transformation functions."""
 
+import pytest
+from pydantic import ValidationError
+
+from beast_dream_snow_loader.models.compact import CompactEndpoint
 from beast_dream_snow_loader.models.servicenow import (
     ServiceNowEndpoint,
     ServiceNowGatewayCI,
@@ -14,9 +18,13 @@ from beast_dream_snow_loader.models.unifi import (
 )
 from beast_dream_snow_loader.transformers.unifi_to_snow import (
     transform_client,
+    transform_clients,
     transform_device,
+    transform_devices,
     transform_host,
+    transform_hosts,
     transform_site,
+    transform_sites,
 )
 
 
@@ -407,3 +415,188 @@ class TestTransformClient:
         assert result.hostname is not None
         assert result.ip_address is not None
         assert result.mac_address is not None
+
+
+class TestBatchTransformers:
+    """Test batch transform functions."""
+
+    def test_transform_hosts_matches_per_record(self):
+        """Test that batch host output equals per-record output."""
+        hosts = [
+            UniFiHost(
+                id=f"host-{i}",
+                hardwareId="UDM-Pro",
+                type="gateway",
+                ipAddress=f"192.168.1.{i}",
+                owner=True,
+                isBlocked=False,
+                registrationTime="1700000000",
+                lastConnectionStateChange="1700000000",
+                latestBackupTime="1700000000",
+                reportedState={
+                    "controller_uuid": "uuid-123",
+                    "host_type": 1,
+                    "hostname": f"udm-{i}",
+                    "mgmt_port": 8080,
+                    "name": "UDM-Pro",
+                    "state": "CONNECTED",
+                    "version": "1.12.33",
+                    "hardware": {"mac": "aa:bb:cc:dd:ee:ff", "serialno": "SN1"},
+                },
+                userData={"status": "ACTIVE"},
+            )
+            for i in range(3)
+        ]
+
+        results = transform_hosts(iter(hosts))
+
+        assert results == [transform_host(host) for host in hosts]
+        assert results[0].u_unifi_raw_data == hosts[0].model_dump()
+
+    def test_transform_sites_matches_per_record(self):
+        """Test that batch site output equals per-record output."""
+        counts = dict.fromkeys(
+            [
+                "criticalNotification",
+                "gatewayDevice",
+                "guestClient",
+                "lanConfiguration",
+                "offlineDevice",
+                "offlineGatewayDevice",
+                "offlineWifiDevice",
+                "offlineWiredDevice",
+                "pendingUpdateDevice",
+                "totalDevice",
+                "wanConfiguration",
+                "wifiClient",
+                "wifiConfiguration",
+                "wifiDevice",
+                "wiredClient",
+                "wiredDevice",
+            ],
+            0,
+        )
+        sites = [
+            UniFiSite(
+                siteId=f"site-{i}",
+                hostId="host-1",
+                permission="read",
+                isOwner=True,
+                meta={"desc": "Site", "name": f"Site {i}", "timezone": "UTC"},
+                statistics={"counts": counts},
+            )
+            for i in range(3)
+        ]
+
+        assert transform_sites(sites) == [transform_site(site) for site in sites]
+
+    def test_transform_devices_matches_per_record(self):
+        """Test that batch device output equals per-record output."""
+        devices = [
+            UniFiDevice(hostId="device-1", updatedAt="2025-01-01T00:00:00Z"),
+            UniFiDevice(
+                hostId="device-2",
+                updatedAt="2025-01-01T00:00:00Z",
+                mac="00:11:22:33:44:55",
+                model="USW-Pro-48",
+            ),
+        ]
+
+        results = transform_devices(devices)
+
+        assert results == [transform_device(device) for device in devices]
+        assert results[0].mac_address == "unknown"
+
+    def test_transform_clients_matches_per_record(self):
+        """Test that batch client output equals per-record output."""
+        clients = [
+            UniFiClient(hostname="laptop", ip="192.168.1.10", mac="aa:bb:cc:dd:ee:01"),
+            UniFiClient(
+                hostname="phone",
+                ip="192.168.1.11",
+                mac="aa:bb:cc:dd:ee:02",
+                deviceType="phone",
+                siteId="site-1",
+            ),
+        ]
+
+        assert transform_clients(clients) == [
+            transform_client(client) for client in clients
+        ]
+
+    def test_empty_batches(self):
+        """Test that empty input yields empty output."""
+        assert transform_hosts([]) == []
+        assert transform_clients([]) == []
+
+
+class TestTrustedMode:
+    """Test trusted-input batch transforms."""
+
+    def _clients(self, count: int) -> list[UniFiClient]:
+        return [
+            UniFiClient(
+                hostname=f"client-{i}",
+                ip=f"192.168.1.{i}",
+                mac=f"aa:bb:cc:dd:ee:{i:02x}",
+                siteId="site-1",
+            )
+            for i in range(count)
+        ]
+
+    def test_trusted_output_matches_validated(self):
+        """Test that trusted mode builds compact records of the same payloads."""
+        clients = self._clients(5)
+
+        trusted = transform_clients(clients, trusted=True, validate_every=2)
+
+        assert all(isinstance(record, CompactEndpoint) for record in trusted)
+        assert [record.to_payload() for record in trusted] == [
+            model.model_dump(exclude_none=True) for model in transform_clients(clients)
+        ]
+
+    @pytest.mark.filterwarnings("ignore::UserWarning")
+    def test_sampled_validation_catches_drift(self):
+        """Test that a sampled record with drifted types fails validation."""
+        drifted = UniFiClient.model_construct(
+            hostname="drifted", ip=3232235777, mac="aa:bb:cc:dd:ee:ff"
+        )
+
+        with pytest.raises(ValidationError):
+            transform_clients([drifted], trusted=True, validate_every=1)
+
+    @pytest.mark.filterwarnings("ignore::UserWarning")
+    def test_unsampled_records_skip_validation(self):
+        """Test that records outside the sample are not validated."""
+        clients = self._clients(1) + [
+            UniFiClient.model_construct(
+                hostname="drifted", ip=3232235777, mac="aa:bb:cc:dd:ee:ff"
+            )
+        ]
+
+        results = transform_clients(clients, trusted=True, validate_every=2)
+
+        assert results[1].ip_address == 3232235777
+        with pytest.raises(ValidationError):
+            transform_clients(clients)
+
+    def test_trusted_records_convert_back_to_models(self):
+        """Test that trusted records convert back to the validated models."""
+        clients = self._clients(3)
+
+        trusted = transform_clients(clients, trusted=True, validate_every=0)
+
+        for record, client in zip(trusted, clients, strict=True):
+            assert record.to_model() == transform_client(client)
+
+    def test_trusted_records_share_interned_values(self):
+        """Test that repeated values share one string object within a batch."""
+        clients = [
+            client.model_copy(update={"siteId": "-".join(("site", "1"))})
+            for client in self._clients(3)
+        ]
+        assert clients[1].siteId is not clients[2].siteId
+
+        trusted = transform_clients(clients, trusted=True)
+
+        assert trusted[1].site_id is trusted[2].site_id
@@ -0,0 +1 @@
+"""Unit tests for UniFi source data modules."""
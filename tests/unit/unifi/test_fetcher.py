@@ -0,0 +1,108 @@
+"""Unit tests for the concurrent Site Manager fetcher (against the local stub)."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from beast_dream_snow_loader.models.unifi import UniFiClient, UniFiDevice
+from beast_dream_snow_loader.unifi.fetcher import SiteManagerFetcher
+from beast_dream_snow_loader.unifi.stub_server import StubSiteManager
+
+CLIENTS = [
+    {"hostname": f"client-{i}", "ip": f"10.0.0.{i}", "mac": f"aa:bb:cc:dd:ee:{i:02x}"}
+    for i in range(25)
+]
+DEVICES = [
+    {"hostId": f"host-{i}", "updatedAt": "2025-01-01T00:00:00Z"} for i in range(3)
+]
+
+
+class TestSiteManagerFetcher:
+    """Test fetching from the stub server."""
+
+    def test_pagination(self):
+        """Test that pages are followed via nextToken in order."""
+        with StubSiteManager({"client": CLIENTS}, api_key="k") as stub:
+            with SiteManagerFetcher(api_key="k", base_url=stub.url, page_size=10) as f:
+                clients = list(f.iter_entity("client"))
+
+        assert [c.hostname for c in clients] == [c["hostname"] for c in CLIENTS]
+        assert all(isinstance(c, UniFiClient) for c in clients)
+        assert stub.request_count == 3
+
+    def test_fetch_all_concurrently(self):
+        """Test that all entities are fetched into one result."""
+        with StubSiteManager({"client": CLIENTS, "device": DEVICES}) as stub:
+            with SiteManagerFetcher(api_key="k", base_url=stub.url, page_size=7) as f:
+                result = f.fetch_all()
+
+        assert len(result.clients) == 25
+        assert [d.hostId for d in result.devices] == ["host-0", "host-1", "host-2"]
+        assert all(isinstance(d, UniFiDevice) for d in result.devices)
+        assert result.hosts == [] and result.sites == []
+
+    def test_workers_use_own_sessions_over_shared_adapter(self):
+        """Test that each worker thread sends through its own session."""
+        with StubSiteManager({"client": CLIENTS, "device": DEVICES}) as stub:
+            url = stub.url
+            with SiteManagerFetcher(api_key="k", base_url=url, page_size=7) as f:
+                f.fetch_all()
+                sessions = list(f._thread_sessions)
+
+        assert sessions and all(s is not f.session for s in sessions)
+        adapter = f.session.get_adapter(url)
+        assert all(s.get_adapter(url) is adapter for s in sessions)
+        assert all(s.headers["X-API-KEY"] == "k" for s in sessions)
+        assert f._thread_sessions == []
+
+    def test_each_thread_gets_its_own_session(self):
+        """Test that sessions are per thread and reused within a thread."""
+        fetcher = SiteManagerFetcher(api_key="k")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            barrier = threading.Barrier(2)
+
+            def get_sessions() -> tuple[requests.Session, requests.Session]:
+                barrier.wait()
+                return fetcher._thread_session(), fetcher._thread_session()
+
+            futures = [executor.submit(get_sessions) for _ in range(2)]
+            (a1, a2), (b1, b2) = (future.result() for future in futures)
+
+        assert a1 is a2 and b1 is b2
+        assert a1 is not b1
+        fetcher.close()
+
+    def test_rate_limits_are_retried(self):
+        """Test that 429 responses are retried after Retry-After."""
+        with StubSiteManager({"client": CLIENTS}, rate_limit_every=2) as stub:
+            with SiteManagerFetcher(api_key="k", base_url=stub.url, page_size=10) as f:
+                clients = list(f.iter_entity("client"))
+
+        assert len(clients) == 25
+        assert stub.rate_limited_count > 0
+        assert f.retries == stub.rate_limited_count
+
+    def test_auth_errors_raise(self):
+        """Test that non-retryable errors raise HTTPError."""
+        with StubSiteManager({"client": CLIENTS}, api_key="right") as stub:
+            with SiteManagerFetcher(api_key="wrong", base_url=stub.url) as fetcher:
+                with pytest.raises(requests.HTTPError):
+                    list(fetcher.stream())
+
+    def test_early_stop_does_not_hang(self):
+        """Test that abandoning the stream stops the workers."""
+        with StubSiteManager({"client": CLIENTS * 20}) as stub:
+            with SiteManagerFetcher(
+                api_key="k", base_url=stub.url, page_size=1, max_workers=1
+            ) as fetcher:
+                stream = fetcher.stream(("client",))
+                next(stream)
+                stream.close()
+
+    def test_api_key_required(self, monkeypatch):
+        """Test that a missing API key is rejected."""
+        monkeypatch.delenv("UNIFI_API_KEY", raising=False)
+        with pytest.raises(ValueError):
+            SiteManagerFetcher()
@@ -0,0 +1,86 @@
+"""Unit tests for bulk UniFi JSON ingestion."""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from beast_dream_snow_loader.models.unifi import UniFiClient, UniFiDevice
+from beast_dream_snow_loader.transformers.unifi_to_snow import transform_clients
+from beast_dream_snow_loader.unifi.ingest import (
+    read_clients,
+    read_devices,
+    read_hosts,
+    read_sites,
+)
+
+CLIENTS = [
+    {"hostname": "laptop", "ip": "192.168.1.10", "mac": "aa:bb:cc:dd:ee:01"},
+    {
+        "hostname": "phone",
+        "ip": "192.168.1.11",
+        "mac": "aa:bb:cc:dd:ee:02",
+        "siteId": "site-1",
+        "uptime": 42,
+    },
+]
+
+
+class TestReadClients:
+    """Test bulk client validation."""
+
+    def test_bare_array_bytes(self):
+        """Test validating a raw JSON array."""
+        clients = read_clients(json.dumps(CLIENTS).encode())
+
+        assert clients == [UniFiClient(**c) for c in CLIENTS]
+        assert clients[1].uptime == 42  # extra API fields preserved
+
+    def test_envelope_bytes(self):
+        """Test validating a Site Manager API response envelope."""
+        body = json.dumps(
+            {"data": CLIENTS, "httpStatusCode": 200, "traceId": "abc"}, indent=2
+        ).encode()
+
+        assert read_clients(body) == [UniFiClient(**c) for c in CLIENTS]
+
+    def test_file_path(self, tmp_path):
+        """Test validating from a JSON file (str or Path)."""
+        path = tmp_path / "clients.json"
+        path.write_text(json.dumps(CLIENTS))
+
+        assert read_clients(path) == read_clients(str(path))
+        assert len(read_clients(path)) == 2
+
+    def test_models_are_ready_for_transformers(self):
+        """Test that output feeds the batch transformers directly."""
+        endpoints = transform_clients(read_clients(json.dumps(CLIENTS).encode()))
+
+        assert [e.hostname for e in endpoints] == ["laptop", "phone"]
+
+    def test_invalid_records_raise(self):
+        """Test that a missing required field fails validation."""
+        with pytest.raises(ValidationError):
+            read_clients(b'[{"hostname": "x"}]')
+
+    def test_malformed_json_raises(self):
+        """Test that malformed JSON raises ValidationError."""
+        with pytest.raises(ValidationError):
+            read_clients(b"[{")
+
+
+class TestReadOtherEntities:
+    """Test hosts, sites and devices readers."""
+
+    def test_read_devices(self):
+        """Test validating devices."""
+        body = b'{"data": [{"hostId": "h1", "updatedAt": "2025-01-01T00:00:00Z"}]}'
+
+        assert read_devices(body) == [
+            UniFiDevice(hostId="h1", updatedAt="2025-01-01T00:00:00Z")
+        ]
+
+    def test_empty_arrays(self):
+        """Test that empty responses yield empty lists."""
+        assert read_hosts(b"[]") == []
+        assert read_sites(b'{"data": []}') == []
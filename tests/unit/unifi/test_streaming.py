@@ -0,0 +1,130 @@
+"""Unit tests for streaming UniFi export ingestion."""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from beast_dream_snow_loader.models.unifi import UniFiClient
+from beast_dream_snow_loader.transformers.parallel import iter_transformed_chunks
+from beast_dream_snow_loader.transformers.unifi_to_snow import transform_clients
+from beast_dream_snow_loader.unifi.streaming import (
+    iter_array_records,
+    iter_batches,
+    iter_json_chunks,
+    stream_clients,
+    stream_devices,
+)
+
+CLIENTS = [
+    {
+        "hostname": "brace{in]name",
+        "ip": "192.168.1.10",
+        "mac": "aa:bb:cc:dd:ee:01",
+        "note": 'escaped \\" quote [ and "data"',
+        "tags": [{"k": "v"}, ["nested"]],
+    },
+    {"hostname": "phone", "ip": "192.168.1.11", "mac": "aa:bb:cc:dd:ee:02"},
+]
+
+
+def _expected() -> list[UniFiClient]:
+    return [UniFiClient(**c) for c in CLIENTS]
+
+
+class TestStreamClients:
+    """Test incremental readers."""
+
+    def test_json_array(self, tmp_path):
+        """Test a bare JSON array with tricky strings and nesting."""
+        path = tmp_path / "clients.json"
+        path.write_text(json.dumps(CLIENTS, indent=2))
+
+        assert list(stream_clients(path)) == _expected()
+
+    def test_envelope(self, tmp_path):
+        """Test the records array under the envelope's data key."""
+        path = tmp_path / "clients.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "meta": [{"data": [1]}],
+                    "traceId": "data",
+                    "data": CLIENTS,
+                    "nextToken": None,
+                }
+            )
+        )
+
+        assert list(stream_clients(path)) == _expected()
+
+    def test_ndjson(self, tmp_path):
+        """Test NDJSON detected by file suffix, with blank lines."""
+        path = tmp_path / "clients.ndjson"
+        path.write_text("\n".join(json.dumps(c) for c in CLIENTS) + "\n\n")
+
+        assert list(stream_clients(path)) == _expected()
+
+    def test_ndjson_override(self, tmp_path):
+        """Test forcing NDJSON for an unrecognized suffix."""
+        path = tmp_path / "clients.txt"
+        path.write_text("\n".join(json.dumps(c) for c in CLIENTS))
+
+        assert list(stream_clients(path, ndjson=True)) == _expected()
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file yields nothing."""
+        path = tmp_path / "empty.json"
+        path.write_bytes(b"")
+
+        assert list(stream_devices(path)) == []
+
+    def test_invalid_record_raises(self, tmp_path):
+        """Test that an invalid record raises when reached."""
+        path = tmp_path / "clients.json"
+        path.write_text(json.dumps([CLIENTS[1], {"hostname": "x"}]))
+
+        stream = stream_clients(path)
+        assert next(stream).hostname == "phone"
+        with pytest.raises(ValidationError):
+            next(stream)
+
+    def test_records_are_raw_slices(self):
+        """Test that records are the exact source bytes."""
+        buffer = b'[ {"a": 1} , {"b": [2, {"c": 3}]} ]'
+
+        assert list(iter_array_records(buffer)) == [
+            b'{"a": 1}',
+            b'{"b": [2, {"c": 3}]}',
+        ]
+
+
+class TestFeedingTransformers:
+    """Test streaming into transformers."""
+
+    def test_batches_feed_transformers(self, tmp_path):
+        """Test batched streaming into transform_clients."""
+        path = tmp_path / "clients.json"
+        path.write_text(json.dumps(CLIENTS))
+
+        batches = [transform_clients(b) for b in iter_batches(stream_clients(path), 1)]
+
+        assert [len(b) for b in batches] == [1, 1]
+        assert batches[0] + batches[1] == transform_clients(_expected())
+
+    def test_json_chunks_feed_parallel_transform(self, tmp_path):
+        """Test raw JSON chunks straight into the parallel transformer."""
+        path = tmp_path / "clients.ndjson"
+        path.write_text("\n".join(json.dumps(c) for c in CLIENTS))
+
+        chunks = list(iter_json_chunks(path, chunk_size=1))
+        results = [
+            payload
+            for chunk in iter_transformed_chunks(chunks, workers=1)
+            for payload in json.loads(chunk)
+        ]
+
+        assert len(chunks) == 2
+        assert results == [
+            e.model_dump(exclude_none=True) for e in transform_clients(_expected())
+        ]